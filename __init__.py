@@ -40,8 +40,13 @@ import importlib
 from . import (
     utils,
     tex_db,
+    fileops,
     properties,
     importer,
+    fingerprint,
+    workers,
+    catalog,
+    converter,
     injector,
     texture_manager,
     combiner,
@@ -52,8 +57,13 @@ from . import (
 modules = [
     utils,
     tex_db,
+    fileops,
     properties,
     importer,
+    fingerprint,
+    workers,
+    catalog,
+    converter,
     injector,
     texture_manager,
     combiner,
@@ -68,10 +78,12 @@ def register():
     properties.register()
     operators.register()
     ui.register()
+    injector.estimate.register_handler()
     
     pass
 
 def unregister():
+    injector.estimate.unregister_handler()
     ui.unregister()
     operators.unregister()
     properties.unregister()
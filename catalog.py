@@ -0,0 +1,331 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# sqlite catalog of every submesh in a game dump
+# files are scanned header-only (mesh table + xpps metadata, no vertex data)
+# and only rescanned when the xmesh or its xpps changed size/mtime
+# the same file also holds the texture -> mesh reverse index built from the xpps material tables
+
+import os
+import re
+import mmap
+import sqlite3
+from .utils import BinaryReader
+from .importer.core import parse_xpps_metadata, read_mesh_headers, find_xpps_path
+from . import workers, tex_db
+
+CATALOG_NAME = ".ghost_catalog.sqlite"
+
+# folders written by the add-on next to the game files: exported mods (<name>_mod_<id>, with the
+# incremental export manifest) and combined mods (MERGED_MOD_<id>), their copies would shadow the originals
+MOD_MANIFEST = "ghost_mod.json"
+MOD_FOLDER = re.compile(r"(.+_mod_\d+|MERGED_MOD_\d+)$")
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    xpps TEXT,
+    size INTEGER,
+    mtime REAL,
+    xpps_size INTEGER,
+    xpps_mtime REAL
+);
+CREATE TABLE meshes (
+    path TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    lod INTEGER,
+    verts INTEGER,
+    faces INTEGER,
+    scale REAL,
+    formats TEXT,
+    address INTEGER
+);
+CREATE INDEX idx_meshes_lod_verts ON meshes(lod, verts);
+CREATE INDEX idx_meshes_verts ON meshes(verts);
+CREATE INDEX idx_meshes_hash ON meshes(hash);
+CREATE INDEX idx_meshes_path ON meshes(path);
+CREATE TABLE xpps_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL
+);
+CREATE TABLE texture_usage (
+    xpps TEXT NOT NULL,
+    mesh_hash TEXT NOT NULL,
+    slot INTEGER,
+    tex_hash TEXT NOT NULL
+);
+CREATE INDEX idx_usage_tex ON texture_usage(tex_hash);
+CREATE INDEX idx_usage_mesh ON texture_usage(mesh_hash);
+CREATE INDEX idx_usage_xpps ON texture_usage(xpps);
+CREATE TABLE texture_names (
+    hash TEXT PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE sources (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def catalog_path_for(root):
+    return os.path.join(root, CATALOG_NAME)
+
+def open_catalog(db_path):
+    conn = sqlite3.connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        # old layout, the catalog is only a cache so it is simply rebuilt
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        for t in tables:
+            conn.execute(f"DROP TABLE IF EXISTS {t}")
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+def file_state(path):
+    # (size, mtime) or (0, 0) for missing files
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime
+    except OSError:
+        return 0, 0.0
+
+# --- worker side ---
+
+_xpps_cache = {}
+
+def cached_xpps(xpps_path):
+    # workers get sorted shards, so most files in a row share the same xpps
+    state = file_state(xpps_path)
+    entry = _xpps_cache.get(xpps_path)
+    if entry is None or entry[0] != state:
+        entry = (state, parse_xpps_metadata(xpps_path))
+        _xpps_cache[xpps_path] = entry
+    return entry[1]
+
+def scan_file(item):
+    # header-only scan of one xmesh, returns the file row and its mesh rows
+    path = item['path']
+    metadata, _ = cached_xpps(item['xpps'])
+
+    headers = []
+    if os.path.getsize(path) > 0:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                _, headers = read_mesh_headers(BinaryReader(data))
+            finally:
+                data.close()
+
+    meshes = []
+    for hdr in headers:
+        meta = metadata.get(hdr['hash']) if metadata else None
+        if meta:
+            formats = ",".join(f"{at['format']}/{at['stride']}" for at in meta['attributes'])
+            meshes.append((f"{hdr['hash']:X}", hdr['lod'], meta['vertex_count'], meta['face_count'] // 3, meta['scale'], formats, meta['record']))
+        else:
+            meshes.append((f"{hdr['hash']:X}", hdr['lod'], 0, 0, 0.0, "", 0))
+
+    return dict(item, meshes=meshes)
+
+def scan_materials(item):
+    # material table of one xpps as (mesh hash, slot, texture hash) rows
+    table = tex_db.read_material_table(item['path'])
+    usage = []
+    for m_hash, tex_hashes in table.items():
+        usage.extend((f"{m_hash:X}", slot, f"{h:X}") for slot, h in enumerate(tex_hashes or []))
+    return dict(item, usage=usage)
+
+# --- main side ---
+
+def is_mod_folder(path):
+    return bool(MOD_FOLDER.match(os.path.basename(path))) or os.path.isfile(os.path.join(path, MOD_MANIFEST))
+
+def collect_files(root):
+    items = []
+    for dirpath, dirnames, names in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not is_mod_folder(os.path.join(dirpath, d))]
+        for n in names:
+            if not n.endswith(".xmesh"): continue
+            path = os.path.abspath(os.path.join(dirpath, n))
+            xpps = find_xpps_path(path)
+            size, mtime = file_state(path)
+            xpps_size, xpps_mtime = file_state(xpps)
+            items.append({'path': path, 'xpps': xpps, 'size': size, 'mtime': mtime, 'xpps_size': xpps_size, 'xpps_mtime': xpps_mtime})
+    return items
+
+def update_catalog(root, jobs=None, db_path=None, blender_path=None):
+    # returns (scanned, unchanged, removed)
+    conn = open_catalog(db_path or catalog_path_for(root))
+    try:
+        known = {r[0]: r[1:] for r in conn.execute("SELECT path, size, mtime, xpps_size, xpps_mtime FROM files")}
+        items = collect_files(root)
+
+        todo = [it for it in items if known.get(it['path']) != (it['size'], it['mtime'], it['xpps_size'], it['xpps_mtime'])]
+        present = {it['path'] for it in items}
+        gone = [p for p in known if p not in present]
+
+        # sorted by xpps so each worker parses a shared xpps once
+        todo.sort(key=lambda it: (it['xpps'], it['path']))
+        results = workers.run_pool("catalog:scan_file", todo, jobs, blender_path) if todo else []
+
+        errors = 0
+        with conn:
+            for p in gone:
+                conn.execute("DELETE FROM meshes WHERE path = ?", (p,))
+                conn.execute("DELETE FROM files WHERE path = ?", (p,))
+
+            for res in results:
+                if 'error' in res:
+                    print(f"[Ghost] Catalog: failed to scan {res['item']['path']}: {res['error']}")
+                    errors += 1
+                    continue
+                conn.execute("DELETE FROM meshes WHERE path = ?", (res['path'],))
+                conn.executemany(
+                    "INSERT INTO meshes (path, hash, lod, verts, faces, scale, formats, address) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(res['path'],) + tuple(m) for m in res['meshes']]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (path, xpps, size, mtime, xpps_size, xpps_mtime) VALUES (?, ?, ?, ?, ?, ?)",
+                    (res['path'], res['xpps'], res['size'], res['mtime'], res['xpps_size'], res['xpps_mtime'])
+                )
+
+        scanned = len(results) - errors
+        print(f"[Ghost] Catalog: {scanned} scanned, {len(items) - len(todo)} unchanged, {len(gone)} removed, {errors} failed")
+        return scanned, len(items) - len(todo), len(gone)
+    finally:
+        conn.close()
+
+def update_texture_names(conn, texmeshman_path):
+    # texture names come from the texmeshman db, reloaded only when that file changed
+    path = os.path.abspath(texmeshman_path)
+    state = "%s|%d|%f" % ((path,) + file_state(path))
+    row = conn.execute("SELECT value FROM sources WHERE key = 'texmeshman'").fetchone()
+    if row and row[0] == state: return
+    if not tex_db.DB.load(path): return
+
+    with conn:
+        conn.execute("DELETE FROM texture_names")
+        conn.executemany("INSERT INTO texture_names (hash, name) VALUES (?, ?)", [(f"{h:X}", n) for h, n in tex_db.DB.textures.items()])
+        conn.execute("INSERT OR REPLACE INTO sources (key, value) VALUES ('texmeshman', ?)", (state,))
+    print(f"[Ghost] Catalog: {len(tex_db.DB.textures)} texture names loaded")
+
+def update_texture_index(root, texmeshman_path="", jobs=None, db_path=None, blender_path=None):
+    # reverse index of every xpps material table, returns (scanned, unchanged, removed)
+    conn = open_catalog(db_path or catalog_path_for(root))
+    try:
+        if texmeshman_path:
+            update_texture_names(conn, texmeshman_path)
+
+        known = {r[0]: r[1:] for r in conn.execute("SELECT path, size, mtime FROM xpps_files")}
+        items = []
+        for dirpath, dirnames, names in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not is_mod_folder(os.path.join(dirpath, d))]
+            for n in names:
+                if not n.endswith(".xpps"): continue
+                path = os.path.abspath(os.path.join(dirpath, n))
+                size, mtime = file_state(path)
+                items.append({'path': path, 'size': size, 'mtime': mtime})
+
+        todo = [it for it in items if known.get(it['path']) != (it['size'], it['mtime'])]
+        present = {it['path'] for it in items}
+        gone = [p for p in known if p not in present]
+
+        results = workers.run_pool("catalog:scan_materials", todo, jobs, blender_path) if todo else []
+
+        errors = 0
+        with conn:
+            for p in gone:
+                conn.execute("DELETE FROM texture_usage WHERE xpps = ?", (p,))
+                conn.execute("DELETE FROM xpps_files WHERE path = ?", (p,))
+
+            for res in results:
+                if 'error' in res:
+                    print(f"[Ghost] Catalog: failed to read materials of {res['item']['path']}: {res['error']}")
+                    errors += 1
+                    continue
+                conn.execute("DELETE FROM texture_usage WHERE xpps = ?", (res['path'],))
+                conn.executemany(
+                    "INSERT INTO texture_usage (xpps, mesh_hash, slot, tex_hash) VALUES (?, ?, ?, ?)",
+                    [(res['path'],) + tuple(u) for u in res['usage']]
+                )
+                conn.execute("INSERT OR REPLACE INTO xpps_files (path, size, mtime) VALUES (?, ?, ?)", (res['path'], res['size'], res['mtime']))
+
+        scanned = len(results) - errors
+        print(f"[Ghost] Texture index: {scanned} scanned, {len(items) - len(todo)} unchanged, {len(gone)} removed, {errors} failed")
+        return scanned, len(items) - len(todo), len(gone)
+    finally:
+        conn.close()
+
+def find_texture_users(db_path, text, limit=1000):
+    # every mesh whose material references a texture matching text (substring of the name or hash)
+    # rows are (texture name, texture hash, mesh hash, xpps, xmesh path or None, lod, verts, faces)
+    pattern = f"%{text.strip()}%"
+    conn = open_catalog(db_path)
+    try:
+        return conn.execute(
+            """SELECT n.name, u.tex_hash, u.mesh_hash, u.xpps, m.path, m.lod, m.verts, m.faces
+               FROM texture_usage u
+               LEFT JOIN texture_names n ON n.hash = u.tex_hash
+               LEFT JOIN (SELECT m.path, m.hash, m.lod, m.verts, m.faces, f.xpps FROM meshes m JOIN files f ON f.path = m.path) m
+                   ON m.hash = u.mesh_hash AND m.xpps = u.xpps
+               WHERE n.name LIKE ? OR u.tex_hash LIKE ?
+               ORDER BY n.name, u.mesh_hash
+               LIMIT ?""",
+            (pattern, pattern, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+
+def query_catalog(db_path, lod=None, min_verts=0, max_verts=0, hash_filter="", limit=1000):
+    # returns (total matches, rows) with rows as (path, hash, lod, verts, faces, scale, formats)
+    where = []; args = []
+    if lod is not None:
+        where.append("lod = ?"); args.append(lod)
+    if min_verts > 0:
+        where.append("verts >= ?"); args.append(min_verts)
+    if max_verts > 0:
+        where.append("verts <= ?"); args.append(max_verts)
+    if hash_filter:
+        where.append("hash LIKE ?"); args.append(f"{hash_filter.upper()}%")
+    clause = (" WHERE " + " AND ".join(where)) if where else ""
+
+    conn = open_catalog(db_path)
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM meshes{clause}", args).fetchone()[0]
+        rows = conn.execute(f"SELECT path, hash, lod, verts, faces, scale, formats FROM meshes{clause} ORDER BY verts LIMIT ?", args + [limit]).fetchall()
+        return total, rows
+    finally:
+        conn.close()
+
+def normalize_hash(text):
+    # pasted hashes may come as "0x..." or with leading zeros, the catalog stores them like the lists show them
+    text = text.strip().upper()
+    if text.startswith("0X"): text = text[2:]
+    try:
+        return f"{int(text, 16):X}"
+    except ValueError:
+        return None
+
+def locate_hash(db_path, hex_hash):
+    # indexed lookup, returns [(xmesh path, xpps path, record address in the xpps, lod)]
+    conn = open_catalog(db_path)
+    try:
+        return conn.execute(
+            "SELECT m.path, f.xpps, m.address, m.lod FROM meshes m JOIN files f ON f.path = m.path WHERE m.hash = ? ORDER BY m.lod",
+            (hex_hash,)
+        ).fetchall()
+    finally:
+        conn.close()
@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# command line entry point, runs inside blender in background mode:
+#
+#   blender -b --factory-startup --python cli.py -- catalog <dump root> [--jobs 8]
+#   blender -b --factory-startup --python cli.py -- convert <xmesh files/folders> --out <folder> [--format glb|obj|npz]
+#
+# the add-on does not need to be installed, it is imported from the folder this file lives in
+
+import os
+import sys
+import argparse
+import importlib
+
+def load_addon():
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    parent = os.path.dirname(addon_dir)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module(os.path.basename(addon_dir))
+
+def main(argv):
+    addon = load_addon()
+
+    parser = argparse.ArgumentParser(prog="blender -b --factory-startup --python cli.py --")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("worker", help="internal, used by the process pool")
+    p.add_argument("task_file")
+    p.add_argument("result_file")
+
+    p = sub.add_parser("catalog", help="scan a game dump into the sqlite mesh catalog")
+    p.add_argument("root")
+    p.add_argument("--db", default="", help="catalog file (default: <root>/.ghost_catalog.sqlite)")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--texmeshman", default="", help="game.sprig.texmeshman, resolves texture names for the texture index")
+
+    p = sub.add_parser("convert", help="convert xmesh files to glb, obj or npz")
+    p.add_argument("inputs", nargs="+", help="xmesh files or folders")
+    p.add_argument("--out", required=True)
+    p.add_argument("--format", choices=addon.converter.FORMATS, default="glb")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--force", action="store_true", help="convert again even if the output is up to date")
+    p.add_argument("--no-weights", action="store_true", help="skip skin weights")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        addon.workers.run_worker(args.task_file, args.result_file)
+
+    elif args.command == "catalog":
+        scanned, unchanged, removed = addon.catalog.update_catalog(args.root, jobs=args.jobs, db_path=args.db or None)
+        print(f"[Ghost] Catalog: {scanned} scanned, {unchanged} unchanged, {removed} removed")
+        addon.catalog.update_texture_index(args.root, args.texmeshman, jobs=args.jobs, db_path=args.db or None)
+
+    elif args.command == "convert":
+        _, _, failed = addon.converter.convert_files(args.inputs, args.out, args.format, jobs=args.jobs, force=args.force, weights=not args.no_weights)
+        if failed: sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
@@ -11,9 +11,9 @@
 # -------------------------------------------------------------------
 
 import os
-import shutil
 import struct
 import random
+from . import fileops
 
 class ModState:
     def __init__(self, filepath):
@@ -150,7 +150,7 @@ def combine_with_resolution(orig_xmesh_path, output_root, resolution_map, all_mo
     
     #copy xpps
     dst_xpps = os.path.join(output_folder, "hero.xpps")
-    shutil.copy2(orig_xpps, dst_xpps)
+    fileops.clone_file(orig_xpps, dst_xpps)
     print(f"[Combiner] Created base metadata: {dst_xpps}")
     
     # copy xmesh files and textures
@@ -167,7 +167,7 @@ def combine_with_resolution(orig_xmesh_path, output_root, resolution_map, all_mo
                 src = os.path.join(mod_dir, f)
                 dst = os.path.join(output_folder, f)
                 if f not in copied_xmeshes:
-                    shutil.copy2(src, dst)
+                    fileops.clone_file(src, dst)
                     copied_xmeshes.add(f)
                     print(f"  Copied XMesh: {f}")
         
@@ -176,7 +176,7 @@ def combine_with_resolution(orig_xmesh_path, output_root, resolution_map, all_mo
                 if item not in processed_tex_folders:
                     src = os.path.join(mod_dir, item)
                     dst = os.path.join(output_folder, item)
-                    shutil.copytree(src, dst, dirs_exist_ok=True)
+                    fileops.clone_tree(src, dst)
                     processed_tex_folders.add(item)
 
     print("[Combiner] Patching hero.xpps metadata...")
@@ -0,0 +1,312 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# batch conversion of xmesh files to glb / obj / npz without creating blender data
+# uses the importer decoders (read_xmesh_file), so the output matches what the importer builds
+# glb and obj are written y-up like blender's own exporters would write an imported mesh,
+# npz keeps the decoded arrays exactly as the importer uses them (blender space)
+
+import os
+import json
+import struct
+import numpy as np
+from .importer.core import read_xmesh_file, find_xpps_path
+from .importer.streams import GLOBAL_ROT
+from .catalog import cached_xpps, file_state
+from . import workers
+
+FORMATS = ("glb", "obj", "npz")
+REPORT_NAME = "ghost_convert_report.json"
+
+GL_ARRAY_BUFFER = 34962
+GL_ELEMENT_ARRAY_BUFFER = 34963
+GL_UNSIGNED_SHORT = 5123
+GL_UNSIGNED_INT = 5125
+GL_FLOAT = 5126
+
+def to_y_up(vecs):
+    # inverse of the import rotation
+    return vecs @ GLOBAL_ROT
+
+def valid_faces(faces, vcount):
+    # drops triangles pointing past the vertex stream, viewers reject those
+    if len(faces) and faces.max() >= vcount:
+        return faces[(faces < vcount).all(axis=1)]
+    return faces
+
+def unit_vectors(vecs):
+    length = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return np.divide(vecs, length, out=np.zeros_like(vecs), where=length > 0)
+
+def skin_attributes(ids, ws):
+    # JOINTS_0/WEIGHTS_0 rows: unused slots get joint 0 and weight 0, every row sums to 1
+    # (gltf requires it), vertices without any weight are bound to the root joint
+    ws = np.where(ids >= 0, ws, 0.0).astype(np.float32)
+    joints = np.maximum(ids, 0).astype(np.uint16)
+    total = ws.sum(axis=1, keepdims=True)
+    unweighted = total[:, 0] <= 0
+    ws = np.divide(ws, total, out=np.zeros_like(ws), where=total > 0)
+    joints[unweighted] = 0
+    ws[unweighted] = (1.0, 0.0, 0.0, 0.0)
+    return joints, ws
+
+def part_name(hex_hash, lod):
+    return f"LOD{lod}_{hex_hash}"
+
+def bone_matrices(bones):
+    # world matrices of the skeleton in game space, same chain as build_skeleton
+    world = [None] * len(bones)
+
+    def local(b):
+        x, y, z, w = b['rot']
+        rot = np.array([
+            [1 - 2*(y*y + z*z), 2*(x*y - z*w), 2*(x*z + y*w)],
+            [2*(x*y + z*w), 1 - 2*(x*x + z*z), 2*(y*z - x*w)],
+            [2*(x*z - y*w), 2*(y*z + x*w), 1 - 2*(x*x + y*y)],
+        ])
+        mat = np.eye(4)
+        mat[:3, :3] = rot * np.asarray(b['scl'][:3])
+        mat[:3, 3] = b['pos'][:3]
+        return mat
+
+    def get(idx):
+        if world[idx] is None:
+            b = bones[idx]
+            mat = local(b)
+            if b['parent'] != -1:
+                mat = get(b['parent']) @ mat
+            world[idx] = mat
+        return world[idx]
+
+    return [get(i) for i in range(len(bones))]
+
+class GlbWriter:
+    # minimal gltf 2.0 binary container, one buffer for all data
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "Ghost of Tsushima Tool"},
+            "scene": 0, "scenes": [{"nodes": []}],
+            "nodes": [], "meshes": [], "accessors": [], "bufferViews": [], "buffers": []
+        }
+        self.blobs = []
+        self.length = 0
+
+    def accessor(self, arr, acc_type, component, target=None, bounds=False):
+        arr = np.ascontiguousarray(arr)
+        raw = arr.tobytes()
+        view = {"buffer": 0, "byteOffset": self.length, "byteLength": len(raw)}
+        if target: view["target"] = target
+        self.blobs.append(raw)
+        self.length += len(raw)
+        if self.length % 4:
+            pad = 4 - self.length % 4
+            self.blobs.append(b"\0" * pad)
+            self.length += pad
+
+        self.gltf["bufferViews"].append(view)
+        acc = {"bufferView": len(self.gltf["bufferViews"]) - 1, "componentType": component, "count": len(arr), "type": acc_type}
+        if bounds and len(arr):
+            acc["min"] = arr.min(axis=0).tolist()
+            acc["max"] = arr.max(axis=0).tolist()
+        self.gltf["accessors"].append(acc)
+        return len(self.gltf["accessors"]) - 1
+
+    def node(self, data):
+        self.gltf["nodes"].append(data)
+        return len(self.gltf["nodes"]) - 1
+
+    def write(self, path):
+        self.gltf["buffers"].append({"byteLength": self.length})
+        for key in ("meshes", "skins"):
+            if key in self.gltf and not self.gltf[key]: del self.gltf[key]
+
+        js = json.dumps(self.gltf, separators=(",", ":")).encode("utf-8")
+        js += b" " * (-len(js) % 4)
+        total = 12 + 8 + len(js) + 8 + self.length
+
+        with open(path, "wb") as f:
+            f.write(struct.pack("<III", 0x46546C67, 2, total))
+            f.write(struct.pack("<II", len(js), 0x4E4F534A)); f.write(js)
+            f.write(struct.pack("<II", self.length, 0x004E4942))
+            for blob in self.blobs: f.write(blob)
+
+def glb_skin(glb, bones):
+    # joint nodes in the bone hierarchy, returns the skin index
+    first = len(glb.gltf["nodes"])
+    for b in bones:
+        x, y, z, w = b['rot']
+        glb.node({"name": f"Bone_{b['index']}", "translation": list(b['pos'][:3]), "rotation": [x, y, z, w], "scale": list(b['scl'][:3])})
+
+    for b in bones:
+        if b['parent'] != -1:
+            glb.gltf["nodes"][first + b['parent']].setdefault("children", []).append(first + b['index'])
+        else:
+            glb.gltf["scenes"][0]["nodes"].append(first + b['index'])
+
+    # gltf matrices are column major
+    inverse = np.array([np.linalg.inv(m).T for m in bone_matrices(bones)], dtype=np.float32).reshape(-1, 16)
+    glb.gltf.setdefault("skins", []).append({
+        "joints": list(range(first, first + len(bones))),
+        "inverseBindMatrices": glb.accessor(inverse, "MAT4", GL_FLOAT)
+    })
+    return len(glb.gltf["skins"]) - 1
+
+def glb_mesh(glb, name, dec, bone_count):
+    verts = dec['verts']; vcount = len(verts)
+    faces = valid_faces(dec['faces'], vcount)
+
+    attrs = {"POSITION": glb.accessor(to_y_up(verts).astype(np.float32), "VEC3", GL_FLOAT, GL_ARRAY_BUFFER, bounds=True)}
+    if dec['normals'] is not None and len(dec['normals']) == vcount:
+        attrs["NORMAL"] = glb.accessor(unit_vectors(to_y_up(dec['normals'])).astype(np.float32), "VEC3", GL_FLOAT, GL_ARRAY_BUFFER)
+    for i, uvs in enumerate(l for l in dec['uvs_layers'] if len(l) == vcount):
+        # same v flip blender's gltf exporter applies
+        gl_uvs = uvs.copy(); gl_uvs[:, 1] = 1.0 - gl_uvs[:, 1]
+        attrs[f"TEXCOORD_{i}"] = glb.accessor(gl_uvs, "VEC2", GL_FLOAT, GL_ARRAY_BUFFER)
+    for i, cols in enumerate(c for c in dec['colors'] if len(c) == vcount):
+        attrs[f"COLOR_{i}"] = glb.accessor(cols, "VEC4", GL_FLOAT, GL_ARRAY_BUFFER)
+
+    skinned = False
+    if dec['weights'] is not None and bone_count:
+        ids, ws = dec['weights']
+        if len(ids) == vcount and ids.max() < bone_count:
+            joints, weights = skin_attributes(ids, ws)
+            attrs["JOINTS_0"] = glb.accessor(joints, "VEC4", GL_UNSIGNED_SHORT, GL_ARRAY_BUFFER)
+            attrs["WEIGHTS_0"] = glb.accessor(weights, "VEC4", GL_FLOAT, GL_ARRAY_BUFFER)
+            skinned = True
+
+    if vcount < 65536:
+        indices = glb.accessor(faces.astype(np.uint16).ravel(), "SCALAR", GL_UNSIGNED_SHORT, GL_ELEMENT_ARRAY_BUFFER)
+    else:
+        indices = glb.accessor(faces.astype(np.uint32).ravel(), "SCALAR", GL_UNSIGNED_INT, GL_ELEMENT_ARRAY_BUFFER)
+
+    glb.gltf["meshes"].append({"name": name, "primitives": [{"attributes": attrs, "indices": indices, "mode": 4}]})
+    return len(glb.gltf["meshes"]) - 1, skinned
+
+def write_glb(loaded, path):
+    glb = GlbWriter()
+    bones = loaded['skeleton'] or []
+    skin = glb_skin(glb, bones) if bones and any(dec['weights'] is not None for _, _, dec in loaded['parts']) else None
+
+    # shared decodes (identical submeshes) become instances of one gltf mesh
+    meshes = {}
+    for hex_hash, lod, dec in loaded['parts']:
+        if id(dec) not in meshes:
+            meshes[id(dec)] = glb_mesh(glb, part_name(hex_hash, lod), dec, len(bones))
+        mesh_idx, skinned = meshes[id(dec)]
+
+        node = {"name": part_name(hex_hash, lod), "mesh": mesh_idx}
+        if skinned and skin is not None: node["skin"] = skin
+        glb.gltf["scenes"][0]["nodes"].append(glb.node(node))
+
+    glb.write(path)
+
+def write_obj(loaded, path):
+    # one object per submesh, first uv layer only, no skinning
+    base = 1
+    with open(path, "w") as f:
+        f.write(f"# {os.path.basename(loaded['filepath'])}\n")
+        for hex_hash, lod, dec in loaded['parts']:
+            verts = to_y_up(dec['verts']); vcount = len(verts)
+            faces = valid_faces(dec['faces'], vcount) + base
+            normals = dec['normals'] if dec['normals'] is not None and len(dec['normals']) == vcount else None
+            uvs = next((l for l in dec['uvs_layers'] if len(l) == vcount), None)
+
+            f.write(f"o {part_name(hex_hash, lod)}\n")
+            f.write(("v %.6f %.6f %.6f\n" * vcount) % tuple(verts.ravel().tolist()))
+            if uvs is not None:
+                f.write(("vt %.6f %.6f\n" * vcount) % tuple(uvs.ravel().tolist()))
+            if normals is not None:
+                f.write(("vn %.4f %.4f %.4f\n" * vcount) % tuple(unit_vectors(to_y_up(normals)).ravel().tolist()))
+
+            if uvs is not None and normals is not None: corner = "%d/%d/%d"
+            elif uvs is not None: corner = "%d/%d"
+            elif normals is not None: corner = "%d//%d"
+            else: corner = "%d"
+            reps = corner.count("%d")
+            line = "f " + " ".join([corner] * 3) + "\n"
+            f.write((line * len(faces)) % tuple(np.repeat(faces.ravel(), reps).tolist()))
+            base += vcount
+
+def write_npz(loaded, path):
+    arrays = {"parts": np.array([part_name(h, lod) for h, lod, _ in loaded['parts']])}
+    for hex_hash, lod, dec in loaded['parts']:
+        key = part_name(hex_hash, lod)
+        arrays[f"{key}/positions"] = dec['verts']
+        arrays[f"{key}/faces"] = dec['faces']
+        if dec['normals'] is not None: arrays[f"{key}/normals"] = dec['normals']
+        if dec['tangents'] is not None: arrays[f"{key}/tangents"] = dec['tangents']
+        for i, uvs in enumerate(dec['uvs_layers']): arrays[f"{key}/uv{i}"] = uvs
+        for i, cols in enumerate(dec['colors']): arrays[f"{key}/color{i}"] = cols
+        if dec['weights'] is not None:
+            arrays[f"{key}/bone_ids"], arrays[f"{key}/bone_weights"] = dec['weights']
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+WRITERS = {"glb": write_glb, "obj": write_obj, "npz": write_npz}
+
+def convert_file(item):
+    # worker task, the output only appears once it is complete so an interrupted run can resume
+    loaded = read_xmesh_file(item['src'], read_weights=item['weights'], xpps_data=cached_xpps(find_xpps_path(item['src'])))
+    if not loaded['parts']:
+        return {'src': item['src'], 'dst': None, 'parts': 0}
+
+    os.makedirs(os.path.dirname(item['dst']), exist_ok=True)
+    tmp = item['dst'] + ".part"
+    WRITERS[item['format']](loaded, tmp)
+    os.replace(tmp, item['dst'])
+    return {'src': item['src'], 'dst': item['dst'], 'parts': len(loaded['parts'])}
+
+def collect_inputs(paths):
+    # (xmesh path, folder its output path is relative to) for files and folder trees
+    found = []
+    for p in paths:
+        p = os.path.abspath(p)
+        if os.path.isdir(p):
+            for dirpath, _, names in os.walk(p):
+                found.extend((os.path.join(dirpath, n), p) for n in names if n.endswith(".xmesh"))
+        elif p.endswith(".xmesh") and os.path.exists(p):
+            found.append((p, os.path.dirname(p)))
+    return found
+
+def is_up_to_date(src, dst):
+    if not os.path.exists(dst): return False
+    newest = max(file_state(src)[1], file_state(find_xpps_path(src))[1])
+    return os.path.getmtime(dst) >= newest
+
+def convert_files(paths, out_dir, fmt="glb", jobs=None, force=False, weights=True, blender_path=None):
+    # returns (converted, skipped, failed)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {', '.join(FORMATS)}")
+    out_dir = os.path.abspath(out_dir)
+
+    todo = []; skipped = 0
+    for src, root in collect_inputs(paths):
+        dst = os.path.join(out_dir, os.path.splitext(os.path.relpath(src, root))[0] + "." + fmt)
+        if not force and is_up_to_date(src, dst):
+            skipped += 1
+            continue
+        todo.append({'src': src, 'dst': dst, 'format': fmt, 'weights': weights})
+
+    # files sharing an xpps end up on the same worker
+    todo.sort(key=lambda it: (find_xpps_path(it['src']), it['src']))
+    print(f"[Ghost] Converting {len(todo)} files to {fmt} ({skipped} already done)")
+    results = workers.run_pool("converter:convert_file", todo, jobs, blender_path) if todo else []
+
+    failed = [{'path': r['item']['src'], 'error': r['error']} for r in results if 'error' in r]
+    converted = len(results) - len(failed)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, REPORT_NAME), "w") as f:
+        json.dump({'format': fmt, 'converted': converted, 'skipped': skipped, 'failed': failed}, f, indent=1)
+
+    print(f"[Ghost] Converted {converted}, skipped {skipped}, failed {len(failed)}")
+    return converted, skipped, len(failed)
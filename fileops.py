@@ -0,0 +1,66 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# cheap file copies for mod folders
+# clone_file: reflink (copy on write) -> copy_file_range -> plain copy, always an independent file
+# (no hardlinks, mod files get patched or edited by hand afterwards)
+
+import os
+import shutil
+
+# linux ioctl _IOW(0x94, 9, int), clones the extents of one file into another on btrfs/xfs
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError: # windows
+    fcntl = None
+
+def reflink(src, dst):
+    if fcntl is None: return False
+    try:
+        with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst): os.remove(dst)
+        return False
+
+def copy_range(src, dst):
+    # in-kernel copy, no round trip through user space (and server side copy on nfs/smb)
+    if not hasattr(os, "copy_file_range"): return False
+    try:
+        with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+            while os.copy_file_range(fs.fileno(), fd.fileno(), 1 << 30) > 0:
+                pass
+        return True
+    except OSError:
+        return False
+
+def clone_file(src, dst):
+    # independent copy of src with its metadata (like shutil.copy2), returns the method that worked
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if os.path.exists(dst):
+        os.remove(dst) # never write through a hardlink
+
+    if reflink(src, dst): method = "reflink"
+    elif copy_range(src, dst): method = "copy_file_range"
+    else:
+        shutil.copyfile(src, dst)
+        method = "copy"
+    shutil.copystat(src, dst)
+    return method
+
+def clone_tree(src, dst):
+    # copytree with cloned files, merges into an existing folder
+    shutil.copytree(src, dst, dirs_exist_ok=True, copy_function=clone_file)
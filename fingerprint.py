@@ -0,0 +1,127 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# content fingerprints of submesh buffers, used to find byte-identical
+# vertex/index data across xmesh files and LODs without decoding anything
+
+import os
+import json
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from .utils import BinaryReader
+from .importer.core import parse_xpps_metadata, read_mesh_headers, find_xpps_path
+from .importer.streams import submesh_fingerprint
+
+CACHE_NAME = ".ghost_fingerprints.json"
+REPORT_NAME = "ghost_duplicates.json"
+
+def fingerprint_file(xmesh_path, xpps_data=None):
+    # returns {hex hash: {'index', 'streams', 'key', 'lod'}} for every submesh with metadata
+    if xpps_data is None:
+        xpps_data = parse_xpps_metadata(find_xpps_path(xmesh_path))
+    metadata, _ = xpps_data
+
+    result = {}
+    if not metadata or os.path.getsize(xmesh_path) == 0:
+        return result
+
+    with open(xmesh_path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            buffer_offset, headers = read_mesh_headers(BinaryReader(data))
+            for hdr in headers:
+                meta = metadata.get(hdr['hash'])
+                if meta is None: continue
+                try:
+                    fp = submesh_fingerprint(data, buffer_offset, hdr['idx_off'], hdr['v_offs'], meta)
+                except IndexError:
+                    continue # fewer stream offsets than attributes
+                fp['lod'] = hdr['lod']
+                result[f"{hdr['hash']:X}"] = fp
+        finally:
+            data.close()
+    return result
+
+class FingerprintCache:
+    # fingerprints per file, only files whose size/mtime changed are hashed again
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.files = {}
+        self.dirty = False
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    self.files = json.load(f).get('files', {})
+            except (OSError, ValueError):
+                self.files = {}
+
+    def get(self, xmesh_path, xpps_data=None):
+        path = os.path.abspath(xmesh_path)
+        st = os.stat(path)
+        entry = self.files.get(path)
+        if entry and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime:
+            return entry['meshes']
+
+        meshes = fingerprint_file(path, xpps_data)
+        self.files[path] = {'size': st.st_size, 'mtime': st.st_mtime, 'meshes': meshes}
+        self.dirty = True
+        return meshes
+
+    def save(self):
+        if not self.cache_path or not self.dirty: return
+        with open(self.cache_path, 'w') as f:
+            json.dump({'files': self.files}, f)
+        self.dirty = False
+
+def build_duplicate_map(xmesh_paths, cache_path=None, max_workers=None):
+    # groups submeshes with identical content: {key: [{'path', 'hash', 'lod'}, ...]}
+    # only keys that occur more than once are returned
+    cache = FingerprintCache(cache_path)
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+
+    xpps_cache = {}
+    def xpps_for(path):
+        xpps_path = find_xpps_path(path)
+        if xpps_path not in xpps_cache:
+            xpps_cache[xpps_path] = parse_xpps_metadata(xpps_path)
+        return xpps_cache[xpps_path]
+
+    # xpps files are shared (hero.xpps), parse them up front instead of racing for them on the pool
+    for p in xmesh_paths: xpps_for(p)
+
+    groups = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # hashlib releases the GIL on large buffers, so hashing overlaps with disk reads
+        results = pool.map(lambda p: (p, cache.get(p, xpps_for(p))), xmesh_paths)
+        for path, meshes in results:
+            for hex_hash, fp in meshes.items():
+                groups.setdefault(fp['key'], []).append({'path': path, 'hash': hex_hash, 'lod': fp['lod']})
+
+    cache.save()
+    return {k: v for k, v in groups.items() if len(v) > 1}
+
+def scan_folder_duplicates(root):
+    # walks a dump folder, writes the duplicate map next to the fingerprint cache
+    paths = []
+    for dirpath, _, names in os.walk(root):
+        paths.extend(os.path.join(dirpath, n) for n in names if n.endswith(".xmesh"))
+
+    dup_map = build_duplicate_map(paths, cache_path=os.path.join(root, CACHE_NAME))
+
+    with open(os.path.join(root, REPORT_NAME), 'w') as f:
+        json.dump(dup_map, f, indent=1)
+
+    redundant = sum(len(v) - 1 for v in dup_map.values())
+    print(f"[Ghost] Fingerprinted {len(paths)} files: {len(dup_map)} duplicate groups, {redundant} redundant submeshes")
+    return dup_map
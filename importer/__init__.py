@@ -22,4 +22,7 @@
 # supporting the development via Ko-fi. Every donation is appreciated!
 # -----------------------------------------------------------------------------------
 
-from .core import scan_xmesh, import_selected, parse_xpps_metadata
\ No newline at end of file
+from .core import scan_xmesh, import_selected, import_files, parse_xpps_metadata
+from .proxy import import_proxies, load_full_proxies
+from .merge import split_merged_object
+from .streaming import import_streaming
\ No newline at end of file
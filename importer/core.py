@@ -12,11 +12,12 @@
 
 import bpy
 import os
-import struct
 import math
-import mathutils
-from ..utils import BinaryReader, GTVertexAttributeType, GLOBAL_MATRIX, decode_pos, unpack_10_10_10_2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ..utils import BinaryReader, GTVertexAttributeType
 from .skeleton import parse_skeleton_data, build_skeleton
+from .streams import decode_indices, decode_positions, decode_snorm10, decode_uvs, decode_colors, decode_extra, decode_weights, submesh_fingerprint
 
 def parse_xpps_metadata(filepath):
     if not os.path.exists(filepath): 
@@ -101,304 +102,362 @@ def parse_xpps_metadata(filepath):
                                         'offset': v_off, 
                                         'attributes': attrs, 
                                         'face_count': face_count, 
-                                        'vertex_count': vertex_count
+                                        'vertex_count': vertex_count,
+                                        'record': data_start + ptr
                                     }
                 reader.seek(c_start + c_sz)
         curr_pkg += 40
     return metadata_map, skeleton_data
 
-def scan_xmesh(filepath):
-    # scan of xmesh headers for the ui list
-    infos = []
+def find_xpps_path(filepath):
+    # metadata lives next to the xmesh, either with the same name or in the shared hero.xpps
     dir_path = os.path.dirname(filepath)
     fname = os.path.splitext(os.path.basename(filepath))[0]
-    
     xpps_path = os.path.join(dir_path, fname + ".xpps")
-
-    if not os.path.exists(xpps_path): 
+    if not os.path.exists(xpps_path):
         xpps_path = os.path.join(dir_path, "hero.xpps")
-    
-    meta_map, _ = parse_xpps_metadata(xpps_path)
-    
-    with open(filepath, 'rb') as f: 
-        data = f.read()
+    return xpps_path
 
-    reader = BinaryReader(data)
-    
-    if reader.read_string(4) != "SMBS": 
-        return []
-    
+def read_mesh_headers(reader):
+    # reads the SMBS submesh table (hash, index offset, lod, vertex stream offsets)
+    reader.seek(0)
+    if reader.read_string(4) != "SMBS":
+        return 0, []
+
+    reader.seek(24); buffer_offset = reader.read_uint64()
     reader.seek(40); num_meshes = reader.read_uint32()
-    
+
+    headers = []
     for _ in range(num_meshes):
         header_start = reader.tell()
-        m_hash = reader.read_uint64(); reader.read_uint32() 
+        m_hash = reader.read_uint64(); idx_off = reader.read_uint32()
         lod = reader.read_uint16(); num_v = reader.read_uint8()
-        
-        reader.read_uint32_array(num_v)
-        
+        v_offs = reader.read_uint32_array(num_v)
+
+        headers.append({
+            'hash': m_hash,
+            'idx_off': idx_off,
+            'lod': lod,
+            'v_offs': v_offs,
+            'header_pos': header_start
+        })
+        reader.seek(header_start + 15 + (4 * num_v))
+    return buffer_offset, headers
+
+def scan_xmesh(filepath):
+    # scan of xmesh headers for the ui list, with the real slot capacities from the buffer layout
+    from ..injector.capacity import stream_capacities
+
+    meta_map, _ = parse_xpps_metadata(find_xpps_path(filepath))
+    
+    with open(filepath, 'rb') as f: 
+        data = f.read()
+
+    # empty for files without the SMBS magic, the table offsets are only trusted after that check
+    buffer_offset, headers = read_mesh_headers(BinaryReader(data))
+    if not headers:
+        return []
+
+    table = {}
+    for hdr in headers:
+        table.setdefault(hdr['hash'], (hdr['idx_off'], hdr['v_offs']))
+    capacities = stream_capacities(len(data) - buffer_offset, table, meta_map)
+
+    infos = []
+    for hdr in headers:
+        m_hash = hdr['hash']
         v_count = 0; f_count = 0
         if m_hash in meta_map:
             v_count = meta_map[m_hash].get('vertex_count', 0)
             f_count = meta_map[m_hash].get('face_count', 0)
+        cap = capacities.get(m_hash)
             
         infos.append({
             "hash": f"{m_hash:X}", 
-            "lod": lod, 
+            "lod": hdr['lod'], 
             "verts": v_count, 
-            "faces": f_count // 3
+            "faces": f_count // 3,
+            "vertex_capacity": cap['vertices'] if cap else v_count,
+            "index_capacity": cap['indices'] if cap else f_count
         })
-        
-        reader.seek(header_start + 15 + (4 * num_v))
     return infos
 
-def import_selected(context, filepath, selected_hashes=None, use_skeleton=True, db_path=""):
-    dir_path = os.path.dirname(filepath)
-    fname = os.path.splitext(os.path.basename(filepath))[0]
-    xpps_path = os.path.join(dir_path, fname + ".xpps")
-    if not os.path.exists(xpps_path): xpps_path = os.path.join(dir_path, "hero.xpps")
+def decode_submesh(data, buffer_offset, idx_off, v_offs, meta, read_weights=True):
+    # decodes the index buffer and every vertex stream of one submesh into numpy arrays
+    # no bpy access here, this runs on worker threads for multi-file imports
+    faces = decode_indices(data, buffer_offset + idx_off, meta.get('face_count', 0))
+
+    verts = None; normals = None; tangents = None; uvs_layers = []; colors = []
+    extra_layers = []
+    cnt_snorm10 = 0 
     
-    metadata, skeleton_data = parse_xpps_metadata(xpps_path)
-    if not metadata: return "ERROR: No XPPS metadata found."
+    for ai, at in enumerate(meta['attributes']):
+        fmt = at['format']; count = at['count']
+        offset = buffer_offset + v_offs[ai]
+        
+        if fmt in (GTVertexAttributeType.Format_16_16_16_Snorm, GTVertexAttributeType.Format_32_32_32_Float):
+            # position (compressed or full float)
+            verts = decode_positions(data, offset, at, meta)
+
+        elif fmt == GTVertexAttributeType.Format_10_10_10_Snorm:
+            # normals/tangents
+            if cnt_snorm10 == 0: 
+                normals = decode_snorm10(data, offset, count)
+            elif cnt_snorm10 == 1: 
+                tangents = decode_snorm10(data, offset, count)
+            cnt_snorm10 += 1
+
+        elif fmt == GTVertexAttributeType.Format_16_16_Float:
+            # UVs
+            uvs_layers.append(decode_uvs(data, offset, count))
+
+        elif fmt == GTVertexAttributeType.Format_8_8_8_8_Unorm:
+            # Colors
+            colors.append(decode_colors(data, offset, count))
+
+        else:
+            extra = decode_extra(data, offset, at)
+            if extra is not None:
+                extra_layers.append({"name": extra[0], "data": extra[1]})
 
-    col_name = fname
-    col = bpy.data.collections.new(col_name)
-    context.scene.collection.children.link(col)
+    # skin weights
+    weights = None
+    idx_attr = next((at for at in meta['attributes'] if at['format'] == GTVertexAttributeType.Format_16_16_16_16_Unit), None)
+    wgt_attr = next((at for at in meta['attributes'] if at['format'] == GTVertexAttributeType.Format_8_8_8_8_Unorm), None)
     
-    arm_obj = None
-    if use_skeleton and skeleton_data:
-        arm_obj = build_skeleton(skeleton_data, col)
+    if read_weights and idx_attr and wgt_attr and verts is not None:
+        idx_idx = meta['attributes'].index(idx_attr)
+        wgt_idx = meta['attributes'].index(wgt_attr)
+        weights = decode_weights(
+            data,
+            buffer_offset + v_offs[idx_idx], idx_attr['stride'],
+            buffer_offset + v_offs[wgt_idx], wgt_attr['stride'],
+            len(verts)
+        )
+
+    return {
+        'verts': verts,
+        'faces': faces,
+        'normals': normals,
+        'tangents': tangents,
+        'uvs_layers': uvs_layers,
+        'colors': colors,
+        'extra_layers': extra_layers,
+        'weights': weights
+    }
+
+def read_xmesh_file(filepath, selected_hashes=None, read_weights=True, xpps_data=None):
+    # reads and decodes a whole xmesh without touching blender data
+    # xpps_data can be passed in when several files share the same hero.xpps
+    if xpps_data is None:
+        xpps_data = parse_xpps_metadata(find_xpps_path(filepath))
+    metadata, skeleton_data = xpps_data
+
+    loaded = {
+        'filepath': filepath,
+        'name': os.path.splitext(os.path.basename(filepath))[0],
+        'skeleton': skeleton_data,
+        'parts': []
+    }
+    if not metadata: return loaded
 
     with open(filepath, 'rb') as f: data = f.read()
-    reader = BinaryReader(data)
-    
-    reader.seek(24); buffer_offset = reader.read_uint64()
-    reader.seek(40); num_meshes = reader.read_uint32()
-    
-    imported_count = 0
-    
-    for _ in range(num_meshes):
-        header_start = reader.tell()
-        m_hash = reader.read_uint64(); idx_off = reader.read_uint32()
-        lod = reader.read_uint16(); num_v = reader.read_uint8()
-        v_offs = reader.read_uint32_array(num_v)
-        
+    buffer_offset, headers = read_mesh_headers(BinaryReader(data))
+
+    # submeshes with byte-identical buffers (often LODs) are decoded once and share the result
+    decoded = {}
+
+    for hdr in headers:
+        m_hash = hdr['hash']
         hex_hash = f"{m_hash:X}"
         
         # filter logic
-        should_import = True
-        if selected_hashes and len(selected_hashes) > 0:
-            if hex_hash not in selected_hashes: should_import = False
+        if selected_hashes and hex_hash not in selected_hashes: continue
+        if m_hash not in metadata: continue
+        meta = metadata[m_hash]
 
-        if should_import and m_hash in metadata:
-            meta = metadata[m_hash]
-            
-            # indecies
-            reader.seek(buffer_offset + idx_off)
-            fc = meta.get('face_count', 0); faces = []
-            if fc > 0:
-                raw = struct.unpack(f'<{fc}H', reader.read_bytes(fc*2))
-                faces = [raw[j:j+3] for j in range(0, len(raw), 3)]
-
-            # vertecies
-            verts = []; normals = []; tangents = []; uvs_layers = []; colors = []
-            extra_layers = []
-            cnt_snorm10 = 0 
-            
-            for ai, at in enumerate(meta['attributes']):
-                fmt = at['format']; count = at['count']
-                reader.seek(buffer_offset + v_offs[ai])
-                
-                if fmt == GTVertexAttributeType.Format_16_16_16_Snorm:
-                    # postion (compressed)
-                    for _ in range(count):
-                        p = decode_pos(reader, at, meta)
-                        verts.append(GLOBAL_MATRIX @ mathutils.Vector(p))
-                        
-                elif fmt == GTVertexAttributeType.Format_32_32_32_Float:
-                    # position (full float)
-                    for _ in range(count):
-                        p = reader.read_vec3()
-                        verts.append(GLOBAL_MATRIX @ mathutils.Vector(p))
-
-                elif fmt == GTVertexAttributeType.Format_10_10_10_Snorm:
-                    # normals/tangents
-                    raw_data = reader.read_uint32_array(count)
-                    curr_vecs = []
-                    for val in raw_data:
-                        x, y, z, w = unpack_10_10_10_2(val)
-                        vec = (mathutils.Vector((x, y, z)) * 2.0) - mathutils.Vector((1.0, 1.0, 1.0))
-                        rot_vec = GLOBAL_MATRIX.to_3x3() @ vec
-                        curr_vecs.append(rot_vec)
-                    
-                    if cnt_snorm10 == 0: 
-                        normals = curr_vecs
-                    elif cnt_snorm10 == 1: 
-                        tangents = curr_vecs
-
-                    cnt_snorm10 += 1
-
-                elif fmt == GTVertexAttributeType.Format_16_16_Float:
-                    # UVs
-                    curr_uvs = []
-                    for _ in range(count):
-                        u = reader.read_half() # half float
-                        v = reader.read_half()
-                        curr_uvs.append((u, v)) 
-                    uvs_layers.append(curr_uvs)
-
-                elif fmt == GTVertexAttributeType.Format_8_8_8_8_Unorm:
-                    # Colors
-                    raw_bytes = reader.read_bytes(count * 4)
-                    curr_cols = []
-                    for k in range(count):
-                        r, g, b, a = raw_bytes[k*4]/255.0, raw_bytes[k*4+1]/255.0, raw_bytes[k*4+2]/255.0, raw_bytes[k*4+3]/255.0
-                        curr_cols.append((r, g, b, a))
-                    colors.append(curr_cols)
-
-                elif fmt == GTVertexAttributeType.Format_Unk1: #UInt16
-                    curr_unk = []
-                    for _ in range(count):
-                        val = reader.read_uint16()
-                        if at['stride'] > 2: reader.read_bytes(at['stride'] - 2)
-                        
-                        norm = val / 65535.0
-                        curr_unk.append((norm, norm, norm, 1.0))
-                    extra_layers.append({"name": f"UNK1_{fmt}", "data": curr_unk})
-
-                elif fmt == GTVertexAttributeType.Format_Unk2: # float, float
-                    curr_unk = []
-                    for _ in range(count):
-                        v1 = reader.read_float()
-                        v2 = reader.read_float()
-                        curr_unk.append((v1, v2, 0.0, 1.0))
-                    extra_layers.append({"name": f"UNK2_{fmt}", "data": curr_unk})
-                
-                elif fmt == GTVertexAttributeType.Format_Unk3: # float
-                    curr_unk = []
-                    for _ in range(count):
-                        v1 = reader.read_float()
-                        curr_unk.append((v1, v1, v1, 1.0))
-                    extra_layers.append({"name": f"UNK3_{fmt}", "data": curr_unk})
-                
-                elif fmt == GTVertexAttributeType.Format_Unk4: # Int16
-                    curr_unk = []
-                    for _ in range(count):
-                        val = reader.read_int16()
-                        if at['stride'] > 2: reader.read_bytes(at['stride'] - 2)
-                        norm = (val + 32768) / 65535.0 
-                        curr_unk.append((norm, norm, norm, 1.0))
-                    extra_layers.append({"name": f"UNK4_{fmt}", "data": curr_unk})
-                
-                elif fmt == GTVertexAttributeType.Format_Unk5: # Int32
-                    curr_unk = []
-                    for _ in range(count):
-                        val = reader.read_int32()
-                        norm = abs(val) / 2147483647.0
-                        curr_unk.append((norm, norm, norm, 1.0))
-                    extra_layers.append({"name": f"UNK5_{fmt}", "data": curr_unk})
-
-            if verts:
-                imported_count += 1
-                mname = f"LOD{lod}_{hex_hash}"
-                mesh = bpy.data.meshes.new(mname)
-                obj = bpy.data.objects.new(mname, mesh)
+        key = submesh_fingerprint(data, buffer_offset, hdr['idx_off'], hdr['v_offs'], meta)['key']
+        dec = decoded.get(key)
+        if dec is None:
+            dec = decode_submesh(data, buffer_offset, hdr['idx_off'], hdr['v_offs'], meta,
+                                 read_weights=read_weights and skeleton_data is not None)
+            decoded[key] = dec
+        if dec['verts'] is not None and len(dec['verts']) > 0:
+            loaded['parts'].append((hex_hash, hdr['lod'], dec))
+
+    return loaded
+
+def loop_vertex_indices(mesh):
+    loop_vi = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vi)
+    return loop_vi
+
+def apply_mesh_layers(mesh, normals, uvs_layers, colors):
+    loop_vi = loop_vertex_indices(mesh)
+
+    # apply normals
+    if normals is not None and len(normals) == len(mesh.vertices):
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+        loop_normals = normals[loop_vi]
+        try: 
+            mesh.normals_split_custom_set(loop_normals)
+        except AttributeError:
+            mesh.create_normals_split()
+            mesh.normals_split_custom_set(loop_normals)
+        except: pass
+
+    # apply UV
+    for i, layer in enumerate(uvs_layers):
+        uv_l = mesh.uv_layers.new(name=f"UVMap_{i}")
+        uv_l.data.foreach_set("uv", layer[loop_vi].ravel())
+
+    # apply colors
+    for i, col_data in enumerate(colors):
+        vcol = mesh.color_attributes.new(name=f"Color_{i}", type='BYTE_COLOR', domain='CORNER')
+        vcol.data.foreach_set("color", col_data[loop_vi].ravel())
+
+def bind_to_armature(obj, arm_obj):
+    # create vertex groups
+    for bone in arm_obj.data.bones:
+        if bone.name not in obj.vertex_groups:
+            obj.vertex_groups.new(name=bone.name)
+
+    obj.parent = arm_obj
+    mod = obj.modifiers.new("Armature", 'ARMATURE')
+    mod.object = arm_obj
+
+def add_vertex_weights(obj, bone_ids, bone_weights, first_vertex=0):
+    vert_idx = np.repeat(np.arange(first_vertex, first_vertex + len(bone_ids), dtype=np.int32), 4)
+    bone_ids = bone_ids.ravel(); bone_weights = bone_weights.ravel()
+    used = bone_ids >= 0
+    vert_idx = vert_idx[used]; bone_ids = bone_ids[used]; bone_weights = bone_weights[used]
+    if len(bone_ids) == 0: return
+
+    # one add() call per (bone, weight) pair instead of one per vertex influence
+    order = np.lexsort((bone_weights, bone_ids))
+    vert_idx = vert_idx[order]; bone_ids = bone_ids[order]; bone_weights = bone_weights[order]
+    breaks = np.flatnonzero((np.diff(bone_ids) != 0) | (np.diff(bone_weights) != 0)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.append(breaks, len(bone_ids))
+
+    for s, e in zip(starts, ends):
+        g = obj.vertex_groups.get(f"Bone_{bone_ids[s]}")
+        if g: g.add(vert_idx[s:e].tolist(), float(bone_weights[s]), 'REPLACE')
+
+def apply_weights(obj, weights, arm_obj):
+    bind_to_armature(obj, arm_obj)
+    add_vertex_weights(obj, weights[0], weights[1])
+
+def build_mesh_data(name, verts, faces):
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+
+    mesh.loops.add(len(faces) * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(faces) * 3, 3, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+def build_mesh_object(name, dec, col, arm_obj=None):
+    # creates the blender object for one decoded submesh
+    mesh = build_mesh_data(name, dec['verts'], dec['faces'])
+    obj = bpy.data.objects.new(name, mesh)
+    col.objects.link(obj)
+    
+    apply_mesh_layers(mesh, dec['normals'], dec['uvs_layers'], dec['colors'])
+    
+    if dec['weights'] is not None and arm_obj:
+        apply_weights(obj, dec['weights'], arm_obj)
+    return obj
+
+def build_loaded_file(context, loaded, use_skeleton=True, collection=None, merge=False, link_duplicates=False):
+    # main thread part of the import: collection, skeleton and mesh objects
+    col = collection
+    if col is None:
+        col = bpy.data.collections.new(loaded['name'])
+        context.scene.collection.children.link(col)
+    
+    arm_obj = None
+    skeleton_data = loaded['skeleton']
+    if use_skeleton and skeleton_data:
+        # reuse the rig of an existing (proxy) collection so swapped meshes bind to it
+        if collection is not None:
+            arm_obj = next((o for o in col.objects if o.type == 'ARMATURE'), None)
+        if arm_obj is None:
+            arm_obj = build_skeleton(skeleton_data, col)
+
+    parts = loaded['parts']
+    if merge and parts:
+        from .merge import build_merged_object
+        build_merged_object(f"{loaded['name']}_merged", parts, col, arm_obj, loaded['filepath'])
+    else:
+        # duplicates are built once, every object gets its own copy of the mesh datablock
+        # (or the same datablock with link_duplicates, editing one then edits all of them)
+        meshes = {}
+        for hex_hash, lod, dec in parts:
+            name = f"LOD{lod}_{hex_hash}"
+            shared = meshes.get(id(dec))
+            if shared is None:
+                meshes[id(dec)] = build_mesh_object(name, dec, col, arm_obj).data
+            else:
+                mesh = shared if link_duplicates else shared.copy()
+                if mesh is not shared: mesh.name = name
+                obj = bpy.data.objects.new(name, mesh)
                 col.objects.link(obj)
-                
-                mesh.from_pydata(verts, [], faces)
-                
-                # apply normals
-                if normals and len(normals) == len(verts):
-                    mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
-                    loop_normals = [normals[loop.vertex_index] for loop in mesh.loops]
-                    try: 
-                        mesh.normals_split_custom_set(loop_normals)
-                    except AttributeError:
-                        mesh.create_normals_split()
-                        mesh.normals_split_custom_set(loop_normals)
-                    except: pass
-
-                # apply UV
-                for i, layer in enumerate(uvs_layers):
-                    uv_l = mesh.uv_layers.new(name=f"UVMap_{i}")
-                    for loop in mesh.loops: 
-                        uv_l.data[loop.index].uv = layer[loop.vertex_index]
-
-                # apply colors
-                for i, col_data in enumerate(colors):
-                    vcol = mesh.color_attributes.new(name=f"Color_{i}", type='BYTE_COLOR', domain='CORNER')
-                    for loop in mesh.loops: 
-                        vcol.data[loop.index].color = col_data[loop.vertex_index]
-
-                # apply weights
-                idx_attr = next((at for at in meta['attributes'] if at['format'] == GTVertexAttributeType.Format_16_16_16_16_Unit), None)
-                wgt_attr = next((at for at in meta['attributes'] if at['format'] == GTVertexAttributeType.Format_8_8_8_8_Unorm), None)
-                
-                if idx_attr and wgt_attr and arm_obj:
-                    idx_idx = meta['attributes'].index(idx_attr)
-                    wgt_idx = meta['attributes'].index(wgt_attr)
-                    idx_stride = idx_attr['stride']
-                    wgt_stride = wgt_attr['stride']
-                    
-                    # create vertex groups
-                    for bone in arm_obj.data.bones:
-                        if bone.name not in obj.vertex_groups:
-                            obj.vertex_groups.new(name=bone.name)
-
-                    obj.parent = arm_obj
-                    mod = obj.modifiers.new("Armature", 'ARMATURE')
-                    mod.object = arm_obj
-                    
-                    # read raw buffers for weights
-                    reader.seek(buffer_offset + v_offs[idx_idx])
-                    raw_idx_buffer = reader.read_bytes(idx_attr['count'] * idx_stride)
-                    reader.seek(buffer_offset + v_offs[wgt_idx])
-                    raw_wgt_buffer = reader.read_bytes(wgt_attr['count'] * wgt_stride)
-
-                    # weights per vertex
-                    for k in range(len(verts)):
-                        curr_idx_pos = k * idx_stride
-                        raw_ids = struct.unpack('<4h', raw_idx_buffer[curr_idx_pos : curr_idx_pos + 8])
-                        
-                        curr_wgt_pos = k * wgt_stride
-                        ws = struct.unpack('<4B', raw_wgt_buffer[curr_wgt_pos : curr_wgt_pos + 4])
-                        
-                        w_explicit_1 = ws[0] if raw_ids[1] != -1 else 0
-                        w_explicit_2 = ws[1] if raw_ids[2] != -1 else 0
-                        w_explicit_3 = ws[2] if raw_ids[3] != -1 else 0
-                        
-                        sum_explicit = w_explicit_1 + w_explicit_2 + w_explicit_3
-                        w_implicit_0 = max(0, 255 - sum_explicit)
-                        
-                        id_0 = raw_ids[0] if raw_ids[0] >= 0 else 0
-                        id_1 = raw_ids[1]
-                        id_2 = raw_ids[2]
-                        id_3 = raw_ids[3]
-                        
-                        assignments = []
-                        total_sum = 0.0
-                        
-                        def push_w(bid, val):
-                            nonlocal total_sum
-                            if bid >= 0 and val > 0:
-                                w_float = val / 255.0
-                                assignments.append((bid, w_float))
-                                total_sum += w_float
-
-                        push_w(id_0, w_implicit_0)
-                        push_w(id_1, w_explicit_1)
-                        push_w(id_2, w_explicit_2)
-                        push_w(id_3, w_explicit_3)
-                        
-                        # assign to groups
-                        for b_id, w in assignments:
-                            final_w = w / total_sum if total_sum > 0 else w
-                            if final_w > 0.001:
-                                g_name = f"Bone_{b_id}"
-                                g = obj.vertex_groups.get(g_name)
-                                if g: g.add([k], final_w, 'REPLACE')
-
-        # advance to next mesh header
-        reader.seek(header_start + 15 + (4 * num_v))
+                if dec['weights'] is not None and arm_obj:
+                    # groups are created in bone order, so the shared deform data lines up
+                    bind_to_armature(obj, arm_obj)
+
+    return len(parts)
+
+def import_selected(context, filepath, selected_hashes=None, use_skeleton=True, db_path="", collection=None, merge=False, link_duplicates=False):
+    xpps_data = parse_xpps_metadata(find_xpps_path(filepath))
+    if not xpps_data[0]: return "ERROR: No XPPS metadata found."
+
+    loaded = read_xmesh_file(filepath, selected_hashes, read_weights=use_skeleton, xpps_data=xpps_data)
+    imported_count = build_loaded_file(context, loaded, use_skeleton, collection, merge, link_duplicates)
     
-    return f"SUCCESS: Imported {imported_count} meshes"
\ No newline at end of file
+    return f"SUCCESS: Imported {imported_count} meshes"
+
+def import_files(context, filepaths, use_skeleton=True, merge=False, max_workers=None, link_duplicates=False):
+    # reads and decodes many xmesh files on a thread pool, blender data is still created on the main thread
+    # as soon as each file is ready, so disk reads and decoding of the other files keep running meanwhile
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+
+    imported_count = 0
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # shared xpps files (hero.xpps) are parsed once and submitted first so no reader waits on a queued job
+        xpps_jobs = {}
+        for p in filepaths:
+            xpps_path = find_xpps_path(p)
+            if xpps_path not in xpps_jobs:
+                xpps_jobs[xpps_path] = pool.submit(parse_xpps_metadata, xpps_path)
+
+        def load(path):
+            return read_xmesh_file(path, read_weights=use_skeleton, xpps_data=xpps_jobs[find_xpps_path(path)].result())
+
+        jobs = {pool.submit(load, p): p for p in filepaths}
+
+        for job in as_completed(jobs):
+            try:
+                loaded = job.result()
+            except Exception as e:
+                print(f"[Ghost] Failed to read {jobs[job]}: {e}")
+                failed.append(jobs[job])
+                continue
+
+            if not loaded['parts']:
+                failed.append(jobs[job])
+                continue
+            imported_count += build_loaded_file(context, loaded, use_skeleton, merge=merge, link_duplicates=link_duplicates)
+
+    msg = f"SUCCESS: Imported {imported_count} meshes from {len(filepaths) - len(failed)} files"
+    if failed:
+        msg += f" ({len(failed)} failed)"
+    return msg
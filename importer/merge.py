@@ -0,0 +1,139 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+import bpy
+import bmesh
+import numpy as np
+from .core import build_mesh_data, apply_mesh_layers, apply_weights
+
+# face attribute holding the index into obj["ghost_parts"]
+PART_ATTRIBUTE = "ghost_part"
+
+def fit_layer(layer, count, width, fill):
+    # pads/truncates a per-vertex layer so concatenated indices stay aligned
+    out = np.full((count, width), fill, dtype=np.float32)
+    if layer is not None:
+        n = min(count, len(layer))
+        out[:n] = layer[:n]
+    return out
+
+def build_merged_object(name, parts, col, arm_obj, filepath):
+    # one object (and one armature modifier) for many submeshes
+    # parts: list of (hex hash, lod, decoded submesh)
+    n_uv = max(len(dec['uvs_layers']) for _, _, dec in parts)
+    n_col = max(len(dec['colors']) for _, _, dec in parts)
+    has_normals = any(dec['normals'] is not None and len(dec['normals']) == len(dec['verts']) for _, _, dec in parts)
+    has_weights = arm_obj is not None and any(dec['weights'] is not None for _, _, dec in parts)
+
+    verts = []; faces = []; normals = []; part_ids = []
+    uvs_layers = [[] for _ in range(n_uv)]
+    colors = [[] for _ in range(n_col)]
+    bone_ids = []; bone_weights = []
+
+    base = 0
+    for part_idx, (_, _, dec) in enumerate(parts):
+        nv = len(dec['verts'])
+
+        verts.append(dec['verts'])
+        faces.append(dec['faces'] + base)
+        part_ids.append(np.full(len(dec['faces']), part_idx, dtype=np.int32))
+
+        if has_normals:
+            # zero custom normals fall back to the automatic ones
+            normals.append(fit_layer(dec['normals'], nv, 3, 0.0))
+
+        for i in range(n_uv):
+            layer = dec['uvs_layers'][i] if i < len(dec['uvs_layers']) else None
+            uvs_layers[i].append(fit_layer(layer, nv, 2, 0.0))
+
+        for i in range(n_col):
+            layer = dec['colors'][i] if i < len(dec['colors']) else None
+            colors[i].append(fit_layer(layer, nv, 4, 1.0))
+
+        if has_weights:
+            if dec['weights'] is not None:
+                bone_ids.append(dec['weights'][0]); bone_weights.append(dec['weights'][1])
+            else:
+                bone_ids.append(np.full((nv, 4), -1, dtype=np.int32)); bone_weights.append(np.zeros((nv, 4), dtype=np.float32))
+        base += nv
+
+    verts = np.concatenate(verts)
+    faces = np.concatenate(faces)
+
+    mesh = build_mesh_data(name, verts, faces)
+    obj = bpy.data.objects.new(name, mesh)
+    col.objects.link(obj)
+
+    apply_mesh_layers(
+        mesh,
+        np.concatenate(normals) if has_normals else None,
+        [np.concatenate(layer) for layer in uvs_layers],
+        [np.concatenate(layer) for layer in colors]
+    )
+
+    attr = mesh.attributes.new(PART_ATTRIBUTE, 'INT', 'FACE')
+    attr.data.foreach_set("value", np.concatenate(part_ids))
+
+    if has_weights:
+        apply_weights(obj, (np.concatenate(bone_ids), np.concatenate(bone_weights)), arm_obj)
+
+    obj["ghost_source"] = filepath
+    obj["ghost_parts"] = [hex_hash for hex_hash, _, _ in parts]
+    obj["ghost_part_lods"] = [lod for _, lod, _ in parts]
+
+    print(f"[Ghost] Merged {len(parts)} submeshes into {name} ({len(verts)} verts)")
+    return obj
+
+def split_merged_object(obj):
+    # splits a merged import back into one LOD{lod}_{hash} object per part for injection
+    mesh = obj.data
+    if PART_ATTRIBUTE not in mesh.attributes:
+        return []
+
+    hashes = list(obj.get("ghost_parts", []))
+    lods = list(obj.get("ghost_part_lods", []))
+
+    part_ids = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.attributes[PART_ATTRIBUTE].data.foreach_get("value", part_ids)
+
+    new_objects = []
+    for part_idx in np.unique(part_ids).tolist():
+        hex_hash = hashes[part_idx] if part_idx < len(hashes) else str(part_idx)
+        lod = lods[part_idx] if part_idx < len(lods) else 0
+        name = f"LOD{lod}_{hex_hash}"
+
+        part_mesh = mesh.copy()
+        part_mesh.name = name
+
+        bm = bmesh.new()
+        bm.from_mesh(part_mesh)
+        layer = bm.faces.layers.int.get(PART_ATTRIBUTE)
+        other_faces = [f for f in bm.faces if f[layer] != part_idx]
+        # deleting faces also drops the vertices only they were using
+        bmesh.ops.delete(bm, geom=other_faces, context='FACES')
+        bm.to_mesh(part_mesh)
+        bm.free()
+
+        part_mesh.attributes.remove(part_mesh.attributes[PART_ATTRIBUTE])
+
+        part_obj = obj.copy()
+        part_obj.data = part_mesh
+        part_obj.name = name
+        for key in ("ghost_parts", "ghost_part_lods"):
+            if key in part_obj: del part_obj[key]
+        part_obj["ghost_hash"] = hex_hash
+
+        for c in obj.users_collection:
+            c.objects.link(part_obj)
+        new_objects.append(part_obj)
+
+    return new_objects
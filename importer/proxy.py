@@ -0,0 +1,143 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+import bpy
+import os
+import mmap
+import mathutils
+from ..utils import BinaryReader, GTVertexAttributeType, GLOBAL_MATRIX, decode_pos
+from .core import parse_xpps_metadata, read_mesh_headers, find_xpps_path, import_selected
+from .skeleton import build_skeleton
+
+# quad faces of a box built from 8 corners (bit 0 = x, bit 1 = y, bit 2 = z)
+BOX_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+def bbox_corners(meta):
+    # snorm positions are stored as (raw / 32767) * scale + offset,
+    # so every vertex lies inside offset +- scale on each axis
+    s = meta['scale']
+    o = meta['offset']
+    corners = []
+    for i in range(8):
+        p = (
+            o[0] + (s if i & 1 else -s),
+            o[1] + (s if i & 2 else -s),
+            o[2] + (s if i & 4 else -s),
+        )
+        corners.append(GLOBAL_MATRIX @ mathutils.Vector(p))
+    return corners
+
+def sample_positions(reader, buffer_offset, v_offs, meta, sample_count):
+    # reads every n-th vertex of the position stream, only the touched pages get loaded
+    if not meta['attributes'] or not v_offs:
+        return []
+
+    at = meta['attributes'][0]
+    count = at['count']; stride = at['stride']
+    step = max(1, count // max(1, sample_count))
+    base = buffer_offset + v_offs[0]
+
+    points = []
+    for k in range(0, count, step):
+        reader.seek(base + k * stride)
+        if at['format'] == GTVertexAttributeType.Format_16_16_16_Snorm:
+            p = decode_pos(reader, at, meta)
+        elif at['format'] == GTVertexAttributeType.Format_32_32_32_Float:
+            p = reader.read_vec3()
+        else:
+            return []
+        points.append(GLOBAL_MATRIX @ mathutils.Vector(p))
+    return points
+
+def import_proxies(context, filepath, selected_hashes=None, use_skeleton=True, mode='BOX', sample_count=256):
+    # creates cheap placeholders for every submesh, full data is loaded later on demand
+    xpps_path = find_xpps_path(filepath)
+    metadata, skeleton_data = parse_xpps_metadata(xpps_path)
+    if not metadata: return "ERROR: No XPPS metadata found."
+
+    fname = os.path.splitext(os.path.basename(filepath))[0]
+    col = bpy.data.collections.new(fname)
+    context.scene.collection.children.link(col)
+
+    if use_skeleton and skeleton_data:
+        build_skeleton(skeleton_data, col)
+
+    proxy_count = 0
+
+    with open(filepath, 'rb') as f:
+        # mapped instead of read, box proxies never touch the vertex buffers at all
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            reader = BinaryReader(data)
+            buffer_offset, headers = read_mesh_headers(reader)
+
+            for hdr in headers:
+                m_hash = hdr['hash']
+                hex_hash = f"{m_hash:X}"
+
+                if selected_hashes and hex_hash not in selected_hashes: continue
+                if m_hash not in metadata: continue
+                meta = metadata[m_hash]
+
+                mname = f"PROXY_LOD{hdr['lod']}_{hex_hash}"
+                mesh = bpy.data.meshes.new(mname)
+
+                if mode == 'SAMPLE':
+                    points = sample_positions(reader, buffer_offset, hdr['v_offs'], meta, sample_count)
+                    if not points: points = bbox_corners(meta)
+                    mesh.from_pydata(points, [], [])
+                else:
+                    mesh.from_pydata(bbox_corners(meta), [], BOX_FACES)
+
+                obj = bpy.data.objects.new(mname, mesh)
+                # loose points are invisible in object mode, so sampled proxies draw their bounds
+                obj.display_type = 'BOUNDS' if mode == 'SAMPLE' else 'WIRE'
+                obj.hide_render = True
+
+                obj["ghost_proxy"] = True
+                obj["ghost_source"] = filepath
+                obj["ghost_hash"] = hex_hash
+                obj["ghost_lod"] = hdr['lod']
+
+                col.objects.link(obj)
+                proxy_count += 1
+        finally:
+            data.close()
+
+    return f"SUCCESS: Created {proxy_count} proxies"
+
+def load_full_proxies(context, proxies, use_skeleton=True, db_path=""):
+    # swaps proxy objects for the real meshes, grouped so each file is read once
+    by_source = {}
+    for obj in proxies:
+        key = (obj["ghost_source"], obj.users_collection[0] if obj.users_collection else None)
+        by_source.setdefault(key, []).append(obj)
+
+    new_objects = []
+    for (src, col), objs in by_source.items():
+        if not os.path.exists(src):
+            print(f"[Ghost] Proxy source missing: {src}")
+            continue
+
+        hashes = [o["ghost_hash"] for o in objs]
+        before = set(col.objects) if col else set()
+        import_selected(context, src, selected_hashes=hashes, use_skeleton=use_skeleton, db_path=db_path, collection=col)
+        if col:
+            new_objects.extend(o for o in col.objects if o not in before)
+
+        for o in objs:
+            mesh = o.data
+            bpy.data.objects.remove(o)
+            if mesh and mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+    return new_objects
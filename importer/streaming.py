@@ -0,0 +1,207 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# low memory import for very large files
+# the xmesh is memory mapped instead of read, and each stream of a submesh is decoded,
+# written to blender and released before the next one is touched
+
+import bpy
+import os
+import mmap
+import traceback
+import numpy as np
+from ..utils import BinaryReader, GTVertexAttributeType
+from .core import parse_xpps_metadata, read_mesh_headers, find_xpps_path, loop_vertex_indices, bind_to_armature, add_vertex_weights
+from .skeleton import build_skeleton
+from .streams import decode_indices, decode_positions, decode_snorm10, decode_uvs, decode_colors, decode_weights
+
+# rough size of the numpy temporaries per decoded vertex (raw view copies, float conversion, rotation)
+TEMP_BYTES_PER_VERTEX = 64
+
+class StreamBudget:
+    def __init__(self, budget_mb):
+        self.limit = max(16, budget_mb) * 1024 * 1024
+        self.chunk = max(1024, self.limit // TEMP_BYTES_PER_VERTEX)
+        self.skipped = 0
+
+    def fits(self, nbytes, what):
+        # a full attribute array still has to exist for foreach_set, skip optional layers that can't
+        if nbytes <= self.limit: return True
+        print(f"[Ghost] Skipping {what}: {nbytes // (1024*1024)} MB exceeds the memory budget")
+        self.skipped += 1
+        return False
+
+    def chunk_for(self, reserved):
+        # vertices per decode step once the full arrays (reserved bytes) are taken out of the budget
+        return max(1024, (self.limit - reserved) // TEMP_BYTES_PER_VERTEX)
+
+def decode_chunked(decode, total, width, budget, reserved=0):
+    # fills one output array while keeping the decode temporaries at chunk size,
+    # the output itself and the arrays the caller keeps next to it (reserved) count against the budget
+    out = np.empty((total, width), dtype=np.float32)
+    chunk = budget.chunk_for(out.nbytes + reserved)
+    for s in range(0, total, chunk):
+        n = min(chunk, total - s)
+        out[s:s + n] = decode(s, n)
+    return out
+
+def release_pages(data, start, length):
+    # drops the mapped pages of a consumed range from the resident set (where supported)
+    if hasattr(mmap, "MADV_DONTNEED") and length > 0:
+        page = mmap.PAGESIZE
+        aligned = start - (start % page)
+        try: data.madvise(mmap.MADV_DONTNEED, aligned, length + (start - aligned))
+        except (OSError, ValueError): pass
+
+def stream_submesh(data, name, buffer_offset, hdr, meta, col, arm_obj, budget):
+    attrs = meta['attributes']
+    v_offs = hdr['v_offs']
+    pos_idx = next((i for i, at in enumerate(attrs) if at['format'] in (GTVertexAttributeType.Format_16_16_16_Snorm, GTVertexAttributeType.Format_32_32_32_Float)), None)
+    if pos_idx is None: return None
+
+    pos_attr = attrs[pos_idx]
+    vcount = pos_attr['count']
+    pos_off = buffer_offset + v_offs[pos_idx]
+
+    mesh = bpy.data.meshes.new(name)
+
+    # positions, the one array that can't be skipped (foreach_set needs all of it at once)
+    if vcount * 12 > budget.limit:
+        print(f"[Ghost] Positions of {name} need {vcount * 12 // (1024*1024)} MB, more than the memory budget")
+    verts = decode_chunked(lambda s, n: decode_positions(data, pos_off, pos_attr, meta, s, n), vcount, 3, budget)
+    mesh.vertices.add(vcount)
+    mesh.vertices.foreach_set("co", verts.ravel())
+    del verts
+    release_pages(data, pos_off, vcount * pos_attr['stride'])
+
+    # indices
+    idx_off = buffer_offset + hdr['idx_off']
+    faces = decode_indices(data, idx_off, meta.get('face_count', 0))
+    mesh.loops.add(len(faces) * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(faces) * 3, 3, dtype=np.int32))
+    del faces
+    release_pages(data, idx_off, meta.get('face_count', 0) * 2)
+    mesh.update(calc_edges=True)
+
+    obj = bpy.data.objects.new(name, mesh)
+    col.objects.link(obj)
+
+    loop_vi = None
+    cnt_snorm10 = 0; uv_i = 0; col_i = 0
+
+    for ai, at in enumerate(attrs):
+        fmt = at['format']; count = min(at['count'], vcount)
+        offset = buffer_offset + v_offs[ai]
+
+        if fmt == GTVertexAttributeType.Format_10_10_10_Snorm:
+            # only the first one is the normal, tangents are rebuilt by blender
+            # set per corner like the regular import, per vertex when the corner array exceeds the budget
+            if cnt_snorm10 == 0 and count == vcount:
+                per_corner = count * 12 + len(mesh.loops) * 16 <= budget.limit
+                normals = decode_chunked(lambda s, n: decode_snorm10(data, offset, n, s), count, 3, budget,
+                                         len(mesh.loops) * 16 if per_corner else 0)
+                mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+                try:
+                    if per_corner:
+                        if loop_vi is None: loop_vi = loop_vertex_indices(mesh)
+                        mesh.normals_split_custom_set(normals[loop_vi])
+                    else:
+                        mesh.normals_split_custom_set_from_vertices(normals)
+                except: pass
+                del normals
+            cnt_snorm10 += 1
+
+        elif fmt == GTVertexAttributeType.Format_16_16_Float:
+            # uvs live on face corners, that array is the largest one of the import
+            if budget.fits((count + len(mesh.loops)) * 8 + len(mesh.loops) * 4, f"UVMap_{uv_i} of {name}"):
+                if loop_vi is None: loop_vi = loop_vertex_indices(mesh)
+                uvs = decode_chunked(lambda s, n: decode_uvs(data, offset, n, s), count, 2, budget, len(mesh.loops) * 12)
+                uv_l = mesh.uv_layers.new(name=f"UVMap_{uv_i}")
+                uv_l.data.foreach_set("uv", uvs[loop_vi].ravel())
+                del uvs
+            uv_i += 1
+
+        elif fmt == GTVertexAttributeType.Format_8_8_8_8_Unorm:
+            # face corner colors, the same layer the regular import creates
+            if count == vcount and budget.fits((count + len(mesh.loops)) * 16 + len(mesh.loops) * 4, f"Color_{col_i} of {name}"):
+                if loop_vi is None: loop_vi = loop_vertex_indices(mesh)
+                cols = decode_chunked(lambda s, n: decode_colors(data, offset, n, s), count, 4, budget, len(mesh.loops) * 20)
+                vcol = mesh.color_attributes.new(name=f"Color_{col_i}", type='BYTE_COLOR', domain='CORNER')
+                vcol.data.foreach_set("color", cols[loop_vi].ravel())
+                del cols
+            col_i += 1
+
+        release_pages(data, offset, count * at['stride'])
+
+    del loop_vi
+
+    # weights, applied chunk by chunk
+    idx_attr = next((at for at in attrs if at['format'] == GTVertexAttributeType.Format_16_16_16_16_Unit), None)
+    wgt_attr = next((at for at in attrs if at['format'] == GTVertexAttributeType.Format_8_8_8_8_Unorm), None)
+
+    if arm_obj and idx_attr and wgt_attr:
+        bind_to_armature(obj, arm_obj)
+        idx_off_w = buffer_offset + v_offs[attrs.index(idx_attr)]
+        wgt_off_w = buffer_offset + v_offs[attrs.index(wgt_attr)]
+
+        for s in range(0, vcount, budget.chunk):
+            n = min(budget.chunk, vcount - s)
+            bone_ids, bone_weights = decode_weights(data, idx_off_w, idx_attr['stride'], wgt_off_w, wgt_attr['stride'], n, s)
+            add_vertex_weights(obj, bone_ids, bone_weights, first_vertex=s)
+
+    return obj
+
+def import_streaming(context, filepath, selected_hashes=None, use_skeleton=True, budget_mb=1024, collection=None):
+    metadata, skeleton_data = parse_xpps_metadata(find_xpps_path(filepath))
+    if not metadata: return "ERROR: No XPPS metadata found."
+
+    col = collection
+    if col is None:
+        col = bpy.data.collections.new(os.path.splitext(os.path.basename(filepath))[0])
+        context.scene.collection.children.link(col)
+
+    arm_obj = None
+    if use_skeleton and skeleton_data:
+        if collection is not None:
+            arm_obj = next((o for o in col.objects if o.type == 'ARMATURE'), None)
+        if arm_obj is None:
+            arm_obj = build_skeleton(skeleton_data, col)
+
+    budget = StreamBudget(budget_mb)
+    imported_count = 0
+
+    with open(filepath, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            buffer_offset, headers = read_mesh_headers(BinaryReader(data))
+
+            for hdr in headers:
+                m_hash = hdr['hash']
+                hex_hash = f"{m_hash:X}"
+                if selected_hashes and hex_hash not in selected_hashes: continue
+                if m_hash not in metadata: continue
+
+                if stream_submesh(data, f"LOD{hdr['lod']}_{hex_hash}", buffer_offset, hdr, metadata[m_hash], col, arm_obj, budget):
+                    imported_count += 1
+        except BaseException as e:
+            # frames in the traceback can still hold numpy views of the map, close() would raise BufferError
+            traceback.clear_frames(e.__traceback__)
+            raise
+        finally:
+            data.close()
+
+    msg = f"SUCCESS: Imported {imported_count} meshes"
+    if budget.skipped:
+        msg += f" ({budget.skipped} layers skipped, raise the memory budget to keep them)"
+    return msg
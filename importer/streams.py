@@ -0,0 +1,149 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# numpy decoders for the xmesh vertex/index streams
+# they work on any buffer (bytes, mmap) and do not touch bpy, so they can run on worker threads
+# (numpy releases the GIL for the heavy array work)
+
+import struct
+import hashlib
+import numpy as np
+from ..utils import GTVertexAttributeType, GLOBAL_MATRIX
+
+GLOBAL_ROT = np.array(GLOBAL_MATRIX.to_3x3(), dtype=np.float32)
+
+def stream_view(data, offset, count, stride, dtype, width):
+    # (count, width) view over a (possibly interleaved) stream without copying
+    itemsize = np.dtype(dtype).itemsize
+    if count <= 0:
+        return np.zeros((0, width), dtype=dtype)
+    return np.ndarray((count, width), dtype=dtype, buffer=data, offset=offset, strides=(max(stride, width * itemsize), itemsize))
+
+def to_blender_space(vecs):
+    return vecs @ GLOBAL_ROT.T
+
+def decode_indices(data, offset, index_count):
+    # triangle list of uint16 indices, returns (F, 3) int32
+    tri_count = index_count // 3
+    if tri_count <= 0:
+        return np.zeros((0, 3), dtype=np.int32)
+    raw = np.frombuffer(data, dtype='<u2', count=tri_count * 3, offset=offset)
+    return raw.astype(np.int32).reshape(-1, 3)
+
+def decode_positions(data, offset, at, meta, start=0, count=None):
+    # returns (N, 3) float32 positions in blender space
+    if count is None: count = at['count'] - start
+    fmt = at['format']; stride = at['stride']
+
+    if fmt == GTVertexAttributeType.Format_16_16_16_Snorm:
+        stride = max(stride, 8)
+        raw = stream_view(data, offset + start * stride, count, stride, '<i2', 3)
+        # formula: (raw / 32767.0) * scale + offset
+        pos = raw.astype(np.float32) * np.float32(meta['scale'] / 32767.0)
+        pos += np.asarray(meta['offset'], dtype=np.float32)
+    else:
+        stride = max(stride, 12)
+        pos = stream_view(data, offset + start * stride, count, stride, '<f4', 3).astype(np.float32)
+    return to_blender_space(pos)
+
+def decode_snorm10(data, offset, count, start=0):
+    # packed 10_10_10_2 normals/tangents, returns (N, 3) float32 in blender space
+    raw = np.frombuffer(data, dtype='<u4', count=count, offset=offset + start * 4)
+    vecs = np.empty((count, 3), dtype=np.float32)
+    vecs[:, 0] = raw & 0x3FF
+    vecs[:, 1] = (raw >> 10) & 0x3FF
+    vecs[:, 2] = (raw >> 20) & 0x3FF
+    vecs *= np.float32(2.0 / 1023.0)
+    vecs -= 1.0
+    return to_blender_space(vecs)
+
+def decode_uvs(data, offset, count, start=0):
+    # half float uv pairs, returns (N, 2) float32
+    raw = np.frombuffer(data, dtype='<f2', count=count * 2, offset=offset + start * 4)
+    return raw.astype(np.float32).reshape(-1, 2)
+
+def decode_colors(data, offset, count, start=0):
+    # 8 bit rgba, returns (N, 4) float32
+    raw = np.frombuffer(data, dtype=np.uint8, count=count * 4, offset=offset + start * 4)
+    return raw.reshape(-1, 4).astype(np.float32) / np.float32(255.0)
+
+def decode_extra(data, offset, at):
+    # unknown formats, kept as normalized rgba values for inspection
+    # returns (layer name, (N, 4) float32) or None, same names and layout as the per-vertex reader
+    fmt = at['format']; count = at['count']; stride = at['stride']
+
+    if fmt == GTVertexAttributeType.Format_Unk1: # uint16
+        norm = stream_view(data, offset, count, max(stride, 2), '<u2', 1)[:, 0] / np.float32(65535.0)
+        return f"UNK1_{fmt}", gray_rgba(norm)
+    if fmt == GTVertexAttributeType.Format_Unk2: # float, float
+        raw = np.frombuffer(data, dtype='<f4', count=count * 2, offset=offset).reshape(-1, 2)
+        out = np.zeros((count, 4), dtype=np.float32)
+        out[:, :2] = raw; out[:, 3] = 1.0
+        return f"UNK2_{fmt}", out
+    if fmt == GTVertexAttributeType.Format_Unk3: # float
+        return f"UNK3_{fmt}", gray_rgba(np.frombuffer(data, dtype='<f4', count=count, offset=offset))
+    if fmt == GTVertexAttributeType.Format_Unk4: # int16
+        raw = stream_view(data, offset, count, max(stride, 2), '<i2', 1)[:, 0]
+        return f"UNK4_{fmt}", gray_rgba((raw.astype(np.float32) + 32768.0) / np.float32(65535.0))
+    if fmt == GTVertexAttributeType.Format_Unk5: # int32
+        raw = np.frombuffer(data, dtype='<i4', count=count, offset=offset)
+        return f"UNK5_{fmt}", gray_rgba(np.abs(raw.astype(np.float64)).astype(np.float32) / np.float32(2147483647.0))
+    return None
+
+def gray_rgba(values):
+    # (v, v, v, 1) per vertex
+    out = np.ones((len(values), 4), dtype=np.float32)
+    out[:, :3] = values[:, None]
+    return out
+
+def decode_weights(data, idx_offset, idx_stride, wgt_offset, wgt_stride, count, start=0):
+    # bone ids are 4x int16, weights 4x uint8 where the first weight is implicit (255 - others)
+    # returns (N, 4) int32 bone ids (-1 = unused) and (N, 4) float32 normalized weights
+    ids = stream_view(data, idx_offset + start * idx_stride, count, idx_stride, '<i2', 4).astype(np.int32)
+    ws = stream_view(data, wgt_offset + start * wgt_stride, count, wgt_stride, np.uint8, 4).astype(np.int32)
+
+    vals = np.zeros((count, 4), dtype=np.int32)
+    vals[:, 1:] = np.where(ids[:, 1:] != -1, ws[:, :3], 0)
+    vals[:, 0] = np.maximum(0, 255 - vals[:, 1:].sum(axis=1))
+
+    bids = ids.copy()
+    bids[:, 0] = np.maximum(ids[:, 0], 0)
+
+    valid = (bids >= 0) & (vals > 0)
+    w = np.where(valid, vals, 0).astype(np.float32) / np.float32(255.0)
+    total = w.sum(axis=1, keepdims=True)
+    w = np.divide(w, total, out=w.copy(), where=total > 0)
+
+    keep = valid & (w > 0.001)
+    return np.where(keep, bids, -1), np.where(keep, w, 0.0).astype(np.float32)
+
+def stream_digest(data, offset, length):
+    # content hash of a raw byte range (no copy for mmap/bytes)
+    with memoryview(data) as mv:
+        return hashlib.blake2b(mv[offset:offset + length], digest_size=16).hexdigest()
+
+def submesh_fingerprint(data, buffer_offset, idx_off, v_offs, meta):
+    # hashes the index range and every vertex stream range of one submesh
+    # 'key' also covers formats and the xpps scale/offset, equal keys decode to identical meshes
+    index_digest = stream_digest(data, buffer_offset + idx_off, meta.get('face_count', 0) * 2)
+    stream_digests = [
+        stream_digest(data, buffer_offset + v_offs[ai], at['count'] * at['stride'])
+        for ai, at in enumerate(meta['attributes'])
+    ]
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(index_digest.encode())
+    for at, d in zip(meta['attributes'], stream_digests):
+        h.update(f"{at['format']}:{at['stride']}:{at['count']}:{d}".encode())
+    h.update(struct.pack('<4f', meta['offset'][0], meta['offset'][1], meta['offset'][2], meta['scale']))
+
+    return {'index': index_digest, 'streams': stream_digests, 'key': h.hexdigest()}
@@ -22,4 +22,7 @@
 # supporting the development via Ko-fi. Every donation is appreciated!
 # -----------------------------------------------------------------------------------
 
-from .writer import inject_mesh
\ No newline at end of file
+from .writer import inject_mesh, inject_meshes
+from .estimate import export_estimate, clear_estimates
+from .matching import match_slots
+from .incremental import geometry_fingerprint, new_manifest, load_manifest, save_manifest, manifest_source
\ No newline at end of file
@@ -0,0 +1,57 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# real slot capacity from the xmesh buffer layout
+# a stream can grow up to the next offset any header points at (padding and alignment gaps included),
+# the original xpps counts are the lower bound
+
+import numpy as np
+
+# indices are written as u16
+MAX_VERTICES = 65536
+
+def stream_capacities(buffer_size, headers, meta_map):
+    # headers: hash -> (index offset, vertex buffer offsets), relative to the buffer data start
+    # returns hash -> {'vertices': n, 'indices': n}
+    offsets = {buffer_size}
+    for idx_off, v_offs in headers.values():
+        offsets.add(idx_off)
+        offsets.update(v_offs)
+    offsets = np.array(sorted(offsets), dtype=np.int64)
+
+    def next_offset(pos, skip=()):
+        # first offset after pos, ignoring the ones in skip
+        for o in offsets[np.searchsorted(offsets, pos, side='right'):]:
+            if int(o) not in skip: return int(o)
+        return buffer_size
+
+    capacities = {}
+    for h, (idx_off, v_offs) in headers.items():
+        meta = meta_map.get(h)
+        if not meta: continue
+        orig_verts = meta.get('vertex_count', 0)
+        orig_indices = meta.get('face_count', 0)
+
+        indices = max(orig_indices, (next_offset(idx_off) - idx_off) // 2)
+
+        vertices = None
+        for off, attr in zip(v_offs, meta['attributes']):
+            stride = attr['stride']
+            if stride <= 0: continue
+            # offsets of this submesh inside the first row are interleaved streams of the same buffer
+            interleaved = {o for o in v_offs if off < o < off + stride}
+            fit = (next_offset(off, interleaved) - off) // stride
+            vertices = fit if vertices is None else min(vertices, fit)
+
+        vertices = orig_verts if vertices is None else max(orig_verts, min(vertices, MAX_VERTICES))
+        capacities[h] = {'vertices': vertices, 'indices': indices}
+    return capacities
@@ -0,0 +1,111 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# fits a replacement into the vertex/index budget of its slot
+# a temporary collapse decimate (quadric error, uvs and weights interpolated) is added to the object
+# and its ratio is searched against the counts of the processed mesh, so seam splits are taken into account
+# uv seams are protected by a temporary vertex group of seam and uv island boundary vertices,
+# collapse (unlike dissolve) ignores delimit but weighs edge costs by a vertex group
+
+import numpy as np
+from .mesh_processing import process_mesh
+
+MODIFIER_NAME = "GhostFitDecimate"
+SEAM_GROUP = "GhostFitSeams"
+
+# collapse cost multiplier for edges touching the seam group is 1 + 2 * factor (max 1000)
+SEAM_FACTOR = 100.0
+
+# search stops after this many evaluations or once the ratio interval is this small
+MAX_STEPS = 12
+RATIO_TOLERANCE = 0.002
+
+def fits(mesh_data, max_verts, max_indices):
+    return len(mesh_data.vertices) <= max_verts and len(mesh_data.indices) <= max_indices
+
+def seam_vertices(mesh):
+    # vertices on marked seams or where the active uv layer splits them (uv island boundaries)
+    seams = np.zeros(len(mesh.vertices), dtype=bool)
+
+    edge_count = len(mesh.edges)
+    if edge_count:
+        use_seam = np.empty(edge_count, dtype=bool)
+        mesh.edges.foreach_get("use_seam", use_seam)
+        edge_verts = np.empty(edge_count * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edge_verts)
+        seams[edge_verts.reshape(-1, 2)[use_seam].ravel()] = True
+
+    loop_count = len(mesh.loops)
+    if mesh.uv_layers.active and loop_count:
+        loop_vi = np.empty(loop_count, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vi)
+        uvs = np.empty(loop_count * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+
+        # a vertex is split when its corners don't share one uv
+        lo = np.full((len(mesh.vertices), 2), np.inf, dtype=np.float32)
+        hi = np.full((len(mesh.vertices), 2), -np.inf, dtype=np.float32)
+        np.minimum.at(lo, loop_vi, uvs)
+        np.maximum.at(hi, loop_vi, uvs)
+        seams |= ((hi - lo) > 1e-6).any(axis=1)
+
+    return np.flatnonzero(seams)
+
+def fit_to_capacity(obj, max_verts, max_indices, mesh_data=None):
+    # returns (mesh_data, ratio) of the least decimated mesh that fits, or (None, 0.0)
+    if mesh_data is None:
+        mesh_data = process_mesh(obj)
+    if mesh_data is None: return None, 0.0
+    if fits(mesh_data, max_verts, max_indices): return mesh_data, 1.0
+    if max_verts < 3 or max_indices < 3: return None, 0.0
+
+    # the group lives on the original mesh and follows it through the modifiers above the decimate
+    group = None
+    seams = seam_vertices(obj.data)
+    if len(seams):
+        group = obj.vertex_groups.new(name=SEAM_GROUP)
+        group.add(seams.tolist(), 1.0, 'REPLACE')
+
+    mod = obj.modifiers.new(MODIFIER_NAME, 'DECIMATE')
+    mod.decimate_type = 'COLLAPSE'
+    mod.use_collapse_triangulate = True
+    if group is not None:
+        # inverted: vertices outside the group collapse freely, seam vertices are expensive to move
+        mod.vertex_group = group.name
+        mod.invert_vertex_group = True
+        mod.vertex_group_factor = SEAM_FACTOR
+
+    best, best_ratio = None, 0.0
+    try:
+        # counts scale roughly linear with the ratio, start just below the proportional guess
+        lo, hi = 0.0, 1.0
+        ratio = 0.98 * min(max_verts / len(mesh_data.vertices), max_indices / len(mesh_data.indices))
+
+        for _ in range(MAX_STEPS):
+            mod.ratio = ratio
+            data = process_mesh(obj)
+            if data is not None and fits(data, max_verts, max_indices):
+                best, best_ratio = data, ratio
+                lo = ratio
+            else:
+                hi = ratio
+            if hi - lo < RATIO_TOLERANCE: break
+            ratio = (lo + hi) * 0.5
+    finally:
+        obj.modifiers.remove(mod)
+        if group is not None:
+            obj.vertex_groups.remove(group)
+
+    if best is not None:
+        print(f"[Ghost] Decimated {obj.name} to ratio {best_ratio:.3f}: {len(best.vertices)}/{max_verts} Verts, {len(best.indices)}/{max_indices} Indices")
+    return best, best_ratio
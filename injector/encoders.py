@@ -0,0 +1,152 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# numpy encoders for the xmesh vertex streams, the inverse of importer/streams.py
+# every encoder returns one (N, width) uint8 block so a whole stream is written in one call
+# the rounding/truncation matches the old per-vertex struct.pack writer byte for byte
+
+import numpy as np
+from ..utils import GTVertexAttributeType
+
+# position w of the 16 bit snorm format (half float 1.0)
+SNORM_W = 0x3C00
+
+def as_bytes(arr):
+    return np.ascontiguousarray(arr).view(np.uint8).reshape(len(arr), -1)
+
+def encode_positions_snorm(vertices, offset, scale):
+    # (val - offset) / scale, clamped and truncated to int16
+    norm = (vertices.astype(np.float64) - np.asarray(offset, dtype=np.float64)) / float(scale)
+    out = np.empty((len(vertices), 4), dtype='<i2')
+    out[:, :3] = (np.clip(norm, -1.0, 1.0) * 32767.0).astype(np.int16)
+    out[:, 3] = np.int16(SNORM_W)
+    return as_bytes(out)
+
+def encode_positions_float(vertices):
+    out = np.ones((len(vertices), 4), dtype='<f4')
+    out[:, :3] = vertices
+    return as_bytes(out)
+
+def encode_10_10_10_2(vecs, w):
+    # vecs in -1..1, w in 0..1
+    v10 = (np.clip((vecs.astype(np.float64) + 1.0) * 0.5, 0.0, 1.0) * 1023.0).astype(np.uint32)
+    w2 = (np.clip(np.asarray(w, dtype=np.float64), 0.0, 1.0) * 3.0).astype(np.uint32)
+    packed = v10[:, 0] | (v10[:, 1] << 10) | (v10[:, 2] << 20) | (w2 << 30)
+    return as_bytes(packed.astype('<u4').reshape(-1, 1))
+
+def encode_normals(normals):
+    return encode_10_10_10_2(normals, np.zeros(len(normals)))
+
+def encode_tangents(tangents):
+    return encode_10_10_10_2(tangents[:, :3], np.where(tangents[:, 3] > 0, 1.0, 0.0))
+
+def encode_uvs(uvs):
+    return as_bytes(uvs.astype('<f2'))
+
+def encode_unorm8(values):
+    return (np.clip(values.astype(np.float64), 0.0, 1.0) * 255.0).astype(np.uint8)
+
+def encode_weights(bone_weights):
+    # the first weight is implicit (255 - others), the last byte stays 0
+    out = np.zeros((len(bone_weights), 4), dtype=np.uint8)
+    out[:, :3] = encode_unorm8(bone_weights[:, 1:4])
+    return out
+
+def encode_colors(colors):
+    return encode_unorm8(colors[:, :4])
+
+def encode_bone_indices(bone_indices):
+    return as_bytes(bone_indices.astype('<i2'))
+
+def fit_stride(block, stride):
+    # pads with zeros or truncates every row to the stream stride
+    width = block.shape[1]
+    if width == stride: return block
+    if width > stride: return block[:, :stride]
+    out = np.zeros((len(block), stride), dtype=np.uint8)
+    out[:, :width] = block
+    return out
+
+def stream_roles(attributes):
+    # what every stream of a submesh holds, decided once for the whole layout
+    # the first stream is always the position, the first 10_10_10 stream is the normal and later ones tangents,
+    # 8_8_8_8 streams are weights as soon as the layout has a bone index stream
+    has_bone_idx = any(a['format'] == GTVertexAttributeType.Format_16_16_16_16_Unit for a in attributes)
+    roles = []
+    seen_snorm = False
+
+    for ai, attr in enumerate(attributes):
+        fmt = attr['format']
+        if ai == 0:
+            role = 'position_snorm' if attr['stride'] == 8 else 'position_float'
+        elif fmt == GTVertexAttributeType.Format_32_32_32_Float:
+            role = 'extra_position'
+        elif fmt == GTVertexAttributeType.Format_10_10_10_Snorm:
+            role = 'tangent' if seen_snorm else 'normal'
+        elif fmt == GTVertexAttributeType.Format_16_16_Float:
+            role = 'uv'
+        elif fmt == GTVertexAttributeType.Format_8_8_8_8_Unorm:
+            role = 'weights' if has_bone_idx else 'color'
+        elif fmt == GTVertexAttributeType.Format_16_16_16_16_Unit:
+            role = 'bone_indices'
+        else:
+            role = None # unknown formats are left untouched
+
+        if fmt == GTVertexAttributeType.Format_10_10_10_Snorm:
+            seen_snorm = True
+        roles.append(role)
+    return roles
+
+def stream_layout(attributes, starts, vert_count):
+    # per stream: role, absolute start, stride and the vertices it must skip
+    # a stream is skipped at a vertex where its bytes overlap a stream already written for that same vertex
+    # (interleaved buffers share one region), skip is None when every vertex is written
+    idx = np.arange(vert_count, dtype=np.int64)
+    written = []
+    layout = []
+
+    for attr, start, role in zip(attributes, starts, stream_roles(attributes)):
+        stride = attr['stride']
+        entry = {'role': role, 'start': start, 'stride': stride, 'skip': None, 'format': attr['format']}
+        layout.append(entry)
+        if role is None or vert_count == 0: continue
+
+        lo = start + idx * stride
+        skip = np.zeros(vert_count, dtype=bool)
+        for w_lo, w_stride, w_skip in written:
+            skip |= (lo < w_lo + w_stride) & (w_lo < lo + stride) & ~w_skip
+
+        if skip.all():
+            entry['role'] = None
+            continue
+        if skip.any():
+            entry['skip'] = skip
+        written.append((lo, stride, skip))
+    return layout
+
+def encode_stream(role, mesh_data, stride):
+    # returns the (N, width) block and whether it covers the full stride
+    # positions only write their own bytes, everything else is padded/truncated to the stride
+    if role == 'position_snorm':
+        return encode_positions_snorm(mesh_data.vertices, mesh_data.offset, mesh_data.scale)[:, :stride], False
+    if role == 'position_float':
+        return encode_positions_float(mesh_data.vertices)[:, :stride], False
+
+    if role == 'extra_position': block = encode_positions_float(mesh_data.vertices)
+    elif role == 'normal': block = encode_normals(mesh_data.normals)
+    elif role == 'tangent': block = encode_tangents(mesh_data.tangents)
+    elif role == 'uv': block = encode_uvs(mesh_data.uvs)
+    elif role == 'weights': block = encode_weights(mesh_data.bone_weights)
+    elif role == 'color': block = encode_colors(mesh_data.colors)
+    elif role == 'bone_indices': block = encode_bone_indices(mesh_data.bone_indices)
+    else: return None, False
+    return fit_stride(block, stride), True
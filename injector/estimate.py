@@ -0,0 +1,73 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# exact export budget of blender objects (unique game vertices and indices after triangulation)
+# counts are cached per object and dropped by a depsgraph handler when the object's geometry changes
+
+import bpy
+from bpy.app.handlers import persistent
+from .mesh_processing import export_counts
+
+# object key -> (vertex count, index count)
+_counts = {}
+
+def object_key(obj):
+    obj = getattr(obj, "original", None) or obj
+    return getattr(obj, "session_uid", None) or obj.name_full
+
+def export_estimate(obj):
+    # (vertex count, index count) process_mesh would produce for obj
+    if obj.type != 'MESH': return 0, 0
+    key = object_key(obj)
+    counts = _counts.get(key)
+    if counts is not None: return counts
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        counts = export_counts(mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+
+    _counts[key] = counts
+    return counts
+
+def clear_estimates():
+    _counts.clear()
+
+@persistent
+def ghost_estimate_update(scene, depsgraph):
+    if not _counts: return
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Object):
+            if update.is_updated_geometry:
+                _counts.pop(object_key(id_data), None)
+        elif isinstance(id_data, bpy.types.Mesh):
+            # mesh data shared by several objects, the object updates don't always come with it
+            mesh = getattr(id_data, "original", None) or id_data
+            for obj in bpy.data.objects:
+                if obj.data == mesh:
+                    _counts.pop(object_key(obj), None)
+
+def register_handler():
+    handlers = bpy.app.handlers.depsgraph_update_post
+    for h in [h for h in handlers if getattr(h, "__name__", "") == ghost_estimate_update.__name__]:
+        handlers.remove(h) # left over from a reload
+    handlers.append(ghost_estimate_update)
+
+def unregister_handler():
+    handlers = bpy.app.handlers.depsgraph_update_post
+    for h in [h for h in handlers if getattr(h, "__name__", "") == ghost_estimate_update.__name__]:
+        handlers.remove(h)
+    clear_estimates()
@@ -0,0 +1,120 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# incremental export: a manifest in the mod folder remembers the source files and a fingerprint
+# of every injected replacement, so an update only re-injects the parts whose evaluated geometry changed
+# 'written' lists every slot the mod file was ever patched in, those need a rebuild once dropped
+
+import os
+import json
+import hashlib
+import bpy
+import numpy as np
+
+MANIFEST_NAME = "ghost_mod.json"
+MANIFEST_VERSION = 2
+
+def file_state(path):
+    # [size, mtime] or [0, 0] for missing files
+    try:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime]
+    except OSError:
+        return [0, 0.0]
+
+def read_array(collection, attr, count, width, dtype=np.float32):
+    out = np.empty(count * width, dtype=dtype)
+    collection.foreach_get(attr, out)
+    return out
+
+def geometry_fingerprint(obj, options=""):
+    # digest of everything process_mesh reads from the evaluated object:
+    # positions, topology, corner normals, active uv/color and the bone vertex groups
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(options.encode())
+
+        vert_count, loop_count, poly_count = len(mesh.vertices), len(mesh.loops), len(mesh.polygons)
+        h.update(np.array([vert_count, loop_count, poly_count], dtype=np.int64).tobytes())
+        h.update(read_array(mesh.vertices, "co", vert_count, 3).tobytes())
+        h.update(read_array(mesh.loops, "vertex_index", loop_count, 1, np.int32).tobytes())
+        h.update(read_array(mesh.polygons, "loop_total", poly_count, 1, np.int32).tobytes())
+
+        if hasattr(mesh, "calc_normals_split"):
+            mesh.calc_normals_split()
+        h.update(read_array(mesh.loops, "normal", loop_count, 3).tobytes())
+
+        if mesh.uv_layers:
+            h.update(read_array(mesh.uv_layers.active.data, "uv", loop_count, 2).tobytes())
+
+        col_attr = mesh.color_attributes.active_color
+        if col_attr:
+            h.update(col_attr.domain.encode())
+            h.update(read_array(col_attr.data, "color", len(col_attr.data), 4).tobytes())
+
+        # only groups named Bone_n end up in the file
+        groups = {g.index: g.name for g in obj.vertex_groups if g.name.startswith("Bone_")}
+        if groups:
+            h.update(json.dumps(sorted(groups.items())).encode())
+            weights = [(v.index, g.group, g.weight) for v in mesh.vertices for g in v.groups if g.group in groups]
+            h.update(np.array(weights, dtype=np.float64).tobytes())
+        return h.hexdigest()
+    finally:
+        eval_obj.to_mesh_clear()
+
+def new_manifest(xmesh_path, xpps_path):
+    return {
+        'version': MANIFEST_VERSION,
+        'source_xmesh': os.path.abspath(xmesh_path),
+        'source_xpps': os.path.abspath(xpps_path),
+        'source_state': [file_state(xmesh_path), file_state(xpps_path)],
+        'target_state': [],
+        'parts': {},
+        'written': [],
+    }
+
+def read_manifest(mod_dir):
+    try:
+        with open(os.path.join(mod_dir, MANIFEST_NAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def manifest_source(mod_dir):
+    # the xmesh a mod folder was exported from, None without a manifest
+    manifest = read_manifest(mod_dir)
+    return manifest.get('source_xmesh') if isinstance(manifest, dict) else None
+
+def load_manifest(mod_dir, xmesh_path, xpps_path):
+    # the manifest of an existing mod folder, None if it can't be updated in place
+    # (other source files, sources changed, or the mod files were touched by something else)
+    manifest = read_manifest(mod_dir)
+    if not isinstance(manifest, dict): return None
+    if manifest.get('version') != MANIFEST_VERSION: return None
+    if manifest.get('source_xmesh') != os.path.abspath(xmesh_path): return None
+    if manifest.get('source_xpps') != os.path.abspath(xpps_path): return None
+    if manifest.get('source_state') != [file_state(xmesh_path), file_state(xpps_path)]: return None
+
+    targets = target_paths(mod_dir, xmesh_path, xpps_path)
+    if manifest.get('target_state') != [file_state(p) for p in targets]: return None
+    return manifest
+
+def save_manifest(mod_dir, manifest, xmesh_path, xpps_path):
+    manifest['target_state'] = [file_state(p) for p in target_paths(mod_dir, xmesh_path, xpps_path)]
+    with open(os.path.join(mod_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+def target_paths(mod_dir, xmesh_path, xpps_path):
+    return [os.path.join(mod_dir, os.path.basename(xmesh_path)), os.path.join(mod_dir, os.path.basename(xpps_path))]
@@ -0,0 +1,117 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# slot assignment for auto match: min cost bipartite matching of objects to submesh slots
+# pairs that exceed the vertex or index capacity are infeasible, among the rest tight fits are cheapest,
+# objects named after a slot hash (imported parts) stick to it, and similar sizes are preferred
+
+import numpy as np
+
+# cost of a pair that doesn't fit, high enough that the solver maximizes the number of fitting pairs first
+INFEASIBLE = 1e6
+
+# bonus for an object whose name contains the slot hash
+NAME_BONUS = 4.0
+
+def solve_assignment(cost):
+    # hungarian algorithm (shortest augmenting paths with potentials) on an (n, m) cost matrix
+    # returns the column of every row, -1 for rows left over when n > m
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+    if n == 0 or m == 0: return np.full(n, -1, dtype=np.int64)
+
+    if n > m:
+        cols = solve_assignment(cost.T)
+        rows = np.full(n, -1, dtype=np.int64)
+        rows[cols] = np.arange(m)
+        return rows
+
+    # 1-based rows/columns, column 0 is the virtual start of every augmenting path
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64) # row matched to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            free[0] = False
+
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+
+            j0 = j1
+            if p[j0] == 0: break
+
+        # flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = np.full(n, -1, dtype=np.int64)
+    matched = np.flatnonzero(p[1:])
+    result[p[1:][matched] - 1] = matched
+    return result
+
+def assignment_cost(objects, slots, size_weight=1.0):
+    # objects: dicts with 'verts', 'indices', 'name' and optional 'extent' (max half size)
+    # slots: dicts with 'capacity', 'index_capacity', 'hash' and optional 'scale' (xpps half size)
+    verts = np.array([o['verts'] for o in objects], dtype=np.float64)[:, None]
+    indices = np.array([o['indices'] for o in objects], dtype=np.float64)[:, None]
+    cap = np.array([s['capacity'] for s in slots], dtype=np.float64)[None, :]
+    idx_cap = np.array([s['index_capacity'] for s in slots], dtype=np.float64)[None, :]
+
+    # unused share of both buffers, 0 for a perfect fit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost = np.nan_to_num((cap - verts) / cap) + np.nan_to_num((idx_cap - indices) / idx_cap)
+
+    if size_weight > 0:
+        extent = np.array([o.get('extent') or 0.0 for o in objects], dtype=np.float64)[:, None]
+        scale = np.array([s.get('scale') or 0.0 for s in slots], dtype=np.float64)[None, :]
+        known = (extent > 0) & (scale > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.abs(np.log(np.where(known, extent / np.where(scale > 0, scale, 1.0), 1.0)))
+        cost += size_weight * np.minimum(ratio, 2.0)
+
+    names = [o['name'].lower() for o in objects]
+    for j, s in enumerate(slots):
+        h = s['hash'].lower()
+        for i, name in enumerate(names):
+            if h and h in name: cost[i, j] -= NAME_BONUS
+
+    cost[(verts > cap) | (indices > idx_cap)] = INFEASIBLE
+    return cost
+
+def match_slots(objects, slots, size_weight=1.0):
+    # returns [(object index, slot index)] for every object that fits a slot
+    if not objects or not slots: return []
+    cost = assignment_cost(objects, slots, size_weight)
+    cols = solve_assignment(cost)
+    return [(i, int(j)) for i, j in enumerate(cols) if j >= 0 and cost[i, j] < INFEASIBLE]
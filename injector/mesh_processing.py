@@ -11,151 +11,238 @@
 # -------------------------------------------------------------------
 
 import bpy
-import bmesh
 import mathutils
+import numpy as np
 from ..utils import EXPORT_MATRIX
 
+EXPORT_ROT = np.array(EXPORT_MATRIX.to_3x3(), dtype=np.float64)
+
+# quantization steps of the dedup key, same precision the old rounded tuple used
+POS_QUANT = 1e4
+NORMAL_QUANT = 1e3
+UV_QUANT = 1e4
+
 class ProcessedMesh:
     def __init__(self):
-        self.vertices = []      # list of Vector
-        self.normals = []       # list of Vector
-        self.tangents = []      # list of tuple (x,y,z,w)
-        self.uvs = []           # list of tuple (u,v)
-        self.colors = []        # list of tuple (r,g,b,a)
+        self.vertices = None    # (N, 3) float32
+        self.normals = None     # (N, 3) float32
+        self.tangents = None    # (N, 4) float32, w = bitangent sign
+        self.uvs = None         # (N, 2) float32
+        self.colors = None      # (N, 4) float32
         
         # skinning data
-        self.bone_indices = []  # list of [i,i,i,i]
-        self.bone_weights = []  # list of [w,w,w,w]
+        self.bone_indices = None  # (N, 4) int32, -1 = unused
+        self.bone_weights = None  # (N, 4) float32
         
-        self.indices = []       # flat list of triangle indices
-        self.direction = []     # extra data (often unused)
+        self.indices = None     # (T*3,) int32 triangle indices
+        self.direction = None   # extra data (often unused)
         
         # bounding box info
         self.offset = mathutils.Vector((0,0,0))
         self.scale = 1.0
 
+def read_loop_vectors(collection, attr, count, width):
+    out = np.empty(count * width, dtype=np.float32)
+    collection.foreach_get(attr, out)
+    return out.reshape(-1, width)
+
+def to_game_space(vecs):
+    return (vecs @ EXPORT_ROT.T).astype(np.float32)
+
+def normalized(vecs):
+    length = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return np.divide(vecs, length, out=np.zeros_like(vecs), where=length > 0)
+
+def vertex_keys(positions, normals, uvs):
+    # quantized (position, normal, uv) per corner, corners with equal keys become one game vertex
+    keys = np.empty((len(positions), 8), dtype=np.int64)
+    keys[:, 0:3] = np.round(positions * POS_QUANT)
+    keys[:, 3:6] = np.round(normals * NORMAL_QUANT)
+    keys[:, 6:8] = np.round(uvs * UV_QUANT)
+    return keys
+
+def unique_vertices(positions, normals, uvs):
+    # merges corners that are geometrically identical
+    # returns the first corner of every output vertex (in order of appearance) and the corner -> vertex map
+    keys = vertex_keys(positions, normals, uvs)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # np.unique sorts the keys, renumber so vertices keep the order they first appear in
+    order = np.argsort(first, kind='stable')
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    return first[order], rank[inverse]
+
+def vertex_weights(obj, mesh):
+    # top 4 bone weights of every vertex as dense (V, 4) arrays, normalized
+    bone_indices = np.full((len(mesh.vertices), 4), -1, dtype=np.int32)
+    bone_weights = np.zeros((len(mesh.vertices), 4), dtype=np.float32)
+
+    # vertex group index -> bone index (-1 for groups that aren't bones)
+    group_bone = np.full(max(len(obj.vertex_groups), 1), -1, dtype=np.int32)
+    for g in obj.vertex_groups:
+        if g.name.startswith("Bone_"):
+            try: group_bone[g.index] = int(g.name.split("_")[1])
+            except: pass
+    if not (group_bone >= 0).any():
+        return bone_indices, bone_weights
+
+    # one flat pass over all group memberships
+    entries = [(v.index, g.group, g.weight) for v in mesh.vertices for g in v.groups]
+    if not entries:
+        return bone_indices, bone_weights
+    entries = np.array(entries, dtype=np.float64)
+    vi = entries[:, 0].astype(np.int64)
+    gi = entries[:, 1].astype(np.int64)
+    w = entries[:, 2].astype(np.float32)
+
+    bones = np.where(gi < len(group_bone), group_bone[np.minimum(gi, len(group_bone) - 1)], -1)
+    keep = bones >= 0
+    vi, bones, w = vi[keep], bones[keep], w[keep]
+
+    # heaviest first per vertex (stable, like the old per-vertex sort), rank within the vertex
+    order = np.lexsort((-w, vi))
+    vi, bones, w = vi[order], bones[order], w[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(vi)) + 1]
+    rank = np.arange(len(vi)) - np.repeat(starts, np.diff(np.r_[starts, len(vi)]))
+    top = rank < 4
+
+    bone_indices[vi[top], rank[top]] = bones[top]
+    bone_weights[vi[top], rank[top]] = w[top]
+
+    # normalize weights to sum to 1.0
+    total = bone_weights.sum(axis=1, keepdims=True)
+    np.divide(bone_weights, total, out=bone_weights, where=total > 0)
+    return bone_indices, bone_weights
+
+def triangle_tangents(positions, normals, uvs):
+    # per corner tangents from the uv gradient of each triangle
+    # fallback for meshes with ngons, where calc_tangents (mikktspace) refuses to run
+    p = positions.reshape(-1, 3, 3).astype(np.float64)
+    t = uvs.reshape(-1, 3, 2).astype(np.float64)
+    e1 = p[:, 1] - p[:, 0]; e2 = p[:, 2] - p[:, 0]
+    d1 = t[:, 1] - t[:, 0]; d2 = t[:, 2] - t[:, 0]
+
+    det = d1[:, 0] * d2[:, 1] - d2[:, 0] * d1[:, 1]
+    r = np.divide(1.0, det, out=np.zeros_like(det), where=np.abs(det) > 1e-12)[:, None]
+    tan = np.repeat((e1 * d2[:, 1:2] - e2 * d1[:, 1:2]) * r, 3, axis=0)
+    bit = np.repeat((e2 * d1[:, 0:1] - e1 * d2[:, 0:1]) * r, 3, axis=0)
+
+    n = normals.astype(np.float64)
+    tan = normalized(tan - n * (n * tan).sum(axis=1, keepdims=True))
+
+    out = np.empty((len(tan), 4), dtype=np.float32)
+    out[:, :3] = tan
+    out[:, 3] = np.where((np.cross(n, tan) * bit).sum(axis=1) < 0.0, -1.0, 1.0)
+    return out
+
 def process_mesh(obj):
     print(f"[Ghost] Processing Blender Mesh: {obj.name}")
     
     depsgraph = bpy.context.evaluated_depsgraph_get()
     eval_obj = obj.evaluated_get(depsgraph)
-    
-    bm = bmesh.new()
-    bm.from_object(eval_obj, depsgraph)
-    
-    bmesh.ops.triangulate(bm, faces=bm.faces)
-    
-    temp_mesh = bpy.data.meshes.new("TempInject")
-    bm.to_mesh(temp_mesh)
-    bm.free()
-    
+
+    # the evaluated mesh is read in place, triangles come from loop_triangles
+    # instead of a bmesh triangulate + temp mesh copy
+    mesh = eval_obj.to_mesh()
+    try:
+        return read_evaluated_mesh(obj, mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+
+def read_corners(mesh, tri_count):
+    # the triangle corners and the attributes that make up the dedup key, bulk reads with one call per attribute
+    loop_count = len(mesh.loops)
+    corners = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", corners)
+
+    loop_vi = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vi)
+    corner_vi = loop_vi[corners]
+    co = read_loop_vectors(mesh.vertices, "co", len(mesh.vertices), 3)
+
+    # transform position/normal to game space
+    positions = to_game_space(co[corner_vi])
+    normals = normalized(to_game_space(read_loop_vectors(mesh.loops, "normal", loop_count, 3)[corners]))
+
+    uvs = np.zeros((len(corners), 2), dtype=np.float32)
+    if mesh.uv_layers:
+        uvs = read_loop_vectors(mesh.uv_layers.active.data, "uv", loop_count, 2)[corners]
+    return corners, corner_vi, positions, normals, uvs
+
+def export_counts(mesh):
+    # exact (vertex count, index count) read_evaluated_mesh would produce, without tangents, colors or weights
+    mesh.calc_loop_triangles()
+    tri_count = len(mesh.loop_triangles)
+    if tri_count == 0: return 0, 0
+
+    if hasattr(mesh, "calc_normals_split"):
+        mesh.calc_normals_split()
+
+    _, _, positions, normals, uvs = read_corners(mesh, tri_count)
+    return len(np.unique(vertex_keys(positions, normals, uvs), axis=0)), tri_count * 3
+
+def read_evaluated_mesh(obj, mesh):
+    mesh.calc_loop_triangles()
+    tri_count = len(mesh.loop_triangles)
+    if tri_count == 0:
+        print("[Ghost] Error: No vertices extracted!")
+        return None
+
+    if hasattr(mesh, "calc_normals_split"): # removed in 4.1, corner normals are always available there
+        mesh.calc_normals_split()
+
+    corners, corner_vi, positions, normals, uvs = read_corners(mesh, tri_count)
+
     # calculate tangents for normal mapping
-    if temp_mesh.uv_layers:
-        try: temp_mesh.calc_tangents()
+    has_tangents = False
+    if mesh.uv_layers:
+        try:
+            mesh.calc_tangents()
+            has_tangents = True
         except: pass
-        
+
+    loop_count = len(mesh.loops)
+    if has_tangents:
+        tangents = np.empty((len(corners), 4), dtype=np.float32)
+        tangents[:, :3] = normalized(to_game_space(read_loop_vectors(mesh.loops, "tangent", loop_count, 3)[corners]))
+        signs = np.empty(loop_count, dtype=np.float32)
+        mesh.loops.foreach_get("bitangent_sign", signs)
+        tangents[:, 3] = signs[corners]
+    elif mesh.uv_layers:
+        tangents = triangle_tangents(positions, normals, uvs)
+    else:
+        tangents = np.zeros((len(corners), 4), dtype=np.float32)
+
+    colors = np.ones((len(corners), 4), dtype=np.float32)
+    col_attr = mesh.color_attributes.active_color
+    if col_attr:
+        if col_attr.domain == 'CORNER':
+            colors = read_loop_vectors(col_attr.data, "color", loop_count, 4)[corners]
+        elif col_attr.domain == 'POINT':
+            colors = read_loop_vectors(col_attr.data, "color", len(mesh.vertices), 4)[corner_vi]
+
+    # merge identical corners into game vertices
+    first_corner, indices = unique_vertices(positions, normals, uvs)
+
     data = ProcessedMesh()
-    
-    unique_verts = {}
-    next_idx = 0
-    
-    uv_layer = temp_mesh.uv_layers.active.data if temp_mesh.uv_layers else None
-    col_layer = temp_mesh.color_attributes.active_color.data if temp_mesh.color_attributes.active_color else None
-    
-    # build bone mapping (vertex group name-> bone index)
-    bone_map = {}
-    for g in obj.vertex_groups:
-        if g.name.startswith("Bone_"):
-            try: 
-                b_idx = int(g.name.split("_")[1])
-                bone_map[g.index] = b_idx
-            except: 
-                pass
-
-    for poly in temp_mesh.polygons:
-        for loop_idx in poly.loop_indices:
-            loop = temp_mesh.loops[loop_idx]
-            v = temp_mesh.vertices[loop.vertex_index]
-            
-            # transform position/normal to game space
-            pos = EXPORT_MATRIX @ v.co
-            norm = (EXPORT_MATRIX.to_3x3() @ loop.normal).normalized()
-            
-            # extract uv
-            uv = (0.0, 0.0)
-            if uv_layer: 
-                raw_uv = uv_layer[loop_idx].uv
-                uv = (raw_uv.x, raw_uv.y)
-                
-            # extract tangent
-            tan = (1.0, 0.0, 0.0, 1.0)
-            if hasattr(loop, "tangent"):
-                t = (EXPORT_MATRIX.to_3x3() @ loop.tangent).normalized()
-                tan = (t.x, t.y, t.z, loop.bitangent_sign)
-            
-            # extract weights
-            w_list = []
-            for g in v.groups:
-                if g.group in bone_map:
-                    w_list.append((bone_map[g.group], g.weight))
-            
-            w_list.sort(key=lambda x: x[1], reverse=True)
-            w_list = w_list[:4]
-            
-            # normalize weights to sum to 1.0
-            total = sum(w for b,w in w_list)
-            if total > 0: 
-                w_list = [(b, w/total) for b,w in w_list]
-            
-            final_bi = [-1]*4
-            final_bw = [0.0]*4
-            
-            for i, (bid, w) in enumerate(w_list):
-                final_bi[i] = bid
-                final_bw[i] = w
-            
-            # extract color
-            col = (1.0, 1.0, 1.0, 1.0)
-            if col_layer and hasattr(col_layer[loop_idx], "color"): 
-                col = col_layer[loop_idx].color
-            
-            # rounding is important to merge vertices that are geometrically identical
-            key = (
-                round(pos.x, 4), round(pos.y, 4), round(pos.z, 4), 
-                round(norm.x, 3), round(norm.y, 3), round(norm.z, 3), 
-                round(uv[0], 4), round(uv[1], 4)
-            )
-            
-            if key in unique_verts:
-                data.indices.append(unique_verts[key])
-            else:
-                unique_verts[key] = next_idx
-                data.indices.append(next_idx)
-                next_idx += 1
-                
-                #store attributes
-                data.vertices.append(pos)
-                data.normals.append(norm)
-                data.tangents.append(tan)
-                data.uvs.append(uv)
-                data.bone_indices.append(final_bi)
-                data.bone_weights.append(final_bw)
-                data.colors.append(col)
-                data.direction.append(0.0)
-
-    bpy.data.meshes.remove(temp_mesh)
-    
-    if not data.vertices: 
-        print("[Ghost] Error: No vertices extracted!")
-        return None
-    
+    data.indices = indices
+    data.vertices = positions[first_corner]
+    data.normals = normals[first_corner]
+    data.tangents = tangents[first_corner]
+    data.uvs = uvs[first_corner]
+    data.colors = colors[first_corner]
+
+    # weights are per vertex, gathered for the output vertices
+    bone_indices, bone_weights = vertex_weights(obj, mesh)
+    data.bone_indices = bone_indices[corner_vi[first_corner]]
+    data.bone_weights = bone_weights[corner_vi[first_corner]]
+    data.direction = np.zeros(len(first_corner), dtype=np.float32)
+
     # calculate bounding box (min/max) for compression
-    min_v = mathutils.Vector((999999.0, 999999.0, 999999.0))
-    max_v = mathutils.Vector((-999999.0, -999999.0, -999999.0))
-    
-    for v in data.vertices:
-        min_v.x = min(min_v.x, v.x); min_v.y = min(min_v.y, v.y); min_v.z = min(min_v.z, v.z)
-        max_v.x = max(max_v.x, v.x); max_v.y = max(max_v.y, v.y); max_v.z = max(max_v.z, v.z)
+    min_v = mathutils.Vector(data.vertices.min(axis=0).tolist())
+    max_v = mathutils.Vector(data.vertices.max(axis=0).tolist())
         
     # calculate offset (center) and scale (extent)
     data.offset = (min_v + max_v) * 0.5
@@ -167,4 +254,4 @@ def process_mesh(obj):
     print(f"[Ghost] BBox -> Min: {min_v} Max: {max_v}")
     print(f"[Ghost] Calc -> Offset: {data.offset} Scale: {data.scale}")
         
-    return data
\ No newline at end of file
+    return data
@@ -0,0 +1,161 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# index/vertex order optimization for exported meshes
+# triangles are reordered with tipsify (Sander, Nehab, Barczak 2007) for post-transform vertex cache reuse,
+# the fans it produces are sorted outside-in against overdraw, then vertices are renumbered in fetch order
+
+import numpy as np
+
+CACHE_SIZE = 16
+
+# the cluster sort may cost a few cache misses, it's dropped if acmr gets worse than this factor
+OVERDRAW_THRESHOLD = 1.05
+
+# ProcessedMesh fields that hold one row per vertex
+VERTEX_FIELDS = ("vertices", "normals", "tangents", "uvs", "colors", "bone_indices", "bone_weights", "direction")
+
+def acmr(indices, cache_size=CACHE_SIZE):
+    # average cache miss ratio (misses per triangle) of a fifo cache
+    tri_count = len(indices) // 3
+    if tri_count == 0: return 0.0
+
+    stamp = {}
+    misses = 0
+    for v in np.asarray(indices).tolist():
+        s = stamp.get(v)
+        if s is None or misses - s >= cache_size:
+            stamp[v] = misses
+            misses += 1
+    return misses / tri_count
+
+def vertex_triangles(tris, vert_count):
+    # csr adjacency: triangles of vertex v are adj[start[v]:start[v + 1]]
+    flat = tris.ravel()
+    adj = (np.argsort(flat, kind='stable') // 3).tolist()
+    counts = np.bincount(flat, minlength=vert_count)
+    start = np.concatenate(([0], np.cumsum(counts))).tolist()
+    return adj, start, counts.tolist()
+
+def tipsify(indices, vert_count, cache_size=CACHE_SIZE):
+    # returns the reordered indices and the triangle offsets where a new cluster (non local jump) starts
+    tris = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    tri_count = len(tris)
+    if tri_count == 0: return np.asarray(indices), [0]
+
+    adj, start, live = vertex_triangles(tris, vert_count)
+    tri_list = tris.tolist()
+    cache_time = [0] * vert_count
+    emitted = [False] * tri_count
+    dead_end = []
+    timestamp = cache_size + 1
+    cursor = 0
+
+    out = []
+    clusters = [0]
+    fan = 0
+    while fan >= 0:
+        candidates = []
+        for t in adj[start[fan]:start[fan + 1]]:
+            if emitted[t]: continue
+            emitted[t] = True
+            for v in tri_list[t]:
+                out.append(v)
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if timestamp - cache_time[v] > cache_size:
+                    cache_time[v] = timestamp
+                    timestamp += 1
+
+        # next fanning vertex: the one still in cache after emitting its remaining triangles, oldest first
+        fan, best = -1, 0
+        for v in candidates:
+            if live[v] <= 0: continue
+            priority = 0
+            if timestamp - cache_time[v] + 2 * live[v] <= cache_size:
+                priority = timestamp - cache_time[v]
+            if priority > best:
+                fan, best = v, priority
+        if fan >= 0: continue
+
+        # dead end, go back to a recently used vertex or scan for the next unfinished one
+        while dead_end:
+            v = dead_end.pop()
+            if live[v] > 0:
+                fan = v
+                break
+        else:
+            while cursor < vert_count:
+                if live[cursor] > 0:
+                    fan = cursor
+                    break
+                cursor += 1
+        if fan >= 0 and len(out) // 3 > clusters[-1]:
+            clusters.append(len(out) // 3)
+
+    return np.asarray(out, dtype=np.int64), clusters
+
+def sort_clusters(indices, positions, clusters):
+    # view independent overdraw order: clusters facing away from the mesh center are drawn first
+    tris = indices.reshape(-1, 3)
+    p0, p1, p2 = positions[tris[:, 0]], positions[tris[:, 1]], positions[tris[:, 2]]
+    normals = np.cross(p1 - p0, p2 - p0).astype(np.float64) # area weighted
+    centers = ((p0 + p1 + p2) / 3.0).astype(np.float64)
+
+    bounds = np.asarray(clusters, dtype=np.int64)
+    sizes = np.diff(np.append(bounds, len(tris)))
+    c_normal = np.add.reduceat(normals, bounds, axis=0)
+    c_center = np.add.reduceat(centers, bounds, axis=0) / sizes[:, None]
+    c_normal /= np.maximum(np.linalg.norm(c_normal, axis=1, keepdims=True), 1e-12)
+
+    key = np.einsum('ij,ij->i', c_center - centers.mean(axis=0), c_normal)
+    order = np.argsort(-key, kind='stable')
+    tri_order = np.concatenate([np.arange(bounds[c], bounds[c] + sizes[c]) for c in order])
+    return tris[tri_order].ravel()
+
+def vertex_fetch_order(indices, vert_count):
+    # old vertex index for every new one, in order of first use (unused vertices go last)
+    seen = np.zeros(vert_count, dtype=bool)
+    uniq, first = np.unique(indices, return_index=True)
+    seen[uniq] = True
+    used = uniq[np.argsort(first, kind='stable')]
+    return np.concatenate((used, np.flatnonzero(~seen)))
+
+def optimize_mesh(mesh_data, cache_size=CACHE_SIZE):
+    # reorders triangles and vertices of a ProcessedMesh in place, returns (acmr before, acmr after)
+    indices = np.asarray(mesh_data.indices, dtype=np.int64)
+    vert_count = len(mesh_data.vertices)
+    before = acmr(indices, cache_size)
+    if len(indices) < 3: return before, before
+
+    best, clusters = tipsify(indices, vert_count, cache_size)
+    after = acmr(best, cache_size)
+    if len(clusters) > 1:
+        sorted_indices = sort_clusters(best, mesh_data.vertices, clusters)
+        sorted_acmr = acmr(sorted_indices, cache_size)
+        if sorted_acmr <= after * OVERDRAW_THRESHOLD:
+            best, after = sorted_indices, sorted_acmr
+
+    if after > before:
+        return before, before # already better ordered than what tipsify found
+
+    order = vertex_fetch_order(best, vert_count)
+    remap = np.empty(vert_count, dtype=np.int64)
+    remap[order] = np.arange(vert_count)
+
+    mesh_data.indices = remap[best].astype(mesh_data.indices.dtype)
+    for name in VERTEX_FIELDS:
+        arr = getattr(mesh_data, name, None)
+        if arr is not None and len(arr) == vert_count:
+            setattr(mesh_data, name, arr[order])
+    return before, after
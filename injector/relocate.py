@@ -0,0 +1,113 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# buffer relocation for replacements that don't fit their slot:
+# the submesh gets fresh index/vertex buffers appended behind the buffer region and its SMBS header entry
+# is pointed at them, the old buffers stay in the file unused
+
+import struct
+import numpy as np
+
+ALIGNMENT = 16
+
+# header words that aren't sizes (buffer data start at 24, submesh count at 40)
+RESERVED_FIELDS = (24, 28, 40)
+
+def align(pos):
+    return (pos + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def stream_groups(v_offs, attributes):
+    # interleaved streams share one buffer: a stream that starts inside the first row of another joins its group
+    # returns [(first stream index, [member indices])]
+    order = sorted(range(len(v_offs)), key=lambda i: v_offs[i])
+    groups = []
+    for i in order:
+        if groups:
+            base = groups[-1][0]
+            if v_offs[i] < v_offs[base] + attributes[base]['stride']:
+                groups[-1][1].append(i)
+                continue
+        groups.append((i, [i]))
+    return groups
+
+def plan_relocation(header, meta, buffer_data_start, vert_count, index_count, end):
+    # new (index offset, vertex offsets) behind end (absolute), returns it with the new end of file
+    # buffers are sized for whichever is larger, the original or the new mesh, so padding stays in bounds
+    _, v_offs = header
+    attrs = meta['attributes']
+    rows = max(meta.get('vertex_count', 0), vert_count)
+
+    pos = align(end)
+    new_idx = pos - buffer_data_start
+    pos = align(pos + max(meta.get('face_count', 0), index_count) * 2)
+
+    new_offs = list(v_offs)
+    for base, members in stream_groups(v_offs, attrs):
+        for i in members:
+            new_offs[i] = pos - buffer_data_start + (v_offs[i] - v_offs[base])
+        pos = align(pos + rows * attrs[base]['stride'])
+    return (new_idx, tuple(new_offs)), pos
+
+def write_header_offsets(mm, target_hash, header):
+    # points the SMBS header entry of target_hash at new buffers, False if the hash isn't in the table
+    num_meshes = struct.unpack_from('<I', mm, 40)[0]
+    pos = 44
+    for _ in range(num_meshes):
+        mh = struct.unpack_from('<Q', mm, pos)[0]
+        num_v_buffers = mm[pos + 14]
+        if mh == target_hash:
+            idx_offset, v_offs = header
+            struct.pack_into('<I', mm, pos + 8, idx_offset)
+            struct.pack_into(f'<{num_v_buffers}I', mm, pos + 15, *v_offs[:num_v_buffers])
+            return True
+        pos += 15 + 4 * num_v_buffers
+    return False
+
+def size_fields(mm, buffer_data_start):
+    # header words whose value is the file size or the buffer region size (the layout isn't known),
+    # as u32, or u64 on 8 byte alignment when the high word is zero
+    # returns [(offset, format, is_region)]
+    size = len(mm)
+    region = size - buffer_data_start
+    fields = []
+    off = 4
+    while off < 40:
+        if off in RESERVED_FIELDS:
+            off += 4
+            continue
+        value = struct.unpack_from('<I', mm, off)[0]
+        if value in (size, region) and value > 0:
+            wide = off % 8 == 0 and off + 4 not in RESERVED_FIELDS and struct.unpack_from('<I', mm, off + 4)[0] == 0
+            fields.append((off, '<Q' if wide else '<I', value != size))
+            off += 8 if wide else 4
+            continue
+        off += 4
+    return fields
+
+def size_field(mm, buffer_data_start):
+    # the one header field to update when the file grows, None unless exactly one word matches
+    # (zero matches: the size is stored somewhere else, several: at least one of them is a coincidence)
+    fields = size_fields(mm, buffer_data_start)
+    return fields[0] if len(fields) == 1 else None
+
+def mentions_size(mm, size):
+    # True if the xpps holds size as an aligned u32/u64, a size stored there would go stale on relocation
+    words = np.frombuffer(mm, dtype='<u4', count=len(mm) // 4)
+    try:
+        return bool(np.any(words == size))
+    finally:
+        del words # the mmap can't close while numpy holds its buffer
+
+def update_size_field(mm, field, buffer_data_start):
+    off, fmt, is_region = field
+    size = len(mm)
+    struct.pack_into(fmt, mm, off, size - buffer_data_start if is_region else size)
@@ -11,259 +11,340 @@
 # -------------------------------------------------------------------
 
 import os
+import mmap
 import struct
-from ..utils import BinaryWriter, GTVertexAttributeType, encode_pos_16_snorm, pack_10_10_10_2
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from .mesh_processing import process_mesh
-from ..importer.core import parse_xpps_metadata
+from .encoders import stream_layout, encode_stream
+from .optimize import optimize_mesh
+from .decimate import fit_to_capacity
+from .estimate import object_key
+from .capacity import stream_capacities, MAX_VERTICES
+from .relocate import plan_relocation, write_header_offsets, size_field, mentions_size, update_size_field
+from ..importer.core import parse_xpps_metadata, find_xpps_path
+
+@contextmanager
+def mapped(path, write=True):
+    # the whole file as one mmap, patched with slice assignments and flushed once on exit
+    with open(path, 'r+b' if write else 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if write else mmap.ACCESS_READ)
+        try:
+            yield mm
+            if write: mm.flush()
+        finally:
+            mm.close()
+
+def find_xpps_record(mm, target_hash):
+    # returns (data_start, mesh record address) of the mesh with target_hash, or (data_start, None)
+    pkg_h = struct.unpack_from('<I', mm, 24)[0]
+    data_start = struct.unpack_from('<I', mm, 40)[0]
+    entry_cnt = struct.unpack_from('<I', mm, pkg_h + 8)[0]
+    curr = pkg_h + 48
+    size_total = len(mm)
+
+    # traverse chunks similar to the importer
+    for _ in range(entry_cnt):
+        kind, size, off = struct.unpack_from('<III', mm, curr)
+        curr += 40
+        if kind != 2: continue
+
+        pos = data_start + off
+        end = min(pos + size, size_total)
+        while pos + 8 <= end:
+            magic = mm[pos:pos + 4]
+            c_sz = struct.unpack_from('<I', mm, pos + 4)[0]
+            c_start = pos + 8
+
+            if magic == b' DIC':
+                cnt = struct.unpack_from('<I', mm, c_start)[0]
+                for i in range(cnt):
+                    eo, eh = struct.unpack_from('<QQ', mm, c_start + 8 + i * 16)
+                    if eh not in (8120115085854712779, 8121310221017043393): continue
+
+                    asset_pos = data_start + eo - 16
+                    meshes_off, meshes_cnt = struct.unpack_from('<QQ', mm, asset_pos + 192)
+                    if meshes_cnt == 0: continue
+
+                    for ptr in struct.unpack_from(f'<{meshes_cnt}Q', mm, data_start + meshes_off):
+                        mesh_addr = data_start + ptr
+                        if struct.unpack_from('<Q', mm, mesh_addr + 80)[0] == target_hash:
+                            return data_start, mesh_addr
+            pos = c_start + c_sz
+    return data_start, None
+
+def patch_xpps_record(mm, data_start, mesh_addr, new_offset, new_scale, new_idx_count, new_vert_count):
+    # position offset + scale, index count and the vertex count of every attribute
+    struct.pack_into('<ffff', mm, mesh_addr + 56, new_offset.x, new_offset.y, new_offset.z, new_scale)
+    struct.pack_into('<I', mm, mesh_addr + 152, new_idx_count)
+
+    attr_array_off = struct.unpack_from('<Q', mm, mesh_addr + 96)[0]
+    num_attrs = struct.unpack_from('<Q', mm, mesh_addr + 112)[0]
+    for i in range(num_attrs):
+        struct.pack_into('<I', mm, data_start + attr_array_off + i * 24 + 16, new_vert_count)
 
 def update_xpps_bbox(xpps_path, target_hash, new_offset, new_scale, new_idx_count, new_vert_count):
-    with open(xpps_path, 'r+b') as f:
-        # read headers
-        f.seek(24); pkg_h = struct.unpack('<I', f.read(4))[0]
-        f.seek(40); data_start = struct.unpack('<I', f.read(4))[0]
-        f.seek(pkg_h + 8); entry_cnt = struct.unpack('<I', f.read(4))[0]
-        curr = pkg_h + 48
-        
-        # traverse chunks similar to the importer
-        for _ in range(entry_cnt):
-            f.seek(curr); kind, size, off = struct.unpack('<III', f.read(12))
-            
-            if kind == 2:
-                abs_start = data_start + off
-                f.seek(abs_start); end = abs_start + size
-                
-                while f.tell() < end:
-                    try: magic = f.read(4)
-                    except: break
-                    c_sz = struct.unpack('<I', f.read(4))[0]; c_start = f.tell()
-                    
-                    if magic == b' DIC':
-                        f.seek(c_start); cnt = struct.unpack('<I', f.read(4))[0]; f.read(4)
-                        
-                        for _ in range(cnt):
-                            eo, eh = struct.unpack('<QQ', f.read(16))
-                            
-                            if eh in [8120115085854712779, 8121310221017043393]:
-                                asset_pos = data_start + eo - 16
-                                f.seek(asset_pos + 64); f.read(4*8 + 48 + 6*8)
-                                meshes_off, meshes_cnt = struct.unpack('<QQ', f.read(16))
-                                
-                                if meshes_cnt > 0:
-                                    f.seek(data_start + meshes_off)
-                                    ptrs = struct.unpack(f'<{meshes_cnt}Q', f.read(8*meshes_cnt))
-                                    
-                                    for ptr in ptrs:
-                                        mesh_addr = data_start + ptr
-                                        f.seek(mesh_addr + 72); f.read(8)
-                                        mh = struct.unpack('<Q', f.read(8))[0]
-                                        
-                                        if mh == target_hash:
-                                            print(f"[Ghost] Updating XPPS @ {mesh_addr}: Offset {new_offset}, Scale {new_scale}")
-                                            
-                                            # write position offset sccale
-                                            f.seek(mesh_addr + 56)
-                                            f.write(struct.pack('<fff', new_offset.x, new_offset.y, new_offset.z))
-                                            f.write(struct.pack('<f', new_scale))
-                                            
-                                            # write index count
-                                            f.seek(mesh_addr + 152)
-                                            f.write(struct.pack('<I', new_idx_count))
-                                            
-                                            # write Vertex Count
-                                            f.seek(mesh_addr + 96)
-                                            attr_array_off = struct.unpack('<Q', f.read(8))[0]
-                                            f.seek(mesh_addr + 112)
-                                            num_attrs = struct.unpack('<Q', f.read(8))[0]
-                                            
-                                            f.seek(data_start + attr_array_off)
-                                            for _ in range(num_attrs):
-                                                curr_attr = f.tell()
-                                                f.seek(curr_attr + 16)
-                                                f.write(struct.pack('<I', new_vert_count))
-                                                f.seek(curr_attr + 24)
-                                            return
-                    f.seek(c_start + c_sz)
-            curr += 40
-
-def inject_mesh(context, item, xmesh_path, db_path):
-    # coordinates the injection process
-    target_hash = int(item.original_hash, 16)
-    obj = item.new_mesh
-    
-    print(f"\n[Ghost] START INJECTION: {item.original_hash}")
-    
-    # find xpps file for metadata
-    folder = os.path.dirname(xmesh_path)
-    fname = os.path.splitext(os.path.basename(xmesh_path))[0]
-    xpps_path = os.path.join(folder, fname + ".xpps")
-    if not os.path.exists(xpps_path): xpps_path = os.path.join(folder, "hero.xpps")
-    
+    with mapped(xpps_path) as mm:
+        data_start, mesh_addr = find_xpps_record(mm, target_hash)
+        if mesh_addr is None: return
+
+        print(f"[Ghost] Updating XPPS @ {mesh_addr}: Offset {new_offset}, Scale {new_scale}")
+        patch_xpps_record(mm, data_start, mesh_addr, new_offset, new_scale, new_idx_count, new_vert_count)
+
+def write_stream(view, start, stride, block, full_row, skip=None):
+    # writes one encoded stream into the mapped file (a uint8 view)
+    # rows that only cover part of the stride, or vertices that must be skipped, keep the bytes already there
+    count = len(block)
+    rows = view[start:start + count * stride].reshape(count, stride)
+
+    if full_row and skip is None:
+        rows[:] = block
+    elif skip is None:
+        rows[:, :block.shape[1]] = block
+    else:
+        keep = ~skip
+        rows[keep, :block.shape[1]] = block[keep]
+
+def read_xmesh_headers(mm):
+    # submesh hash -> (index offset, vertex buffer offsets), plus the buffer data start
+    # (0, {}) without the SMBS magic, nothing in the table can be trusted then
+    if mm[:4] != b"SMBS":
+        return 0, {}
+    buffer_data_start = struct.unpack_from('<Q', mm, 24)[0]
+    num_meshes = struct.unpack_from('<I', mm, 40)[0]
+    pos = 44
+    headers = {}
+
+    for _ in range(num_meshes):
+        mh, idx_offset = struct.unpack_from('<QI', mm, pos)
+        num_v_buffers = mm[pos + 14]
+        headers.setdefault(mh, (idx_offset, struct.unpack_from(f'<{num_v_buffers}I', mm, pos + 15)))
+        pos += 15 + 4 * num_v_buffers
+    return buffer_data_start, headers
+
+def check_capacity(capacity, mesh_data):
+    # the new mesh has to fit into the buffers of the slot
+    available_idx_size = capacity['indices'] * 2 # 2 bytes per index
+    if len(mesh_data.indices) * 2 > available_idx_size:
+        return f"Index Buffer too large! New: {len(mesh_data.indices) * 2} > Max: {available_idx_size}"
+
+    if len(mesh_data.vertices) > capacity['vertices']:
+        return f"Vertex count too high! New: {len(mesh_data.vertices)} > Max: {capacity['vertices']}"
+    return None
+
+def encode_submesh(meta, mesh_data, buffer_data_start, header, block_cache=None):
+    # everything that goes into the xmesh for one replacement, as (start, stride, block, full_row, skip) streams
+    # pure numpy, safe to run on a worker thread
+    # block_cache is shared between slots that get the same mesh, a block only depends on mesh, role and stride
+    # (plus offset/scale for quantized positions)
+    idx_offset, v_offsets = header
+    vert_count = len(mesh_data.vertices)
+    orig_vert_count = meta.get('vertex_count', 0)
+    available_idx_size = meta.get('face_count', 0) * 2
+
+    # the original index range is zero padded, a longer buffer runs into the free space behind it
+    new_indices = mesh_data.indices.astype('<u2').tobytes()
+    indices = (buffer_data_start + idx_offset, new_indices + b'\x00' * max(0, available_idx_size - len(new_indices)))
+
+    # layout (roles, interleaving) is worked out once, then each stream is encoded in one go
+    starts = [buffer_data_start + off for off in v_offsets]
+    streams = []
+    for stream in stream_layout(meta['attributes'], starts, vert_count):
+        if stream['role'] is None: continue
+        key = (id(mesh_data), stream['role'], stream['stride'])
+        if stream['role'].startswith('position'):
+            key += (mesh_data.offset.x, mesh_data.offset.y, mesh_data.offset.z, mesh_data.scale)
+        encoded = block_cache.get(key) if block_cache is not None else None
+        if encoded is None:
+            encoded = encode_stream(stream['role'], mesh_data, stream['stride'])
+            if block_cache is not None: block_cache[key] = encoded
+        block, full_row = encoded
+        streams.append((stream['start'], stream['stride'], block, full_row, stream['skip']))
+
+    # pad unused vertices at the end to avoid graphical glitches
+    tail = None
+    remaining_verts = orig_vert_count - vert_count
+    attrs = meta['attributes']
+    if remaining_verts > 0 and attrs and attrs[0]['stride'] == 8:
+        tail_pattern = b'\x74\xFC\x0F\xFF\x01\x80\x00\x00'
+        tail = (starts[0] + vert_count * 8, tail_pattern * remaining_verts)
+
+    end = max([indices[0] + len(indices[1])] + [s + max(orig_vert_count, vert_count) * a['stride'] for s, a in zip(starts, attrs)])
+    return {'indices': indices, 'streams': streams, 'tail': tail, 'end': end}
+
+def write_submesh(mm, view, encoded):
+    offset, data = encoded['indices']
+    mm[offset:offset + len(data)] = data
+    for start, stride, block, full_row, skip in encoded['streams']:
+        write_stream(view, start, stride, block, full_row, skip)
+    if encoded['tail']:
+        offset, data = encoded['tail']
+        mm[offset:offset + len(data)] = data
+
+def inject_meshes(context, items, xmesh_path, db_path, max_workers=None, optimize=False, decimate=False, relocate=False):
+    # injects every replacement into one xmesh/xpps pair:
+    # both files are parsed once, blender meshes are evaluated on the main thread,
+    # encoding runs on a thread pool, then one pass over the mapped xmesh and one batched xpps patch
+    # every distinct object is processed once and its encoded streams are shared by all slots it goes into
+    # with relocate, parts too large for their slot get new buffers appended to the xmesh instead of failing
+    # returns [(item, "SUCCESS" or error message)] in the order of items
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+
+    results = {}
+    mesh_cache = {}
+    xpps_path = find_xpps_path(xmesh_path)
     meta_map, _ = parse_xpps_metadata(xpps_path)
-    if target_hash not in meta_map: 
-        return f"Hash {item.original_hash} not found in XPPS."
-    
-    meta = meta_map[target_hash]
-    
-    # convert blender mesh to raw data
-    mesh_data = process_mesh(obj)
-    if not mesh_data: 
-        return "Mesh processing failed"
-    
-    print(f"[Ghost] New Geometry: {len(mesh_data.vertices)} Verts, {len(mesh_data.indices)//3} Tris")
-
-    idx_writer = BinaryWriter()
-    for idx in mesh_data.indices: 
-        idx_writer.write_uint16(idx)
-    new_indices = idx_writer.get_bytes()
-
-    with open(xmesh_path, 'r+b') as f:
-        f.seek(24); buffer_data_start = struct.unpack('<Q', f.read(8))[0]
-        f.seek(40); num_meshes = struct.unpack('<I', f.read(4))[0]
-        
-        my_header_pos = -1
-        idx_offset = 0
-        v_offsets = []
-        
-        for _ in range(num_meshes):
-            pos = f.tell()
-            mh = struct.unpack('<Q', f.read(8))[0]
-            
-            if mh == target_hash:
-                my_header_pos = pos
-                idx_offset = struct.unpack('<I', f.read(4))[0]
-                f.read(2)
-                num_v_buffers = struct.unpack('<B', f.read(1))[0]
-                v_offsets = struct.unpack(f'<{num_v_buffers}I', f.read(4*num_v_buffers))
-                break
+
+    # header table and real slot capacities, the layout doesn't change while injecting
+    with mapped(xmesh_path, write=False) as mm:
+        buffer_data_start, headers = read_xmesh_headers(mm)
+        if not headers:
+            return [(item, "Not a valid XMesh (SMBS header missing)") for item in items]
+        capacities = stream_capacities(len(mm) - buffer_data_start, headers, meta_map)
+        file_size = len(mm)
+        sizes = size_field(mm, buffer_data_start) if relocate else None
+
+    # relocation grows the file, only done when the size to update is known for sure
+    relocate_error = None
+    if relocate:
+        if sizes is None:
+            relocate_error = "can't relocate, the file size field of the xmesh header isn't identified"
+        else:
+            with mapped(xpps_path, write=False) as mm:
+                if mentions_size(mm, file_size) or mentions_size(mm, file_size - buffer_data_start):
+                    relocate_error = "can't relocate, the xpps may store the xmesh size"
+        if relocate_error:
+            print(f"[Ghost] {relocate_error}")
+
+    # stage: blender data is only touched from here
+    staged = []
+    seen = set()
+    relocated = set()
+    for item in items:
+        print(f"\n[Ghost] START INJECTION: {item.original_hash}")
+        target_hash = int(item.original_hash, 16)
+
+        if target_hash not in meta_map:
+            results[id(item)] = f"Hash {item.original_hash} not found in XPPS."
+            continue
+        if target_hash in seen:
+            results[id(item)] = f"Hash {item.original_hash} is replaced more than once."
+            continue
+        if target_hash not in capacities:
+            results[id(item)] = "Hash not found in XMesh"
+            continue
+
+        # convert blender mesh to raw data, once per object
+        obj_key = (object_key(item.new_mesh), optimize)
+        if obj_key not in mesh_cache:
+            mesh_data = process_mesh(item.new_mesh)
+
+            # triangle/vertex order for the gpu vertex cache, counts stay the same
+            if mesh_data and optimize:
+                before, after = optimize_mesh(mesh_data)
+                print(f"[Ghost] Vertex Cache ACMR: {before:.3f} -> {after:.3f}")
+            mesh_cache[obj_key] = mesh_data
+        mesh_data = mesh_cache[obj_key]
+        if not mesh_data:
+            results[id(item)] = "Mesh processing failed"
+            continue
+
+        print(f"[Ghost] New Geometry: {len(mesh_data.vertices)} Verts, {len(mesh_data.indices)//3} Tris")
+        capacity = capacities[target_hash]
+        error = check_capacity(capacity, mesh_data)
+        if error and relocate and relocate_error:
+            error += f" ({relocate_error})"
+        elif error and relocate and len(mesh_data.vertices) <= MAX_VERTICES:
+            print(f"[Ghost] {item.original_hash} is too large for its slot, its buffers are moved to the end of the file")
+            relocated.add(target_hash)
+            error = None
+        if error and decimate:
+            fitted, _ = fit_to_capacity(item.new_mesh, capacity['vertices'], capacity['indices'], mesh_data)
+            if fitted is not None:
+                mesh_data, error = fitted, None
+                if optimize:
+                    before, after = optimize_mesh(mesh_data)
+                    print(f"[Ghost] Vertex Cache ACMR: {before:.3f} -> {after:.3f}")
             else:
-                f.read(4) # skip idx offset
-                f.read(2) # skip lod
-                nv = struct.unpack('<B', f.read(1))[0]
-                f.read(4*nv) # skip v offsets
-        
-        if my_header_pos == -1: 
-            return "Hash not found in XMesh"
-        
-        # write indecies
-        abs_idx_off = buffer_data_start + idx_offset
-        orig_idx_count = meta.get('face_count', 0)
-        available_idx_size = orig_idx_count * 2 # 2 bytes per index
-        
-        if len(new_indices) > available_idx_size: 
-            return f"Index Buffer too large! New: {len(new_indices)} > Max: {available_idx_size}"
-        
-        f.seek(abs_idx_off)
-        f.write(new_indices)
-        # pad remainder with zeros
-        f.write(b'\x00' * (available_idx_size - len(new_indices)))
-        
-        # write vertices
-        vert_count = len(mesh_data.vertices)
-        orig_vert_count = meta.get('vertex_count', 0)
-        
-        if vert_count > orig_vert_count:
-             return f"Vertex count too high! New: {vert_count} > Max: {orig_vert_count}"
-        
-        
-        for i in range(vert_count):
-            written_ranges = set()
-
-            for ai, attr in enumerate(meta['attributes']):
-                fmt = attr['format']
-                stride = attr['stride']
-                
-                abs_pos = buffer_data_start + v_offsets[ai] + (i * stride)
-                
-                # check for overlap
-                is_overlap = False
-                for r in range(stride):
-                    if (abs_pos + r) in written_ranges:
-                        is_overlap = True
-                        break
-                
-                if is_overlap:
-                    continue
+                error += " (decimation could not fit it)"
+        if error:
+            results[id(item)] = error
+            continue
+
+        seen.add(target_hash)
+        staged.append((item, target_hash, mesh_data))
 
-                f.seek(abs_pos)
-                
-                if ai == 0:
-                    if stride == 8:
-                        x, y, z = encode_pos_16_snorm(mesh_data.vertices[i], mesh_data.offset, mesh_data.scale)
-                        f.write(struct.pack('<hhhH', x, y, z, 0x3C00))
-                    else:
-                        v = mesh_data.vertices[i]
-                        f.write(struct.pack('<ffff', v.x, v.y, v.z, 1.0))
-                    
-                    for r in range(stride): written_ranges.add(abs_pos + r)
+    if staged:
+        # relocated parts get new buffers behind the current end of the file
+        # header offsets are u32 relative to the buffer data start (and so may be the size field),
+        # every part is checked before the file is grown
+        if relocated:
+            end = os.path.getsize(xmesh_path)
+            planned = {}
+            for item, target_hash, mesh_data in staged:
+                if target_hash not in relocated: continue
+                header, new_end = plan_relocation(headers[target_hash], meta_map[target_hash], buffer_data_start,
+                                                  len(mesh_data.vertices), len(mesh_data.indices), end)
+                if new_end - buffer_data_start > 0xFFFFFFFF or (sizes[1] == '<I' and new_end > 0xFFFFFFFF):
+                    results[id(item)] = "Can't relocate, the xmesh would pass 4 GB"
                     continue
+                planned[target_hash] = header
+                end = new_end
+
+            staged = [s for s in staged if s[1] not in relocated or s[1] in planned]
+            relocated = set(planned)
+            headers.update(planned)
+            if relocated:
+                with open(xmesh_path, 'r+b') as f:
+                    f.truncate(end)
+
+        with mapped(xmesh_path) as mm:
+            if relocated:
+                for target_hash in relocated:
+                    write_header_offsets(mm, target_hash, headers[target_hash])
+                update_size_field(mm, sizes, buffer_data_start)
+
+            # one task per distinct mesh, its slots share the encoded blocks
+            groups = {}
+            for n, (_, _, mesh_data) in enumerate(staged):
+                groups.setdefault(id(mesh_data), []).append(n)
+            encoded = [None] * len(staged)
+
+            def encode_group(group):
+                block_cache = {}
+                for n in group:
+                    _, target_hash, mesh_data = staged[n]
+                    encoded[n] = encode_submesh(meta_map[target_hash], mesh_data, buffer_data_start, headers[target_hash], block_cache)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(encode_group, groups.values()))
+
+            written = []
+            view = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                for (item, target_hash, mesh_data), enc in zip(staged, encoded):
+                    if enc['end'] > len(mm):
+                        results[id(item)] = "XMesh buffers run past the end of the file"
+                        continue
+                    write_submesh(mm, view, enc)
+                    written.append((target_hash, mesh_data))
+                    results[id(item)] = "SUCCESS"
+            finally:
+                del view # the mmap can't close while numpy holds its buffer
+
+        # update metadata (BBox, Counts), every record in one mapping
+        if written:
+            with mapped(xpps_path) as mm:
+                data_start = struct.unpack_from('<I', mm, 40)[0]
+                for target_hash, mesh_data in written:
+                    mesh_addr = meta_map[target_hash]['record']
+                    print(f"[Ghost] Updating XPPS @ {mesh_addr}: Offset {mesh_data.offset}, Scale {mesh_data.scale}")
+                    patch_xpps_record(mm, data_start, mesh_addr, mesh_data.offset, mesh_data.scale, len(mesh_data.indices), len(mesh_data.vertices))
+
+    return [(item, results[id(item)]) for item in items]
 
-                bytes_to_write = b''
-                
-                if fmt == GTVertexAttributeType.Format_32_32_32_Float:
-                    v = mesh_data.vertices[i]
-                    bytes_to_write = struct.pack('<ffff', v.x, v.y, v.z, 1.0)
-
-                elif fmt == GTVertexAttributeType.Format_10_10_10_Snorm:
-                    # normals/tangents
-                    is_tangent = False
-                    prev_snorms = sum(1 for sub_a in meta['attributes'][:ai] if sub_a['format'] == GTVertexAttributeType.Format_10_10_10_Snorm)
-                    if prev_snorms > 0: is_tangent = True
-                    
-                    val = 0
-                    if not is_tangent:
-                        n = mesh_data.normals[i]
-                        val = pack_10_10_10_2(n.x, n.y, n.z, 0)
-                    else:
-                        t = mesh_data.tangents[i]
-                        val = pack_10_10_10_2(t[0], t[1], t[2], 1.0 if t[3] > 0 else 0.0)
-                    bytes_to_write = struct.pack('<I', val)
-                
-                elif fmt == GTVertexAttributeType.Format_16_16_Float:
-                    # UV
-                    u, v = mesh_data.uvs[i]
-                    bytes_to_write = struct.pack('<ee', u, v)
-                
-                elif fmt == GTVertexAttributeType.Format_8_8_8_8_Unorm:
-                    # weights or colors
-                    has_bone_idx = any(a['format'] == GTVertexAttributeType.Format_16_16_16_16_Unit for a in meta['attributes'])
-                    is_weight = has_bone_idx and attr['format'] == GTVertexAttributeType.Format_8_8_8_8_Unorm
-                    
-                    if is_weight:
-                        w = mesh_data.bone_weights[i]
-                        b1 = int(w[1] * 255); b2 = int(w[2] * 255); b3 = int(w[3] * 255)
-                        bytes_to_write = struct.pack('<BBBB', b1, b2, b3, 0)
-                    else:
-                        c = mesh_data.colors[i]
-                        bytes_to_write = struct.pack('<BBBB', int(c[0]*255), int(c[1]*255), int(c[2]*255), int(c[3]*255))
-
-                elif fmt == GTVertexAttributeType.Format_16_16_16_16_Unit:
-                    #bone indices
-                    bi = mesh_data.bone_indices[i]
-                    bytes_to_write = struct.pack('<hhhh', bi[0], bi[1], bi[2], bi[3])
-
-                if bytes_to_write:
-                    # align length
-                    if len(bytes_to_write) < stride:
-                        bytes_to_write += b'\x00' * (stride - len(bytes_to_write))
-                    elif len(bytes_to_write) > stride:
-                        bytes_to_write = bytes_to_write[:stride]
-                    
-                    f.write(bytes_to_write)
-                    for r in range(stride): written_ranges.add(abs_pos + r)
-
-        # pad unused vertices at the end to avoid graphical glitches
-        remaining_verts = orig_vert_count - vert_count
-        if remaining_verts > 0:
-            tail_pattern = b'\x74\xFC\x0F\xFF\x01\x80\x00\x00'
-            
-            for ai, attr in enumerate(meta['attributes']):
-                if ai == 0 and attr['stride'] == 8:
-                    fill_block = tail_pattern * remaining_verts
-                    start_tail_pos = buffer_data_start + v_offsets[ai] + (vert_count * 8)
-                    f.seek(start_tail_pos)
-                    f.write(fill_block)
-                
-    # update metadata (BBox, Counts)
-    update_xpps_bbox(xpps_path, target_hash, mesh_data.offset, mesh_data.scale, len(mesh_data.indices), len(mesh_data.vertices))
-    
-    return "SUCCESS"
\ No newline at end of file
+def inject_mesh(context, item, xmesh_path, db_path, optimize=False, decimate=False, relocate=False):
+    # single replacement, same pipeline as the batch
+    return inject_meshes(context, [item], xmesh_path, db_path, max_workers=1, optimize=optimize, decimate=decimate, relocate=relocate)[0][1]
@@ -12,18 +12,30 @@
 
 import bpy
 import os
-import shutil
 import random
-from . import importer, tex_db, injector, texture_manager, combiner
+from . import importer, tex_db, injector, texture_manager, combiner, fingerprint, catalog, fileops
 
 
 def estimate_game_vertices(obj):
-    #counts vertices on the evaluated mesh to guess if it fits the buffer
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    eval_obj = obj.evaluated_get(depsgraph)
-    count = len(eval_obj.data.vertices)
-    print(f"[Ghost] {obj.name}: {count} vertices")
-    return count
+    #exact unique vertex/index counts the exporter will produce, cached until the geometry changes
+    verts, indices = injector.export_estimate(obj)
+    print(f"[Ghost] {obj.name}: {verts} vertices, {indices} indices")
+    return verts, indices
+
+def local_extent(obj):
+    #max half size in object space, the same measure as the xpps scale
+    corners = [tuple(c) for c in obj.bound_box]
+    return max(max(c[k] for c in corners) - min(c[k] for c in corners) for k in range(3)) * 0.5
+
+def open_in_scanner(props, path, hex_hash):
+    #loads a file into the scan list and selects the given hash, False if it isn't there
+    props.filepath = path
+    bpy.ops.ghost.analyze_file()
+    for i, m in enumerate(props.found_meshes):
+        if m.mesh_hash == hex_hash:
+            props.found_meshes_index = i
+            return True
+    return False
 
 def auto_find_files(xmesh_path):
     #tries to locate xpps and db files based on xmesh location
@@ -61,41 +73,33 @@ class GHOST_OT_AutoMatch(bpy.types.Operator):
             if item.lod == target_lod:
                 available_slots.append({
                     'index': i,
-                    'capacity': item.vertex_count,
+                    'capacity': item.vertex_capacity or item.vertex_count,
+                    'index_capacity': item.index_capacity or item.face_count * 3,
                     'hash': item.mesh_hash,
-                    'used': False
                 })
         
         if not available_slots:
             self.report({'ERROR'}, f"No submeshes found with LOD {target_lod}")
             return {'CANCELLED'}
-            
-        # sort slots by size (small to large)
-        available_slots.sort(key=lambda x: x['capacity'])
+
+        # slot sizes from the xpps bounding box, used to prefer similar sized parts
+        if props.auto_match_size:
+            xpps_path, _ = auto_find_files(bpy.path.abspath(props.filepath))
+            meta_map, _ = importer.parse_xpps_metadata(xpps_path)
+            for slot in available_slots:
+                meta = meta_map.get(int(slot['hash'], 16))
+                if meta: slot['scale'] = meta['scale']
         
         custom_meshes = []
         for obj in selected_objs:
-            v_count = estimate_game_vertices(obj)
-            custom_meshes.append({'obj': obj, 'count': v_count})
-            
-        # match logic, fit largest object into smallest available slot that fits it
-        custom_meshes.sort(key=lambda x: x['count'], reverse=True)
-        
-        matches = []
-        unmatched = []
-        
-        for custom in custom_meshes:
-            best_slot = None
-            for slot in available_slots:
-                if not slot['used'] and slot['capacity'] >= custom['count']:
-                    best_slot = slot
-                    break
+            v_count, i_count = estimate_game_vertices(obj)
+            custom_meshes.append({'obj': obj, 'name': obj.name, 'verts': v_count, 'indices': i_count, 'extent': local_extent(obj)})
             
-            if best_slot:
-                best_slot['used'] = True
-                matches.append((custom, best_slot))
-            else:
-                unmatched.append(custom)
+        # optimal assignment, vertex and index capacity are hard limits, tight fits preferred
+        pairs = injector.match_slots(custom_meshes, available_slots, size_weight=1.0 if props.auto_match_size else 0.0)
+        matches = [(custom_meshes[i], available_slots[j]) for i, j in pairs]
+        matched = {i for i, _ in pairs}
+        unmatched = [c for i, c in enumerate(custom_meshes) if i not in matched]
                 
         for custom, slot in matches:
             existing = next((r for r in props.replacements if r.original_hash == slot['hash']), None)
@@ -340,12 +344,20 @@ class GHOST_OT_AnalyzeFile(bpy.types.Operator):
             self.report({'WARNING'}, "No meshes found.")
             return {'CANCELLED'}
 
+        # texture counts come from the cached material table, one pass over the xpps
+        xpps_path, _ = auto_find_files(path)
+        materials = tex_db.get_material_table(xpps_path)
+
         for info in infos:
             item = props.found_meshes.add()
             item.mesh_hash = info["hash"]
             item.lod = info["lod"]
             item.vertex_count = info["verts"]
             item.face_count = info["faces"]
+            item.texture_count = len(materials.get(int(info["hash"], 16)) or [])
+            # real room in the buffers, often more than the original counts
+            item.vertex_capacity = info["vertex_capacity"]
+            item.index_capacity = info["index_capacity"]
         
         self.report({'INFO'}, f"Scanned {len(infos)} meshes.")
         return {'FINISHED'}
@@ -357,7 +369,10 @@ class GHOST_OT_ImportAll(bpy.types.Operator):
         props = context.scene.ghost_tool
         path = bpy.path.abspath(props.filepath)
         db_path = bpy.path.abspath(props.tex_db_path)
-        importer.import_selected(context, path, selected_hashes=None, use_skeleton=props.import_skeleton, db_path=db_path)
+        if props.stream_import:
+            importer.import_streaming(context, path, selected_hashes=None, use_skeleton=props.import_skeleton, budget_mb=props.stream_budget_mb)
+        else:
+            importer.import_selected(context, path, selected_hashes=None, use_skeleton=props.import_skeleton, db_path=db_path, merge=props.merge_import, link_duplicates=props.link_duplicates)
         return {'FINISHED'}
 
 class GHOST_OT_ImportSelected(bpy.types.Operator):
@@ -373,7 +388,237 @@ class GHOST_OT_ImportSelected(bpy.types.Operator):
             self.report({'WARNING'}, "No meshes selected.")
             return {'CANCELLED'}
 
-        importer.import_selected(context, path, selected_hashes=hashes, use_skeleton=props.import_skeleton, db_path=db_path)
+        if props.stream_import:
+            importer.import_streaming(context, path, selected_hashes=hashes, use_skeleton=props.import_skeleton, budget_mb=props.stream_budget_mb)
+        else:
+            importer.import_selected(context, path, selected_hashes=hashes, use_skeleton=props.import_skeleton, db_path=db_path, merge=props.merge_import, link_duplicates=props.link_duplicates)
+        return {'FINISHED'}
+
+class GHOST_OT_ImportMultiple(bpy.types.Operator):
+    bl_idname = "ghost.import_multiple"
+    bl_label = "Import Multiple"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    files: bpy.props.CollectionProperty(type=bpy.types.OperatorFileListElement, options={'HIDDEN', 'SKIP_SAVE'})
+    directory: bpy.props.StringProperty(subtype='DIR_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.xmesh", options={'HIDDEN'})
+    use_folder: bpy.props.BoolProperty(name="Whole Folder", description="Import every .xmesh in the folder and its subfolders", default=False)
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        folder = bpy.path.abspath(self.directory)
+
+        if self.use_folder or not any(f.name for f in self.files):
+            paths = []
+            for root, _, names in os.walk(folder):
+                paths.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(".xmesh"))
+        else:
+            paths = [os.path.join(folder, f.name) for f in self.files if f.name.endswith(".xmesh")]
+
+        if not paths:
+            self.report({'WARNING'}, "No .xmesh files found.")
+            return {'CANCELLED'}
+
+        msg = importer.import_files(context, paths, use_skeleton=props.import_skeleton, merge=props.merge_import, max_workers=props.import_workers, link_duplicates=props.link_duplicates)
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+class GHOST_OT_ImportProxies(bpy.types.Operator):
+    bl_idname = "ghost.import_proxies"
+    bl_label = "Import Proxies"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        path = bpy.path.abspath(props.filepath)
+        if not os.path.exists(path):
+            self.report({'ERROR'}, "File not found")
+            return {'CANCELLED'}
+
+        hashes = [m.mesh_hash for m in props.found_meshes if m.is_selected]
+        msg = importer.import_proxies(context, path, selected_hashes=hashes, use_skeleton=props.import_skeleton,
+                                      mode=props.proxy_mode, sample_count=props.proxy_sample_count)
+        self.report({'ERROR'} if msg.startswith("ERROR") else {'INFO'}, msg)
+        return {'FINISHED'}
+
+class GHOST_OT_LoadProxies(bpy.types.Operator):
+    bl_idname = "ghost.load_proxies"
+    bl_label = "Load Full Resolution"
+    bl_options = {'REGISTER', 'UNDO'}
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        proxies = [o for o in context.selected_objects if o.get("ghost_proxy")]
+
+        if not proxies:
+            self.report({'WARNING'}, "Select proxy objects first!")
+            return {'CANCELLED'}
+
+        db_path = bpy.path.abspath(props.tex_db_path)
+        new_objects = importer.load_full_proxies(context, proxies, use_skeleton=props.import_skeleton, db_path=db_path)
+
+        for o in new_objects:
+            if o.type == 'MESH': o.select_set(True)
+
+        self.report({'INFO'}, f"Loaded {len(new_objects)} meshes")
+        return {'FINISHED'}
+
+class GHOST_OT_SplitMerged(bpy.types.Operator):
+    bl_idname = "ghost.split_merged"
+    bl_label = "Split Merged Parts"
+    bl_options = {'REGISTER', 'UNDO'}
+    def execute(self, context):
+        merged = [o for o in context.selected_objects if o.type == 'MESH' and o.get("ghost_parts")]
+
+        if not merged:
+            self.report({'WARNING'}, "Select a merged import first!")
+            return {'CANCELLED'}
+
+        count = 0
+        for obj in merged:
+            count += len(importer.split_merged_object(obj))
+            obj.hide_set(True)
+
+        self.report({'INFO'}, f"Split into {count} objects")
+        return {'FINISHED'}
+
+class GHOST_OT_FindDuplicates(bpy.types.Operator):
+    bl_idname = "ghost.find_duplicates"
+    bl_label = "Find Duplicate Buffers"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        root = bpy.path.abspath(props.dump_root_path)
+        if not root or not os.path.isdir(root):
+            self.report({'ERROR'}, "Set the Game Dump Root folder first.")
+            return {'CANCELLED'}
+
+        dup_map = fingerprint.scan_folder_duplicates(root)
+        redundant = sum(len(v) - 1 for v in dup_map.values())
+        self.report({'INFO'}, f"{len(dup_map)} duplicate groups ({redundant} redundant submeshes), see {fingerprint.REPORT_NAME}")
+        return {'FINISHED'}
+
+class GHOST_OT_UpdateCatalog(bpy.types.Operator):
+    bl_idname = "ghost.update_catalog"
+    bl_label = "Build / Update Catalog"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        root = bpy.path.abspath(props.dump_root_path)
+        if not root or not os.path.isdir(root):
+            self.report({'ERROR'}, "Set the Game Dump Root folder first.")
+            return {'CANCELLED'}
+
+        scanned, unchanged, removed = catalog.update_catalog(root, jobs=props.catalog_jobs)
+        catalog.update_texture_index(root, bpy.path.abspath(props.tex_db_path), jobs=props.catalog_jobs)
+        self.report({'INFO'}, f"Catalog: {scanned} scanned, {unchanged} unchanged, {removed} removed")
+        return {'FINISHED'}
+
+class GHOST_OT_QueryCatalog(bpy.types.Operator):
+    bl_idname = "ghost.query_catalog"
+    bl_label = "Search Catalog"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        db_path = catalog.catalog_path_for(bpy.path.abspath(props.dump_root_path))
+        if not os.path.exists(db_path):
+            self.report({'ERROR'}, "No catalog yet, build it first.")
+            return {'CANCELLED'}
+
+        total, rows = catalog.query_catalog(
+            db_path,
+            lod=props.catalog_lod if props.catalog_lod >= 0 else None,
+            min_verts=props.catalog_min_verts,
+            max_verts=props.catalog_max_verts,
+            hash_filter=props.catalog_hash.strip()
+        )
+
+        props.catalog_results.clear()
+        props.catalog_results_index = 0
+        props.catalog_total = total
+        for path, m_hash, lod, verts, faces, _, _ in rows:
+            item = props.catalog_results.add()
+            item.filepath = path
+            item.mesh_hash = m_hash
+            item.lod = lod
+            item.vertex_count = verts
+            item.face_count = faces
+
+        self.report({'INFO'}, f"{total} meshes found" + (f", showing {len(rows)}" if total > len(rows) else ""))
+        return {'FINISHED'}
+
+class GHOST_OT_FindTextureUsers(bpy.types.Operator):
+    bl_idname = "ghost.find_texture_users"
+    bl_label = "Find Users"
+    bl_description = "List every mesh whose material uses a texture matching the search (name or hash)"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        db_path = catalog.catalog_path_for(bpy.path.abspath(props.dump_root_path))
+        if not os.path.exists(db_path):
+            self.report({'ERROR'}, "No catalog yet, build it first.")
+            return {'CANCELLED'}
+        if not props.texture_search.strip():
+            self.report({'ERROR'}, "Enter a texture name or hash.")
+            return {'CANCELLED'}
+
+        rows = catalog.find_texture_users(db_path, props.texture_search)
+
+        props.catalog_results.clear()
+        props.catalog_results_index = 0
+        props.catalog_total = len(rows)
+        for tex_name, tex_hash, m_hash, xpps, path, lod, verts, faces in rows:
+            item = props.catalog_results.add()
+            item.filepath = path or xpps
+            item.mesh_hash = m_hash
+            item.lod = lod or 0
+            item.vertex_count = verts or 0
+            item.face_count = faces or 0
+            item.texture_name = tex_name or tex_hash
+
+        self.report({'INFO'}, f"{len(rows)} meshes use a matching texture")
+        return {'FINISHED'}
+
+class GHOST_OT_OpenCatalogResult(bpy.types.Operator):
+    bl_idname = "ghost.open_catalog_result"
+    bl_label = "Open in Scanner"
+    bl_description = "Scan the file of the selected result and select its mesh"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        if props.catalog_results_index < 0 or props.catalog_results_index >= len(props.catalog_results):
+            return {'CANCELLED'}
+        item = props.catalog_results[props.catalog_results_index]
+        open_in_scanner(props, item.filepath, item.mesh_hash)
+        return {'FINISHED'}
+
+class GHOST_OT_LocateHash(bpy.types.Operator):
+    bl_idname = "ghost.locate_hash"
+    bl_label = "Locate"
+    bl_description = "Find the file containing the pasted hash in the catalog, scan it and select the mesh"
+    def execute(self, context):
+        props = context.scene.ghost_tool
+        db_path = catalog.catalog_path_for(bpy.path.abspath(props.dump_root_path))
+        if not os.path.exists(db_path):
+            self.report({'ERROR'}, "No catalog yet, build it first.")
+            return {'CANCELLED'}
+
+        hex_hash = catalog.normalize_hash(props.locate_hash)
+        if hex_hash is None:
+            self.report({'ERROR'}, "Not a hex hash.")
+            return {'CANCELLED'}
+
+        hits = catalog.locate_hash(db_path, hex_hash)
+        if not hits:
+            self.report({'WARNING'}, f"{hex_hash} is not in the catalog.")
+            return {'CANCELLED'}
+
+        path, xpps, address, lod = hits[0]
+        if not open_in_scanner(props, path, hex_hash):
+            self.report({'WARNING'}, f"{os.path.basename(path)} no longer contains {hex_hash}, update the catalog.")
+            return {'CANCELLED'}
+
+        print(f"[Ghost] {hex_hash}: {path} (LOD {lod}), record at {address:#x} in {xpps}")
+        msg = f"{hex_hash} found in {os.path.basename(path)}"
+        if len(hits) > 1:
+            msg += f" (+{len(hits) - 1} more files)"
+        self.report({'INFO'}, msg)
         return {'FINISHED'}
 
 class GHOST_OT_SelectAll(bpy.types.Operator):
@@ -431,41 +676,75 @@ class GHOST_OT_InjectMeshes(bpy.types.Operator):
             self.report({'WARNING'}, "No replacements defined.")
             return {'CANCELLED'}
 
-        # create mod folder
-        folder = os.path.dirname(orig_xmesh_path)
-        fname_no_ext = os.path.splitext(os.path.basename(orig_xmesh_path))[0]
-        mod_id = random.randint(10000, 99999)
-        mod_folder_name = f"{fname_no_ext}_mod_{mod_id}"
-        mod_dir = os.path.join(folder, mod_folder_name)
-        
-        try: os.makedirs(mod_dir, exist_ok=True)
-        except OSError: return {'CANCELLED'}
-
-        # copy original files
+        # an incremental export updates the last mod folder in place, otherwise a new one is created
+        mod_dir = bpy.path.abspath(props.mod_dir) if props.incremental_export and props.mod_dir else ""
+        if mod_dir and injector.manifest_source(mod_dir) != os.path.abspath(orig_xmesh_path):
+            mod_dir = "" # folder of another file, or not made by an export
+        manifest = injector.load_manifest(mod_dir, orig_xmesh_path, orig_xpps_path) if mod_dir else None
+
+        items = [item for item in props.replacements if item.new_mesh]
+        options = f"optimize={props.optimize_vertex_cache};decimate={props.auto_decimate};relocate={props.relocate_buffers}"
+        fingerprints = {item.original_hash.lower(): injector.geometry_fingerprint(item.new_mesh, options) for item in items} if props.incremental_export else {}
+
+        # parts that were dropped from the list need the original bytes back, that takes a full rebuild
+        # (every slot ever written counts, a part that failed later still has its old bytes in the file)
+        if manifest is not None and not set(manifest['written']) <= set(fingerprints):
+            manifest = None
+
+        fresh_folder = False
+        if manifest is None:
+            if not mod_dir:
+                folder = os.path.dirname(orig_xmesh_path)
+                fname_no_ext = os.path.splitext(os.path.basename(orig_xmesh_path))[0]
+                mod_id = random.randint(10000, 99999)
+                mod_dir = os.path.join(folder, f"{fname_no_ext}_mod_{mod_id}")
+                fresh_folder = True
+
+            try: os.makedirs(mod_dir, exist_ok=True)
+            except OSError: return {'CANCELLED'}
+
+            # copy original files (reflinked where the file system can, they are patched in place afterwards)
+            fileops.clone_file(orig_xmesh_path, os.path.join(mod_dir, os.path.basename(orig_xmesh_path)))
+            fileops.clone_file(orig_xpps_path, os.path.join(mod_dir, os.path.basename(orig_xpps_path)))
+            manifest = injector.new_manifest(orig_xmesh_path, orig_xpps_path)
+
+        mod_folder_name = os.path.basename(os.path.normpath(mod_dir))
         target_xmesh_path = os.path.join(mod_dir, os.path.basename(orig_xmesh_path))
-        target_xpps_path = os.path.join(mod_dir, os.path.basename(orig_xpps_path))
-        shutil.copy2(orig_xmesh_path, target_xmesh_path)
-        shutil.copy2(orig_xpps_path, target_xpps_path)
 
+        # only replacements whose geometry changed since the last export are injected again
+        changed = [item for item in items if not fingerprints or manifest['parts'].get(item.original_hash.lower()) != fingerprints[item.original_hash.lower()]]
         success_count = 0
         
-        # inject meshes
-        for item in props.replacements:
-            if not item.new_mesh: continue
-            res = injector.inject_mesh(context, item, target_xmesh_path, orig_db_path)
-            if res == "SUCCESS": success_count += 1
-            else: self.report({'ERROR'}, res)
+        # inject meshes, all replacements in one pass over the copied files
+        for item, res in injector.inject_meshes(context, changed, target_xmesh_path, orig_db_path,
+                                                    optimize=props.optimize_vertex_cache, decimate=props.auto_decimate,
+                                                    relocate=props.relocate_buffers):
+            key = item.original_hash.lower()
+            if res == "SUCCESS":
+                success_count += 1
+                if key in fingerprints: manifest['parts'][key] = fingerprints[key]
+                if key not in manifest['written']: manifest['written'].append(key)
+            else:
+                # only the fingerprint goes, the slot may still hold bytes of an earlier export
+                manifest['parts'].pop(key, None)
+                self.report({'ERROR'}, res)
                 
         # copy textures
         tex_root = bpy.path.abspath(props.texture_root_path)
-        if tex_root and os.path.exists(tex_root) and os.path.exists(orig_db_path):
+        if success_count > 0 and tex_root and os.path.exists(tex_root) and os.path.exists(orig_db_path):
             texture_manager.collect_textures_for_mod(
                 orig_xpps_path, orig_db_path, props.replacements, tex_root, mod_dir
             )
+
+        if props.incremental_export:
+            injector.save_manifest(mod_dir, manifest, orig_xmesh_path, orig_xpps_path)
+            props.mod_dir = mod_dir
         
-        if success_count > 0:
-            self.report({'INFO'}, f"Export complete in {mod_folder_name}")
-            bpy.ops.wm.path_open(filepath=mod_dir)
+        if not changed and items:
+            self.report({'INFO'}, f"Nothing changed, {mod_folder_name} is up to date")
+        elif success_count > 0:
+            self.report({'INFO'}, f"Export complete in {mod_folder_name} ({success_count} of {len(items)} parts written)")
+            if fresh_folder: bpy.ops.wm.path_open(filepath=mod_dir)
             
         return {'FINISHED'}
 
@@ -483,6 +762,16 @@ classes = (
     GHOST_OT_AnalyzeFile,
     GHOST_OT_ImportAll,
     GHOST_OT_ImportSelected,
+    GHOST_OT_ImportMultiple,
+    GHOST_OT_ImportProxies,
+    GHOST_OT_LoadProxies,
+    GHOST_OT_SplitMerged,
+    GHOST_OT_FindDuplicates,
+    GHOST_OT_UpdateCatalog,
+    GHOST_OT_QueryCatalog,
+    GHOST_OT_FindTextureUsers,
+    GHOST_OT_OpenCatalogResult,
+    GHOST_OT_LocateHash,
     GHOST_OT_SelectAll,
     GHOST_OT_AddReplacement,
     GHOST_OT_RemoveReplacement,
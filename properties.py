@@ -38,6 +38,17 @@ class GHOST_MeshInfoItem(bpy.types.PropertyGroup):
     lod: bpy.props.IntProperty(name="LOD")
     vertex_count: bpy.props.IntProperty(name="Vertices")
     face_count: bpy.props.IntProperty(name="Triangles")
+    texture_count: bpy.props.IntProperty(name="Textures")
+    vertex_capacity: bpy.props.IntProperty(name="Vertex Capacity", description="Vertices that fit into the slot's buffers, padding and gaps included")
+    index_capacity: bpy.props.IntProperty(name="Index Capacity", description="Indices that fit into the slot's index buffer, padding and gaps included")
+
+class GHOST_CatalogResultItem(bpy.types.PropertyGroup):
+    filepath: bpy.props.StringProperty(name="File")
+    mesh_hash: bpy.props.StringProperty(name="Hash")
+    lod: bpy.props.IntProperty(name="LOD")
+    vertex_count: bpy.props.IntProperty(name="Vertices")
+    face_count: bpy.props.IntProperty(name="Triangles")
+    texture_name: bpy.props.StringProperty(name="Texture")
 
 class GHOST_ReplacementItem(bpy.types.PropertyGroup):
     # links a game hash to a blender object for injection
@@ -64,6 +75,12 @@ class GHOST_SceneProperties(bpy.types.PropertyGroup):
         subtype='DIR_PATH'
     )
 
+    dump_root_path: bpy.props.StringProperty(
+        name="Game Dump Root", 
+        description="Root folder of the extracted game files, used by the dump-wide tools", 
+        subtype='DIR_PATH'
+    )
+
     tex_db_path: bpy.props.StringProperty(
         name="TexMeshMan DB", 
         description="Select game.sprig.texmeshman file", 
@@ -71,17 +88,101 @@ class GHOST_SceneProperties(bpy.types.PropertyGroup):
         default="//game.sprig.texmeshman"
     )
 
+    # catalog settings
+    catalog_jobs: bpy.props.IntProperty(
+        name="Processes",
+        description="Background Blender processes used to scan the dump",
+        default=4, min=1, max=64
+    )
+    catalog_lod: bpy.props.IntProperty(name="LOD", description="Only this LOD id, -1 for any", default=-1, min=-1)
+    catalog_min_verts: bpy.props.IntProperty(name="Min Verts", description="0 for no limit", default=0, min=0)
+    catalog_max_verts: bpy.props.IntProperty(name="Max Verts", description="0 for no limit", default=0, min=0)
+    catalog_hash: bpy.props.StringProperty(name="Hash", description="Hash prefix")
+    texture_search: bpy.props.StringProperty(name="Texture", description="Part of a texture name or hash")
+    locate_hash: bpy.props.StringProperty(name="Locate Hash", description="Paste a mesh hash to jump to the file containing it")
+
+    # export settings
+    optimize_vertex_cache: bpy.props.BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorder triangles and vertices of injected meshes for better GPU vertex cache reuse (ACMR is printed to the console)",
+        default=False
+    )
+    relocate_buffers: bpy.props.BoolProperty(
+        name="Relocate Oversized",
+        description="Replacements that don't fit their slot get new buffers appended to the end of the xmesh instead of being rejected (takes precedence over Decimate to Fit)",
+        default=False
+    )
+    incremental_export: bpy.props.BoolProperty(
+        name="Update Existing Mod",
+        description="Write into the last mod folder and only re-inject replacements whose geometry changed since the last export",
+        default=False
+    )
+    mod_dir: bpy.props.StringProperty(
+        name="Mod Folder",
+        description="Folder updated by incremental exports, set by the first export",
+        subtype='DIR_PATH'
+    )
+    auto_decimate: bpy.props.BoolProperty(
+        name="Decimate to Fit",
+        description="Simplify replacements that exceed the vertex/index budget of their slot until they fit (UV seams are protected, weights are interpolated)",
+        default=False
+    )
+
     #auto match settings
     auto_match_lod: bpy.props.IntProperty(name="Target LOD", default=1536)
+    auto_match_size: bpy.props.BoolProperty(
+        name="Prefer Similar Size",
+        description="Auto Match favours slots whose bounding box is close to the object's size",
+        default=True
+    )
     
     # import settings
     import_skeleton: bpy.props.BoolProperty(name="Import Skeleton", default=True)
+    merge_import: bpy.props.BoolProperty(
+        name="Merge Into One Object",
+        description="Import all submeshes as a single mesh, the face attribute 'ghost_part' keeps track of the source hash",
+        default=False
+    )
+    link_duplicates: bpy.props.BoolProperty(
+        name="Link Duplicates",
+        description="Submeshes with identical buffers share one mesh datablock (editing one edits all of them)",
+        default=False
+    )
+    stream_import: bpy.props.BoolProperty(
+        name="Low Memory (Streaming)",
+        description="Map the file and decode one stream at a time, for very large world assets. Ignores Merge",
+        default=False
+    )
+    stream_budget_mb: bpy.props.IntProperty(
+        name="Memory Budget (MB)",
+        description="Peak memory for decode buffers during a streaming import",
+        default=1024, min=16
+    )
+    import_workers: bpy.props.IntProperty(
+        name="Worker Threads",
+        description="Files read and decoded in parallel by Import Multiple",
+        default=4, min=1, max=32
+    )
+    proxy_mode: bpy.props.EnumProperty(
+        name="Proxy Type",
+        description="Placeholder geometry used by Import Proxies",
+        items=[
+            ('BOX', "Bounding Box", "Box from the XPPS scale/offset, reads no vertex data"),
+            ('SAMPLE', "Vertex Sample", "Every n-th vertex of the position stream"),
+        ],
+        default='BOX'
+    )
+    proxy_sample_count: bpy.props.IntProperty(name="Samples", description="Vertices per proxy in sample mode", default=256, min=8)
     search_filter: bpy.props.StringProperty(name="Search", description="Filter by Hash")
     
     # lists
     found_meshes: bpy.props.CollectionProperty(type=GHOST_MeshInfoItem)
     found_meshes_index: bpy.props.IntProperty()
     
+    catalog_results: bpy.props.CollectionProperty(type=GHOST_CatalogResultItem)
+    catalog_results_index: bpy.props.IntProperty()
+    catalog_total: bpy.props.IntProperty()
+
     replacements: bpy.props.CollectionProperty(type=GHOST_ReplacementItem)
     replacements_index: bpy.props.IntProperty()
 
@@ -96,6 +197,7 @@ classes = (
     GHOST_ConflictItem,
     GHOST_ModFileItem,
     GHOST_MeshInfoItem,
+    GHOST_CatalogResultItem,
     GHOST_ReplacementItem,
     GHOST_SceneProperties,
 )
@@ -0,0 +1,25 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# pytest plugin (see pytest.ini), not part of the add-on
+# the repo root is the add-on package and its __init__.py needs bpy: the root is collected
+# as a plain folder so running pytest outside blender doesn't import it
+
+import os
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def pytest_collect_directory(path, parent):
+    if str(path) == ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
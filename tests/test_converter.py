@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# glb skin attributes of converter.py, needs blender's python (bpy) for the add-on package
+
+import os
+import sys
+import importlib
+import importlib.util
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def load_converter():
+    # the add-on folder name isn't a valid module name, import it under an alias
+    if "ghost_tool" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("ghost_tool", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["ghost_tool"] = module
+        spec.loader.exec_module(module)
+    return importlib.import_module("ghost_tool.converter")
+
+def test_unweighted_vertices_bind_to_root():
+    converter = load_converter()
+    ids = np.array([[3, -1, -1, -1], [5, 2, -1, -1], [-1, -1, -1, -1]], dtype=np.int32)
+    ws = np.array([[0.0, 0.0, 0.0, 0.0], [0.6, 0.2, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]], dtype=np.float32)
+
+    joints, weights = converter.skin_attributes(ids, ws)
+
+    assert np.allclose(weights.sum(axis=1), 1.0)
+    assert joints[0].tolist() == [0, 0, 0, 0] and weights[0].tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert joints[2].tolist() == [0, 0, 0, 0] and weights[2].tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert joints[1].tolist() == [5, 2, 0, 0]
+    assert np.allclose(weights[1], [0.75, 0.25, 0.0, 0.0])
+
+def test_unused_slots_carry_no_weight():
+    converter = load_converter()
+    ids = np.array([[1, -1, 4, -1]], dtype=np.int32)
+    ws = np.array([[0.5, 0.3, 0.5, 0.0]], dtype=np.float32)
+
+    joints, weights = converter.skin_attributes(ids, ws)
+
+    assert joints.dtype == np.uint16 and weights.dtype == np.float32
+    assert np.allclose(weights, [[0.5, 0.0, 0.5, 0.0]])
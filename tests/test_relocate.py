@@ -0,0 +1,72 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# size field detection of injector/relocate.py, loaded by path so the add-on (bpy) isn't imported
+
+import os
+import struct
+import importlib.util
+
+spec = importlib.util.spec_from_file_location(
+    "relocate", os.path.join(os.path.dirname(__file__), "..", "injector", "relocate.py"))
+relocate = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(relocate)
+
+BUFFER_START = 64
+FILE_SIZE = 256
+
+def xmesh_header():
+    data = bytearray(FILE_SIZE)
+    data[0:4] = b"SMBS"
+    struct.pack_into('<Q', data, 24, BUFFER_START)
+    struct.pack_into('<I', data, 40, 0)
+    return data
+
+def test_single_field():
+    data = xmesh_header()
+    struct.pack_into('<I', data, 12, FILE_SIZE)
+    assert relocate.size_field(data, BUFFER_START) == (12, '<I', False)
+
+def test_u64_field():
+    data = xmesh_header()
+    struct.pack_into('<Q', data, 16, FILE_SIZE - BUFFER_START)
+    assert relocate.size_field(data, BUFFER_START) == (16, '<Q', True)
+
+def test_accidental_match_is_refused():
+    # a count or flag word that happens to equal the file size next to the real field
+    data = xmesh_header()
+    struct.pack_into('<I', data, 8, FILE_SIZE)
+    struct.pack_into('<I', data, 36, FILE_SIZE)
+    assert len(relocate.size_fields(data, BUFFER_START)) == 2
+    assert relocate.size_field(data, BUFFER_START) is None
+
+def test_accidental_match_only_is_refused():
+    # the word that matches by value is unrelated and the real field isn't a plain size: no match, nothing written
+    data = xmesh_header()
+    struct.pack_into('<I', data, 4, FILE_SIZE - BUFFER_START)
+    struct.pack_into('<I', data, 8, FILE_SIZE - BUFFER_START)
+    assert relocate.size_field(data, BUFFER_START) is None
+    assert relocate.size_field(xmesh_header(), BUFFER_START) is None
+
+def test_update_size_field():
+    data = xmesh_header()
+    struct.pack_into('<I', data, 12, FILE_SIZE)
+    field = relocate.size_field(data, BUFFER_START)
+    data.extend(bytes(64))
+    relocate.update_size_field(data, field, BUFFER_START)
+    assert struct.unpack_from('<I', data, 12)[0] == FILE_SIZE + 64
+
+def test_xpps_mentions_size():
+    xpps = bytearray(128)
+    assert not relocate.mentions_size(xpps, FILE_SIZE)
+    struct.pack_into('<Q', xpps, 48, FILE_SIZE)
+    assert relocate.mentions_size(xpps, FILE_SIZE)
@@ -117,138 +117,155 @@ class TexMeshMan:
 DB = TexMeshMan()
 
 
+def iter_mesh_assets(reader):
+    # yields (asset_pos, data_start) for every mesh asset container in the xpps
+    reader.seek(24); pkg_h = reader.read_uint32()
+    reader.seek(40); data_start = reader.read_uint32()
+    reader.seek(pkg_h + 8); entry_count = reader.read_uint32()
+
+    curr = pkg_h + 48
+    for _ in range(entry_count):
+        reader.seek(curr)
+        kind = reader.read_uint32(); size = reader.read_uint32(); off = reader.read_uint32()
+
+        if kind == 2: # chunk list
+            abs_start = data_start + off
+            reader.seek(abs_start)
+            end = abs_start + size
+
+            while reader.tell() < end:
+                magic = reader.read_bytes(4)
+                if len(magic) < 4: break
+                c_sz = reader.read_uint32()
+                c_start = reader.tell()
+
+                if magic == b' DIC':
+                    # entries are read up front, the caller moves the reader between yields
+                    cnt = reader.read_uint32(); reader.read_uint32()
+                    entries = [(reader.read_uint64(), reader.read_uint64()) for _ in range(cnt)]
+                    for e_off, e_hash in entries:
+                        if e_hash in [8120115085854712779, 8121310221017043393]:
+                            yield data_start + e_off - 16, data_start
+
+                reader.seek(c_start + c_sz)
+        curr += 40
+
+# table value of a mesh whose material slot exists but points nowhere (None: no slot at all)
+NULL_MATERIAL = 0
+
+def read_asset_materials(reader, asset_pos, data_start):
+    # asset structure to link mesh -> material -> texture, for every mesh at once
+    # returns {mesh hash: [texture hashes]}, None for meshes without a material slot,
+    # NULL_MATERIAL for a null material pointer
+    reader.seek(asset_pos + 64)
+    reader.read_uint64_array(4)
+    reader.read_bytes(48)
+    reader.read_uint64_array(6)
+    meshes_off = reader.read_uint64(); meshes_cnt = reader.read_uint64()
+    reader.read_uint64_array(8)
+    reader.read_uint64_array(10)
+    reader.read_uint64()
+    model_group_off = reader.read_uint64()
+
+    mesh_hashes = []
+    if meshes_cnt > 0:
+        reader.seek(data_start + meshes_off)
+        ptrs = reader.read_uint64_array(meshes_cnt)
+        for ptr in ptrs:
+            reader.seek(data_start + ptr + 80)
+            mesh_hashes.append(reader.read_uint64())
+
+    mat_addrs = []
+    if model_group_off != 0:
+        reader.seek(data_start + model_group_off)
+        reader.read_uint64_array(5)
+        mat_ptr_off = reader.read_uint64(); mat_cnt = reader.read_uint64()
+        if mat_cnt > 0:
+            reader.seek(data_start + mat_ptr_off)
+            mat_addrs = reader.read_uint64_array(min(mat_cnt, len(mesh_hashes)))
+
+    table = {}
+    for i, m_hash in enumerate(mesh_hashes):
+        if i >= len(mat_addrs):
+            table[m_hash] = None
+            continue
+        mat_addr = mat_addrs[i]
+        if mat_addr == 0:
+            table[m_hash] = NULL_MATERIAL
+            continue
+
+        tex_hashes = []
+        reader.seek(data_start + mat_addr)
+        reader.read_uint64_array(6)
+        tex_off = reader.read_uint64(); tex_cnt = reader.read_uint64()
+        if tex_off != 0 and tex_cnt > 0:
+            reader.seek(data_start + tex_off)
+            for _ in range(tex_cnt):
+                tex_hashes.append(reader.read_uint64())
+                reader.read_uint64_array(3) # skip params
+        table[m_hash] = tex_hashes
+    return table
+
+def read_material_table(xpps_path):
+    # one traversal of the xpps: {mesh hash: [texture hashes]} for all meshes of all assets
+    table = {}
+    if not os.path.exists(xpps_path):
+        return table
+
+    reader = DBReader(xpps_path)
+    try:
+        for asset_pos, data_start in iter_mesh_assets(reader):
+            try:
+                table.update(read_asset_materials(reader, asset_pos, data_start))
+            except struct.error:
+                print(f"[Ghost] Truncated material data in {os.path.basename(xpps_path)}")
+    except struct.error:
+        pass
+    finally:
+        reader.close()
+    return table
+
+_material_tables = {}
+
+def get_material_table(xpps_path):
+    # read_material_table, cached until the file changes size/mtime
+    try:
+        st = os.stat(xpps_path)
+    except OSError:
+        return {}
+    state = (st.st_size, st.st_mtime)
+    entry = _material_tables.get(xpps_path)
+    if entry is None or entry[0] != state:
+        entry = (state, read_material_table(xpps_path))
+        _material_tables[xpps_path] = entry
+    return entry[1]
+
+def resolve_material_names(xpps_path, db_path):
+    # batch version of find_materials: {mesh hash: [texture names]} for every mesh in one traversal
+    # meshes without a material map to None
+    if not DB.load(db_path):
+        return {}
+    table = get_material_table(xpps_path)
+    return {h: ([DB.get_name(t) for t in texs] if isinstance(texs, list) else None) for h, texs in table.items()}
+
 def find_materials(xpps_path, target_hash, db_path):
-    
     if not os.path.exists(xpps_path): 
         return [f"XPPS not found"]
     if not DB.load(db_path): 
         return [f"DB load failed"]
-    
+
     try:
-        reader = DBReader(xpps_path)
-        
-        # read container headers
-        reader.seek(24); pkg_h = reader.read_uint32()
-        reader.seek(40); data_start = reader.read_uint32()
-        reader.seek(pkg_h + 8); entry_count = reader.read_uint32()
-        
-        curr = pkg_h + 48
-        
-        # iterate chunks (in xpps)
-        for _ in range(entry_count):
-            reader.seek(curr)
-            kind = reader.read_uint32()
-            size = reader.read_uint32()
-            off = reader.read_uint32()
-            
-            if kind == 2: # chunk list
-                abs_start = data_start + off
-                reader.seek(abs_start)
-                end = abs_start + size
-                
-                #scan sub-chunks
-                while reader.tell() < end:
-                    try: 
-                        magic = reader.read_bytes(4)
-                    except: 
-                        break
-                        
-                    c_sz = reader.read_uint32()
-                    c_start = reader.tell()
-                    
-                    # looking for ' DIC' dictionary chunks
-                    if magic == b' DIC':
-                        reader.seek(c_start)
-                        cnt = reader.read_uint32()
-                        reader.read_uint32()
-                        
-                        for _ in range(cnt):
-                            e_off = reader.read_uint64()
-                            e_hash = reader.read_uint64()
-                            
-                            # check specific signature hashes
-                            if e_hash in [8120115085854712779, 8121310221017043393]:
-                                asset_pos = data_start + e_off - 16
-                                textures = analyze_full_asset_and_find(reader, asset_pos, data_start, target_hash)
-                                if textures is not None: 
-                                    reader.close()
-                                    return textures
-                    
-                    reader.seek(c_start + c_sz)
-            curr += 40
-        reader.close()
+        table = get_material_table(xpps_path)
     except Exception as e:
         return [f"Error: {e}"]
-        
-    return ["No material found"]
-
-def analyze_full_asset_and_find(reader, asset_pos, data_start, target_hash):
-    #asset structure to link mesh -> material -> texture
-    real_asset_start = asset_pos + 64
-    reader.seek(real_asset_start)
-    
-    reader.read_uint64_array(4) 
-    reader.read_bytes(48)       
-    reader.read_uint64_array(6) 
-    
-    meshes_off = reader.read_uint64()
-    meshes_cnt = reader.read_uint64()
-    
-    reader.read_uint64_array(8)
-    reader.read_uint64_array(10)
-    reader.read_uint64() 
-    
-    modelGroupOffset = reader.read_uint64()
-    
-    mesh_idx = -1
-    
-    # find which index our target mesh has
-    if meshes_cnt > 0:
-        reader.seek(data_start + meshes_off)
-        if reader.tell() < reader.size:
-            ptrs = reader.read_uint64_array(meshes_cnt)
-            for i, ptr in enumerate(ptrs):
-                reader.seek(data_start + ptr + 72)
-                reader.read_uint64()
-                if reader.read_uint64() == target_hash:
-                    mesh_idx = i
-                    break
-    
-    if mesh_idx == -1: 
-        return None
-    
-    # resolve material pointer
-    if modelGroupOffset != 0:
-        reader.seek(data_start + modelGroupOffset)
-        reader.read_uint64_array(5)
-        mat_ptr_off = reader.read_uint64()
-        mat_cnt = reader.read_uint64()
-        
-        if mesh_idx < mat_cnt:
-            reader.seek(data_start + mat_ptr_off + (mesh_idx * 8))
-            mat_addr = reader.read_uint64()
-            
-            if mat_addr == 0: 
-                return ["Error: Null Material Pointer"]
 
-            reader.seek(data_start + mat_addr)
-            reader.read_uint64_array(6) 
-            
-            tex_off = reader.read_uint64()
-            tex_cnt = reader.read_uint64()
-            
-            tex_names = []
-            if tex_off != 0 and tex_cnt > 0:
-                reader.seek(data_start + tex_off)
-                for _ in range(tex_cnt):
-                    h = reader.read_uint64()
-                    reader.read_uint64_array(3) # skip params
-                    
-                    # use the global DB instance to resolve name
-                    tex_names.append(DB.get_name(h))
-            
-            if not tex_names: 
-                return ["Material found but no textures"]
-            return tex_names
-            
-    return ["Material linkage missing"]
\ No newline at end of file
+    if target_hash not in table:
+        return ["No material found"]
+    tex_hashes = table[target_hash]
+    if tex_hashes == NULL_MATERIAL:
+        return ["Error: Null Material Pointer"]
+    if tex_hashes is None:
+        return ["Material linkage missing"]
+    if not tex_hashes:
+        return ["Material found but no textures"]
+    return [DB.get_name(h) for h in tex_hashes]
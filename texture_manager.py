@@ -11,8 +11,7 @@
 # -------------------------------------------------------------------
 
 import os
-import shutil
-from . import tex_db
+from . import tex_db, fileops
 
 def find_texture_in_root(root_path, tex_name):   
     candidates = [
@@ -52,6 +51,9 @@ def collect_textures_for_mod(xpps_path, db_path, replacements, texture_root_path
     total_copied = 0
     print(f"[TextureManager] Scanning folders in: {texture_root_path}")
 
+    # one pass over the xpps for all replacements
+    materials = tex_db.resolve_material_names(xpps_path, db_path)
+
     for item in replacements:
         target_hash_str = item.original_hash
         try:
@@ -59,9 +61,9 @@ def collect_textures_for_mod(xpps_path, db_path, replacements, texture_root_path
         except:
             continue
             
-        tex_names = tex_db.find_materials(xpps_path, target_hash, db_path)
+        tex_names = materials.get(target_hash)
         
-        if not tex_names or (len(tex_names) == 1 and "Error" in tex_names[0]):
+        if not tex_names:
             continue
 
         for tex_name in tex_names:
@@ -77,7 +79,7 @@ def collect_textures_for_mod(xpps_path, db_path, replacements, texture_root_path
                 
                 if not os.path.exists(dest_file_path):
                     try:
-                        shutil.copy2(found_file, dest_file_path)
+                        fileops.clone_file(found_file, dest_file_path)
                         print(f"  [+] Found in {src_folder_name}: {fname}")
                         total_copied += 1
                     except Exception as e:
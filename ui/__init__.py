@@ -3,6 +3,7 @@ from . import panels, lists
 
 classes = (
     lists.GHOST_UL_MeshInfoList,
+    lists.GHOST_UL_CatalogList,
     lists.GHOST_UL_ReplacementList,
     lists.GHOST_UL_ModFileList,
     lists.GHOST_UL_ConflictList,
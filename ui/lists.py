@@ -50,6 +50,8 @@ class GHOST_UL_MeshInfoList(bpy.types.UIList):
             row.label(text=f"{item.mesh_hash}")
             row.label(text=f"LOD {item.lod}")
             row.label(text=f"V: {item.vertex_count}")
+            row.label(text=f"Cap: {item.vertex_capacity}")
+            row.label(text=f"T: {item.texture_count}")
         elif self.layout_type == 'GRID':
             layout.alignment = 'CENTER'
             layout.label(text=item.mesh_hash)
@@ -75,6 +77,16 @@ class GHOST_UL_MeshInfoList(bpy.types.UIList):
             
         return flt_flags, flt_neworder
 
+class GHOST_UL_CatalogList(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row()
+        row.label(text=item.mesh_hash)
+        row.label(text=f"LOD {item.lod}")
+        row.label(text=f"V: {item.vertex_count}")
+        if item.texture_name:
+            row.label(text=item.texture_name)
+        row.label(text=os.path.basename(item.filepath))
+
 class GHOST_UL_ReplacementList(bpy.types.UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         split = layout.split(factor=0.35)
@@ -61,6 +61,10 @@ class VIEW3D_PT_GhostPanel(bpy.types.Panel):
         row.scale_y = 1.2
         row.operator("ghost.analyze_file", icon='FILE_REFRESH', text="Scan Model")
         
+        row = box.row(align=True)
+        row.operator("ghost.import_multiple", icon='DOCUMENTS', text="Import Multiple Files")
+        row.prop(props, "import_workers", text="Threads")
+        
         if len(props.found_meshes) > 0:
             row = box.row()
             row.label(text=f"Meshes: {len(props.found_meshes)}")
@@ -96,13 +100,64 @@ class VIEW3D_PT_GhostPanel(bpy.types.Panel):
 
             box.separator()
             
-            box.prop(props, "import_skeleton")
+            row = box.row()
+            row.prop(props, "import_skeleton")
+            row.prop(props, "merge_import", text="Merge")
+            row.prop(props, "link_duplicates", text="Link Duplicates")
+            
+            row = box.row(align=True)
+            row.prop(props, "stream_import", text="Low Memory")
+            if props.stream_import:
+                row.prop(props, "stream_budget_mb", text="Budget MB")
             
             row = box.row(align=True)
             row.scale_y = 1.2
             row.operator("ghost.import_selected", text="Import Checked", icon='IMPORT')
             row.operator("ghost.import_all", text="Import All", icon='IMPORT')
+            
+            # proxies for browsing big assets before loading real geometry
+            col = box.column(align=True)
+            row = col.row(align=True)
+            row.prop(props, "proxy_mode", text="")
+            if props.proxy_mode == 'SAMPLE':
+                row.prop(props, "proxy_sample_count")
+            row = col.row(align=True)
+            row.operator("ghost.import_proxies", text="Import Proxies", icon='CUBE')
+            row.operator("ghost.load_proxies", text="Load Selected Proxies", icon='FILE_REFRESH')
+            col.operator("ghost.split_merged", text="Split Merged Object", icon='MOD_EXPLODE')
+
+        layout.separator()
+        
+        # tools working on the whole game dump
+        layout.label(text="Game Dump", icon='FILE_FOLDER')
+        box = layout.box()
+        box.prop(props, "dump_root_path", text="")
+        box.operator("ghost.find_duplicates", icon='DUPLICATE')
 
+        col = box.column(align=True)
+        row = col.row(align=True)
+        row.operator("ghost.update_catalog", icon='FILE_REFRESH')
+        row.prop(props, "catalog_jobs", text="Procs")
+        row = col.row(align=True)
+        row.prop(props, "catalog_lod")
+        row.prop(props, "catalog_hash", text="")
+        row = col.row(align=True)
+        row.prop(props, "catalog_min_verts", text="Min V")
+        row.prop(props, "catalog_max_verts", text="Max V")
+        col.operator("ghost.query_catalog", icon='VIEWZOOM')
+
+        row = box.row(align=True)
+        row.prop(props, "locate_hash", text="", icon='VIEWZOOM')
+        row.operator("ghost.locate_hash", icon='FORWARD')
+        row = box.row(align=True)
+        row.prop(props, "texture_search", text="", icon='TEXTURE')
+        row.operator("ghost.find_texture_users", icon='VIEWZOOM')
+
+        if props.catalog_results:
+            box.label(text=f"{props.catalog_total} matches")
+            box.template_list("GHOST_UL_CatalogList", "", props, "catalog_results", props, "catalog_results_index", rows=5)
+            box.operator("ghost.open_catalog_result", icon='FILEBROWSER')
+        
         layout.separator()
         
         # export
@@ -115,6 +170,7 @@ class VIEW3D_PT_GhostPanel(bpy.types.Panel):
         row = col.row(align=True)
         row.prop(props, "auto_match_lod", text="LOD ID")
         row.operator("ghost.auto_match", text="Auto Match Selected", icon='SHADERFX')
+        col.prop(props, "auto_match_size")
         
         box.separator()
         
@@ -141,6 +197,14 @@ class VIEW3D_PT_GhostPanel(bpy.types.Panel):
                 col.label(text="Select a Mesh above!", icon='ERROR')
 
         box.separator()
+        row = box.row(align=True)
+        row.prop(props, "optimize_vertex_cache")
+        row.prop(props, "auto_decimate")
+        row = box.row(align=True)
+        row.prop(props, "relocate_buffers")
+        row.prop(props, "incremental_export")
+        if props.incremental_export:
+            box.prop(props, "mod_dir", text="")
         row = box.row()
         row.scale_y = 1.5
         row.operator("ghost.inject_meshes", text="Inject / Export Mod", icon='EXPORT')
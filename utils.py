@@ -155,9 +155,9 @@ def encode_pos_16_snorm(vec, offset, scale):
         clamped = max(-1.0, min(1.0, norm))
         return int(clamped * 32767.0)
 
-    x = pack(vec.x, offset[0], scale)
-    y = pack(vec.y, offset[1], scale)
-    z = pack(vec.z, offset[2], scale)
+    x = pack(vec[0], offset[0], scale)
+    y = pack(vec[1], offset[1], scale)
+    z = pack(vec[2], offset[2], scale)
     return (x, y, z)
 
 def unpack_10_10_10_2(value):
@@ -0,0 +1,106 @@
+# -------------------------------------------------------------------
+# Ghost of Tsushima Blender Tool
+# Copyright (c) 2025 Dave349234
+#
+# This code is licensed under the MIT License with attribution requirements.
+# See the LICENSE file in the root directory or the main __init__.py
+# for full details.
+#
+# Profile: https://www.nexusmods.com/profile/Dave349234
+# Support: https://ko-fi.com/dave349234
+# -------------------------------------------------------------------
+
+# process pool made of background blender instances
+# python children spawned by multiprocessing can't import bpy (and with it this add-on),
+# so every worker is "blender -b" running cli.py on its share of the items
+
+import bpy
+import os
+import json
+import shutil
+import tempfile
+import importlib
+import subprocess
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+def resolve_task(name):
+    # "module:function" inside this add-on, e.g. "catalog:scan_file"
+    module_name, func_name = name.split(":")
+    module = importlib.import_module(f"{__package__}.{module_name}")
+    return getattr(module, func_name)
+
+def run_task(func, item):
+    try:
+        return func(item)
+    except Exception as e:
+        return {'error': str(e), 'item': item}
+
+def run_worker(task_file, result_file):
+    # entry point inside a worker process, one json line per finished item
+    with open(task_file, 'r') as f:
+        job = json.load(f)
+
+    func = resolve_task(job['task'])
+    with open(result_file, 'a') as out:
+        for item in job['items']:
+            out.write(json.dumps(run_task(func, item)) + "\n")
+            out.flush()
+
+def worker_command(blender_path, task_file, result_file):
+    # without --python-exit-code blender exits with 0 even when the script raised
+    return [blender_path, "-b", "--factory-startup", "--python-exit-code", "1", "--python", CLI_SCRIPT, "--", "worker", task_file, result_file]
+
+def run_pool(task, items, jobs=None, blender_path=None):
+    # runs task on every item and returns the results (in no particular order)
+    # items are split into contiguous shards, callers sort them so related items share a worker
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(items)))
+    blender_path = blender_path or bpy.app.binary_path
+
+    if jobs == 1 or not blender_path:
+        func = resolve_task(task)
+        return [run_task(func, item) for item in items]
+
+    tmp_dir = tempfile.mkdtemp(prefix="ghost_pool_")
+    try:
+        procs = []
+        shard_size = (len(items) + jobs - 1) // jobs
+
+        for i in range(jobs):
+            shard = items[i * shard_size:(i + 1) * shard_size]
+            if not shard: continue
+
+            task_file = os.path.join(tmp_dir, f"task_{i}.json")
+            result_file = os.path.join(tmp_dir, f"result_{i}.jsonl")
+            with open(task_file, 'w') as f:
+                json.dump({'task': task, 'items': shard}, f)
+
+            log = open(os.path.join(tmp_dir, f"worker_{i}.log"), 'w')
+            proc = subprocess.Popen(worker_command(blender_path, task_file, result_file), stdout=log, stderr=subprocess.STDOUT)
+            procs.append((proc, shard, result_file, log))
+
+        print(f"[Ghost] Running '{task}' on {len(items)} items in {len(procs)} worker processes")
+
+        results = []
+        for proc, shard, result_file, log in procs:
+            proc.wait()
+            log.close()
+            if proc.returncode != 0:
+                with open(log.name, 'r', errors='ignore') as f:
+                    tail = f.read()[-2000:]
+                print(f"[Ghost] Worker exited with code {proc.returncode}:\n{tail}")
+
+            # one line per item in shard order, a worker that died leaves the rest of its shard without one
+            done = 0
+            if os.path.exists(result_file):
+                with open(result_file, 'r') as f:
+                    for line in f:
+                        try: results.append(json.loads(line))
+                        except ValueError: break # cut off mid-write
+                        done += 1
+            results.extend({'error': 'worker exited', 'item': item} for item in shard[done:])
+        return results
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)